@@ -0,0 +1,78 @@
+"""
+Connection profile shared by the SQLite and Turso backends.
+
+Backend-specific OPTIONS (not passed to ``connect``):
+
+- ``pragmas``: ``{name: value}`` applied to every new connection, on top
+  of ``PRAGMAS``; a value of None keeps SQLite's own default.
+- ``transaction_mode``: ``"DEFERRED"``, ``"IMMEDIATE"`` (default) or
+  ``"EXCLUSIVE"``, the ``BEGIN`` used by atomic blocks. A deferred
+  transaction that reads and then writes fails at once with "database is
+  locked" if another connection wrote in between, whatever the busy
+  timeout; an immediate one takes the write lock up front, where
+  ``busy_timeout`` lets it wait its turn.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+
+PRAGMAS = {
+    # Readers no longer block the writer, nor the writer readers
+    "journal_mode": "wal",
+    # Durable across application crashes; WAL makes NORMAL safe from corruption
+    "synchronous": "normal",
+    # Milliseconds a connection waits for a lock before "database is locked"
+    "busy_timeout": 5000,
+    # Negative: KiB of page cache per connection
+    "cache_size": -32000,
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "memory",
+}
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+TRANSACTION_MODE = "IMMEDIATE"
+PROFILE_OPTIONS = {"pragmas", "transaction_mode"}
+
+PRAGMA_NAME_REGEX = re.compile(r"^[a-z_]+$")
+PRAGMA_VALUE_REGEX = re.compile(r"^(-?\d+|[A-Za-z_]+)$")
+
+
+def pragmas(options):
+    """The pragmas configured by ``options``, in the order they are applied"""
+    configured = {**PRAGMAS, **options.get("pragmas", {})}
+    for name, value in configured.items():
+        if value is None:
+            continue
+        if not PRAGMA_NAME_REGEX.match(name) or not PRAGMA_VALUE_REGEX.match(str(value)):
+            raise ImproperlyConfigured(f"Invalid SQLite pragma in OPTIONS: {name} = {value!r}")
+    return {name: value for name, value in configured.items() if value is not None}
+
+
+def apply_pragmas(conn, configured):
+    for name, value in configured.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def connect_params(options):
+    """``options`` without the keys handled here, which ``connect`` would reject"""
+    return {key: value for key, value in options.items() if key not in PROFILE_OPTIONS}
+
+
+class ProfileMixin:
+    """DatabaseWrapper mixin applying the profile to every new connection"""
+
+    @cached_property
+    def pragmas(self):
+        return pragmas(self.settings_dict.get("OPTIONS", {}))
+
+    @cached_property
+    def transaction_mode(self):
+        mode = self.settings_dict.get("OPTIONS", {}).get("transaction_mode", TRANSACTION_MODE).upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of {', '.join(TRANSACTION_MODES)}, not {mode!r}"
+            )
+        return mode
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
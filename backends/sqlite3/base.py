@@ -0,0 +1,21 @@
+"""
+Django's SQLite backend with the connection profile of ``backends.profile``:
+WAL, ``synchronous=NORMAL``, a busy timeout, a larger page cache, memory
+mapping and ``BEGIN IMMEDIATE`` for atomic blocks, so concurrent gunicorn
+workers queue for the write lock instead of failing with "database is
+locked".
+"""
+from django.db.backends.sqlite3 import base as sqlite3_base
+
+from backends import profile
+
+
+class DatabaseWrapper(profile.ProfileMixin, sqlite3_base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        return profile.connect_params(params)
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        profile.apply_pragmas(conn, self.pragmas)
+        return conn
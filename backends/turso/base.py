@@ -1,20 +1,54 @@
 """
 Custom Turso/libSQL backend for Django using libsql_experimental.
+
+Backend-specific OPTIONS (not passed to ``connect``):
+
+- ``executemany_batch_size``: rows per statement sent by executemany.
+- ``max_query_params``: parameters allowed in one statement.
+- ``health_check_interval``: seconds a connection is trusted after its last
+  successful probe before ``is_usable`` runs ``SELECT 1`` again.
+- ``pool``: keep closed connections per thread and hand them back to the
+  next connect on that thread, skipping the connect and setup PRAGMAs.
+- ``pool_max_idle``: idle connections kept per thread and database.
+- ``pragmas`` and ``transaction_mode``: see ``backends.profile``. The
+  pragmas are applied to local database files only; a remote primary
+  manages its own.
 """
+import functools
 import re
 import sqlite3
+import threading
 from collections.abc import Mapping
 from datetime import date, datetime, time
 from decimal import Decimal
+from time import monotonic
 
 import libsql_experimental
 from django.core.exceptions import ImproperlyConfigured
 from django.db.backends.sqlite3 import base as sqlite3_base
 from django.db.backends.sqlite3.features import DatabaseFeatures as SQLiteFeatures
+from django.utils.functional import cached_property
 from django.utils.regex_helper import _lazy_re_compile
 
+from backends import profile
+
 FORMAT_QMARK_REGEX = _lazy_re_compile(r"(?<!%)%s")
 PYFORMAT_REGEX = re.compile(r"%\(([^)]+)\)s")
+# A single-row "INSERT ... VALUES (...)" with nothing after the row, which
+# executemany can widen into one multi-row statement per batch.
+SINGLE_ROW_INSERT_REGEX = re.compile(r"^(\s*INSERT\s.*?\bVALUES\s*)(\([^()]*\))\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+
+# Rows per statement executemany sends (OPTIONS["executemany_batch_size"])
+EXECUTEMANY_BATCH_SIZE = 500
+# SQLITE_MAX_VARIABLE_NUMBER of libSQL builds (SQLite >= 3.32); sqlite3's
+# 999 default predates it (OPTIONS["max_query_params"])
+MAX_QUERY_PARAMS = 32766
+# Distinct SQL strings whose placeholder conversion is remembered; the ORM
+# reuses a small set of statements, so this covers the hot ones.
+SQL_CACHE_SIZE = 512
+HEALTH_CHECK_INTERVAL = 30
+REMOTE_SCHEMES = ("libsql:", "http:", "https:", "ws:", "wss:")
+POOL_MAX_IDLE = 1
 ALLOWED_CONNECT_OPTIONS = {
     "auth_token",
     "sync_url",
@@ -26,54 +60,115 @@ ALLOWED_CONNECT_OPTIONS = {
 }
 
 
+# Parameter type -> value libSQL accepts; types not listed pass through
+ADAPTERS = {
+    datetime: lambda value: value.isoformat(" "),
+    date: date.isoformat,
+    time: time.isoformat,
+    Decimal: str,
+    bool: int,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter_for(param_type):
+    # Nearest listed base class, so subclasses (e.g. of datetime) adapt too
+    for base in param_type.__mro__:
+        if base in ADAPTERS:
+            return ADAPTERS[base]
+    return None
+
+
 def adapt_param(param):
-    if isinstance(param, datetime):
-        return param.isoformat(" ")
-    if isinstance(param, date):
-        return param.isoformat()
-    if isinstance(param, time):
-        return param.isoformat()
-    if isinstance(param, Decimal):
-        return str(param)
-    if isinstance(param, bool):
-        return int(param)
-    return param
+    adapter = _adapter_for(type(param))
+    return param if adapter is None else adapter(param)
 
 
+@functools.lru_cache(maxsize=SQL_CACHE_SIZE)
 def convert_query(query):
     return FORMAT_QMARK_REGEX.sub("?", query).replace("%%", "%")
 
 
+@functools.lru_cache(maxsize=SQL_CACHE_SIZE)
+def convert_pyformat_query(query):
+    """Qmark SQL and the parameter names in placeholder order, or None if unnamed"""
+    names = tuple(PYFORMAT_REGEX.findall(query))
+    if not names:
+        return None
+    return PYFORMAT_REGEX.sub("?", query).replace("%%", "%"), names
+
+
 def convert_mapping_query_and_params(query, params):
-    names = PYFORMAT_REGEX.findall(query)
-    if names:
-        converted_query = PYFORMAT_REGEX.sub("?", query).replace("%%", "%")
-        converted_params = tuple(adapt_param(params[name]) for name in names)
-        return converted_query, converted_params
-    converted_query = convert_query(query)
-    converted_params = tuple(adapt_param(value) for value in params.values())
-    return converted_query, converted_params
+    converted = convert_pyformat_query(query)
+    if converted is not None:
+        converted_query, names = converted
+        return converted_query, tuple(adapt_param(params[name]) for name in names)
+    return convert_query(query), tuple(map(adapt_param, params.values()))
+
+
+def batched(sequence, size):
+    for start in range(0, len(sequence), size):
+        yield sequence[start:start + size]
 
 
 class TursoCursor:
     """Cursor wrapper that converts Django placeholders to SQLite qmark style."""
 
-    def __init__(self, cursor):
+    def __init__(self, cursor, batch_size=EXECUTEMANY_BATCH_SIZE, max_params=MAX_QUERY_PARAMS):
         self._cursor = cursor
+        self._batch_size = batch_size
+        self._max_params = max_params
+        self._rowcount = None
+
+    @property
+    def rowcount(self):
+        if self._rowcount is not None:
+            return self._rowcount
+        return self._cursor.rowcount
 
     def execute(self, sql, params=None):
+        self._rowcount = None
         if params is None:
             return self._cursor.execute(convert_query(sql))
         if isinstance(params, Mapping):
             converted_sql, converted_params = convert_mapping_query_and_params(sql, params)
             return self._cursor.execute(converted_sql, converted_params)
-        converted_sql = convert_query(sql)
-        converted_params = tuple(adapt_param(param) for param in params)
-        return self._cursor.execute(converted_sql, converted_params)
+        return self._cursor.execute(convert_query(sql), tuple(map(adapt_param, params)))
 
     def executemany(self, sql, param_list):
-        for params in param_list:
-            self.execute(sql, params)
+        """Run ``sql`` for every parameter set in as few round-trips as possible
+
+        Placeholders are converted once. Single-row INSERTs are widened into
+        multi-row INSERTs of up to ``batch_size`` rows (fewer if the rows
+        would exceed ``max_params`` parameters); any other statement goes
+        to the driver's own executemany in batches.
+        """
+        param_list = list(param_list)
+        if not param_list:
+            self._rowcount = 0
+            return self
+        if isinstance(param_list[0], Mapping):
+            converted_sql = convert_mapping_query_and_params(sql, param_list[0])[0]
+            rows = [convert_mapping_query_and_params(sql, params)[1] for params in param_list]
+        else:
+            converted_sql = convert_query(sql)
+            rows = [tuple(map(adapt_param, params)) for params in param_list]
+
+        rowcount = 0
+        insert = SINGLE_ROW_INSERT_REGEX.match(converted_sql)
+        width = len(rows[0])
+        if insert and width and insert.group(2).count("?") == width and all(len(row) == width for row in rows):
+            prefix, row_sql = insert.groups()
+            size = max(1, min(self._batch_size, self._max_params // width))
+            for batch in batched(rows, size):
+                statement = prefix + ", ".join([row_sql] * len(batch))
+                self._cursor.execute(statement, tuple(param for row in batch for param in row))
+                rowcount += max(self._cursor.rowcount, 0)
+        else:
+            for batch in batched(rows, self._batch_size):
+                self._cursor.executemany(converted_sql, batch)
+                rowcount += max(self._cursor.rowcount, 0)
+        self._rowcount = rowcount
         return self
 
     def __getattr__(self, name):
@@ -111,13 +206,78 @@ class Database:
     register_adapter = staticmethod(sqlite3.register_adapter)
 
 
+class ConnectionPool:
+    """Idle libSQL connections kept per thread, with hit/miss counters
+
+    A libSQL connection is only ever reused by the thread that released it,
+    so no connection crosses threads. Counters are process-wide.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def _idle(self, key):
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = self._local.idle = {}
+        return idle.setdefault(key, [])
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def acquire(self, key, is_alive):
+        """An idle connection for ``key`` that passes ``is_alive``, or None"""
+        idle = self._idle(key)
+        while idle:
+            conn, released_at = idle.pop()
+            if is_alive(conn, released_at):
+                self._count("hits")
+                return conn
+            self._count("discarded")
+            _close_quietly(conn)
+        self._count("misses")
+        return None
+
+    def release(self, key, conn, max_idle):
+        idle = self._idle(key)
+        if len(idle) >= max_idle:
+            _close_quietly(conn)
+            return
+        idle.append((conn, monotonic()))
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "discarded": self.discarded}
+
+
+pool = ConnectionPool()
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
 class DatabaseFeatures(SQLiteFeatures):
     # libsql_experimental does not provide sqlite3's transaction semantics for DDL.
     can_rollback_ddl = False
     supports_atomic_references_rename = False
 
+    @cached_property
+    def max_query_params(self):
+        # Sizes bulk_create/bulk_update batches: more rows per statement
+        # means fewer round-trips to a remote database.
+        return self.connection.settings_dict.get("OPTIONS", {}).get("max_query_params", MAX_QUERY_PARAMS)
 
-class DatabaseWrapper(sqlite3_base.DatabaseWrapper):
+
+class DatabaseWrapper(profile.ProfileMixin, sqlite3_base.DatabaseWrapper):
     vendor = "sqlite"
     display_name = "Turso (libSQL)"
     Database = Database
@@ -141,30 +301,74 @@ class DatabaseWrapper(sqlite3_base.DatabaseWrapper):
                 params[key] = value
         return params
 
+    @cached_property
+    def _options(self):
+        return self.settings_dict.get("OPTIONS", {})
+
+    @property
+    def _pool_key(self):
+        return (self.alias, str(self.settings_dict["NAME"]))
+
+    def _probe(self, conn):
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def _reusable(self, conn, released_at):
+        if monotonic() - released_at < self._options.get("health_check_interval", HEALTH_CHECK_INTERVAL):
+            return True
+        return self._probe(conn)
+
     def get_new_connection(self, conn_params):
-        conn = libsql_experimental.connect(**conn_params)
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn = None
+        if self._options.get("pool"):
+            conn = pool.acquire(self._pool_key, self._reusable)
+        if conn is None:
+            conn = libsql_experimental.connect(**conn_params)
+            conn.execute("PRAGMA foreign_keys = ON")
+            if not str(conn_params["database"]).startswith(REMOTE_SCHEMES):
+                profile.apply_pragmas(conn, self.pragmas)
+        self._last_health_check = monotonic()
         return conn
 
     def create_cursor(self, name=None):
-        return TursoCursor(self.connection.cursor())
+        options = self.settings_dict.get("OPTIONS", {})
+        return TursoCursor(
+            self.connection.cursor(),
+            batch_size=options.get("executemany_batch_size", EXECUTEMANY_BATCH_SIZE),
+            max_params=self.features.max_query_params,
+        )
 
     def _set_autocommit(self, autocommit):
         # libsql_experimental exposes isolation_level as read-only.
         return
 
     def _close(self):
-        if self.connection is not None and hasattr(self.connection, "close"):
-            self.connection.close()
+        if self.connection is None or not hasattr(self.connection, "close"):
+            return
+        if self._options.get("pool") and not self.errors_occurred and not getattr(
+            self.connection, "in_transaction", False
+        ):
+            pool.release(self._pool_key, self.connection, self._options.get("pool_max_idle", POOL_MAX_IDLE))
+            return
+        self.connection.close()
 
     def is_usable(self):
         if self.connection is None:
             return False
-        try:
-            self.connection.execute("SELECT 1")
+        # After an error Django asks whether the connection survived: always probe
+        interval = self._options.get("health_check_interval", HEALTH_CHECK_INTERVAL)
+        if not self.errors_occurred and monotonic() - getattr(self, "_last_health_check", 0) < interval:
             return True
-        except Exception:
+        if not self._probe(self.connection):
             return False
+        self._last_health_check = monotonic()
+        return True
+
+    def pool_stats(self):
+        return pool.stats()
 
     def disable_constraint_checking(self):
         # libsql_experimental does not allow toggling this pragma in Django's flow.
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cleanrecruit.settings')
 
 application = get_asgi_application()
+
+from cleanrecruit import warmup  # noqa: E402  (needs the app registry)
+
+warmup.run()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 import dj_database_url
@@ -30,6 +31,9 @@ def env_bool(name, default=False):
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
@@ -71,6 +75,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # After WhiteNoise, so static files are not timed
+    'recruits.timing.ServerTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,9 +90,10 @@ ROOT_URLCONF = 'cleanrecruit.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django's backend, with render time reported by recruits.timing
+        'BACKEND': 'recruits.timing.DjangoTemplates',
+        'NAME': 'django',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -94,12 +101,36 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Always cache compiled templates, so the warm-up's precompiled
+            # templates are reused; runserver's autoreloader still clears
+            # the cache when a template changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'cleanrecruit.wsgi.application'
 
+# Precompile templates, load URLconfs and connect to the database when a
+# worker boots rather than on its first request (see cleanrecruit/warmup.py).
+WARMUP = env_bool('WARMUP', not DEBUG)
+
+# "wsgi" or "asgi"; gunicorn.conf.py picks the application and worker class
+SERVER_INTERFACE = os.environ.get('SERVER_INTERFACE', 'wsgi')
+# Serve the landing page, dashboard and analytics from recruits/async_views.py,
+# which run their independent queries concurrently on a pool of
+# ASYNC_QUERY_WORKERS threads (each may hold a database connection).
+ASYNC_VIEWS = env_bool('ASYNC_VIEWS', SERVER_INTERFACE == 'asgi')
+ASYNC_QUERY_WORKERS = int(os.environ.get('ASYNC_QUERY_WORKERS', '4'))
+# Seconds a pool thread keeps its database connection open between queries;
+# one that hits an error is closed at once.
+ASYNC_QUERY_CONN_MAX_AGE = int(os.environ.get('ASYNC_QUERY_CONN_MAX_AGE', '60'))
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -125,6 +156,91 @@ else:
         }
     }
 
+# SQLite gets WAL, a busy timeout and BEGIN IMMEDIATE (see backends/profile.py)
+# so that concurrent workers wait for the write lock rather than fail with
+# "database is locked". SQLITE_<PRAGMA> overrides one pragma; "default"
+# leaves SQLite's own value.
+SQLITE_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size', 'temp_store')
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['ENGINE'] = 'backends.sqlite3'
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': os.environ.get('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+        'pragmas': {
+            name: None if os.environ[f'SQLITE_{name.upper()}'] == 'default' else os.environ[f'SQLITE_{name.upper()}']
+            for name in SQLITE_PRAGMAS
+            if f'SQLITE_{name.upper()}' in os.environ
+        },
+    })
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# "file" and "db" are shared by every gunicorn worker on a host ("db" needs
+# `python manage.py createcachetable`, which the Procfile runs); "locmem" is
+# a per-process stand-in. Any other value is taken as a dotted cache backend
+# path. "file" does not make cache.add() atomic across processes, so the
+# rebuild lock in recruits/caching.py can let several workers recompute one
+# context at once; production (DEBUG off) therefore defaults to "db".
+CACHE_PRESETS = {
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'cleanrecruit_cache'),
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dummy': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'dummy' if TESTING else 'file' if DEBUG else 'db')
+
+CACHES = {
+    'default': CACHE_PRESETS.get(CACHE_BACKEND) or {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+}
+
+# Seconds a cached dashboard/analytics context may be served; saves and
+# deletes invalidate it sooner.
+VIEW_CACHE_TIMEOUT = int(os.environ.get('VIEW_CACHE_TIMEOUT', '300'))
+# Seconds the public landing page is cached whole, here and by browsers and
+# proxies (Cache-Control: public, max-age); its figures may lag this much.
+PUBLIC_PAGE_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_PAGE_CACHE_TIMEOUT', '60'))
+# Identifies the deployed code in page ETags, so pages browsers kept from
+# before a deploy are not revalidated (Railway sets RAILWAY_DEPLOYMENT_ID)
+RELEASE = os.environ.get('RELEASE') or os.environ.get('RAILWAY_DEPLOYMENT_ID', '')
+
+# List view pagination: 'offset' for numbered ?page=N links, or 'keyset'
+# for next/previous cursors that stay fast on deep pages.
+LIST_PAGINATION = os.environ.get('LIST_PAGINATION', 'offset')
+# Keyset pages show a result total counted up to this many rows ("N+"
+# beyond it); 0 skips the count, so every keyset page is a single query.
+KEYSET_COUNT_LIMIT = int(os.environ.get('KEYSET_COUNT_LIMIT', '1000'))
+
+# Per-request timing (recruits/timing.py): add a Server-Timing header with
+# query, template and view time, and warn when a page runs more queries than
+# its budget below, keyed by URL name. The header is visible to every
+# visitor, so it is off in production unless asked for.
+SERVER_TIMING = env_bool('SERVER_TIMING', DEBUG)
+QUERY_BUDGETS = {
+    'home': 4,
+    'dashboard': 8,
+    'analytics': 14,
+    'candidate_list': 6,
+    'position_list': 6,
+    'interview_list': 5,
+    'candidate_autocomplete': 5,
+    'candidate_export': 3,
+    'interview_export': 3,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -175,6 +291,32 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+# One line per request from recruits.timing, plus worker warm-up
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'recruits.timing': {
+            'handlers': ['console'],
+            'level': os.environ.get('TIMING_LOG_LEVEL', 'WARNING' if TESTING else 'INFO'),
+            'propagate': False,
+        },
+        'cleanrecruit.warmup': {
+            'handlers': ['console'],
+            'level': 'WARNING' if TESTING else 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/'
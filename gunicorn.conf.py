@@ -0,0 +1,14 @@
+"""
+Gunicorn settings, read from the working directory by default.
+
+SERVER_INTERFACE=asgi serves cleanrecruit.asgi with uvicorn workers, so the
+async views in recruits/async_views.py run on the event loop instead of
+one worker thread per request; the default serves cleanrecruit.wsgi.
+"""
+import os
+
+if os.environ.get('SERVER_INTERFACE', 'wsgi') == 'asgi':
+    wsgi_app = 'cleanrecruit.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'cleanrecruit.wsgi:application'
@@ -1,5 +1,56 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Q
+
+from . import search, transitions
 from .models import Department, Position, Candidate, Interview
+from .pagination import EstimatedCountPaginator
+
+# Rows per UPDATE when an action runs on every row of a large changelist
+ACTION_BATCH_SIZE = 500
+
+
+def status_action(transition, status, label, noun):
+    """Admin action moving the selected rows to ``status`` with ``transition``
+
+    The selection is walked in primary key order, ``ACTION_BATCH_SIZE`` at a
+    time, so "select all" on a large table never loads every id at once.
+    """
+    def action(modeladmin, request, queryset):
+        queryset = queryset.order_by('pk')
+        changed, last = 0, 0
+        while True:
+            ids = list(queryset.filter(pk__gt=last).values_list('pk', flat=True)[:ACTION_BATCH_SIZE])
+            if not ids:
+                break
+            changed += len(transition(ids, status))
+            last = ids[-1]
+        modeladmin.message_user(request, f'Moved {changed} {noun}(s) to {label}.', messages.SUCCESS)
+
+    action.__name__ = f'set_status_{status}'
+    return admin.action(description=f'Move selected {noun}s to {label}')(action)
+
+
+class IndexedSearchMixin:
+    """Changelist and autocomplete search through ``recruits.search``
+
+    ``indexed_search`` lists ``(model, field)`` pairs; a row matches when
+    ``field`` points at a full-text match in ``model``. Searches containing
+    a digit also match ``digit_search_fields``, columns the index does not
+    cover, with ``icontains``.
+    """
+    indexed_search = ()
+    digit_search_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search.terms(search_term):
+            return super().get_search_results(request, queryset, search_term)
+        condition = Q()
+        for model, field in self.indexed_search:
+            condition |= search.matches(model, search_term, field, using=queryset.db)
+        if any(character.isdigit() for character in search_term):
+            for field in self.digit_search_fields:
+                condition |= Q(**{f'{field}__icontains': search_term.strip()})
+        return queryset.filter(condition), False
 
 
 @admin.register(Department)
@@ -11,24 +62,47 @@ class DepartmentAdmin(admin.ModelAdmin):
 @admin.register(Position)
 class PositionAdmin(admin.ModelAdmin):
     list_display = ['title', 'department', 'location', 'status', 'created_at']
-    list_filter = ['status', 'department', 'location']
+    list_filter = ['status', 'location']
+    list_select_related = ['department']
     search_fields = ['title', 'description', 'location']
     list_editable = ['status']
+    autocomplete_fields = ['department']
 
 
 @admin.register(Candidate)
-class CandidateAdmin(admin.ModelAdmin):
+class CandidateAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['full_name', 'email', 'position', 'status', 'experience_years', 'applied_date']
-    list_filter = ['status', 'position', 'applied_date']
+    list_filter = ['status']
+    list_select_related = ['position']
+    date_hierarchy = 'applied_date'
     search_fields = ['first_name', 'last_name', 'email', 'phone']
+    indexed_search = [(Candidate, 'pk')]
+    digit_search_fields = ['phone']
     list_editable = ['status']
     readonly_fields = ['applied_date', 'updated_at']
+    autocomplete_fields = ['position']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [
+        status_action(transitions.bulk_transition, status, label, 'candidate')
+        for status, label in Candidate.STATUS_CHOICES
+    ]
 
 
 @admin.register(Interview)
-class InterviewAdmin(admin.ModelAdmin):
+class InterviewAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['candidate', 'interviewer_name', 'scheduled_date', 'interview_type', 'status', 'rating']
-    list_filter = ['status', 'interview_type', 'scheduled_date']
+    list_filter = ['status', 'interview_type']
+    list_select_related = ['candidate']
+    date_hierarchy = 'scheduled_date'
     search_fields = ['candidate__first_name', 'candidate__last_name', 'interviewer_name']
+    indexed_search = [(Interview, 'pk'), (Candidate, 'candidate')]
     list_editable = ['status', 'rating']
     readonly_fields = ['created_at', 'updated_at']
+    autocomplete_fields = ['candidate']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [
+        status_action(transitions.bulk_interview_status, status, label, 'interview')
+        for status, label in Interview.STATUS_CHOICES
+    ]
@@ -0,0 +1,133 @@
+"""
+Async versions of the landing page, dashboard and analytics views.
+
+Each of these pages runs a handful of independent aggregates. The views
+here hand them to a bounded thread pool so they run at the same time,
+each on its pool thread's own database connection, and the page waits
+for the slowest query instead of the sum of all of them. Django 4.2's
+async ORM would not help: it runs every query through ``sync_to_async``
+on one shared thread, one after another.
+
+Inside a transaction the queries run one after another on the caller's
+connection, since other connections cannot see its uncommitted writes.
+
+``settings.ASYNC_VIEWS`` routes the URLs here (see ``urls.py``), and
+``settings.ASYNC_QUERY_WORKERS`` bounds the pool; every pool thread may
+hold a database connection, so each process can open that many more.
+Pool threads keep their connection between queries, whatever
+``CONN_MAX_AGE`` says, for ``settings.ASYNC_QUERY_CONN_MAX_AGE`` seconds
+or until a query fails, so a query does not pay for a fresh connection
+and its pragmas.
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from threading import Lock, local
+from time import monotonic
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.db import connection, connections
+from django.shortcuts import render
+
+from . import caching, timing, views
+
+_executor = None
+_executor_lock = Lock()
+# Per pool thread: alias -> (connection handle, when it was opened)
+_opened = local()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_QUERY_WORKERS, thread_name_prefix='recruits-query',
+            )
+        return _executor
+
+
+def _recycle_connections(failed=False):
+    """Close this pool thread's connections that are too old, or all of them after a failure"""
+    opened = _opened.__dict__.setdefault('connections', {})
+    now = monotonic()
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is None:
+            opened.pop(conn.alias, None)
+            continue
+        handle, since = opened.get(conn.alias, (None, now))
+        if handle is not conn.connection:
+            since = now
+        if failed or conn.errors_occurred or now - since >= settings.ASYNC_QUERY_CONN_MAX_AGE:
+            conn.close()
+            opened.pop(conn.alias, None)
+        else:
+            opened[conn.alias] = (conn.connection, since)
+
+
+def _run_in_pool(query):
+    # Pool threads see no request_started/finished, which would close
+    # their connections after every query with the default CONN_MAX_AGE
+    failed = True
+    try:
+        with timing.instrument():
+            result = query()
+        failed = False
+        return result
+    finally:
+        _recycle_connections(failed)
+
+
+def run_concurrently(queries):
+    """``{name: query()}`` for a ``{name: callable}``, running the callables concurrently"""
+    if connection.in_atomic_block or settings.ASYNC_QUERY_WORKERS < 2 or len(queries) < 2:
+        return views.run_queries(queries)
+    # A copy of the context per query keeps the request's timings
+    futures = {
+        name: executor().submit(contextvars.copy_context().run, _run_in_pool, query)
+        for name, query in queries.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def login_required(view):
+    """``django.contrib.auth.decorators.login_required`` for coroutine views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # The first access to request.user loads it from the session
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def landing_page(request):
+    """Public landing page for marketing the app"""
+    return await sync_to_async(caching.cached_response)(
+        request, 'landing', views.LANDING_MODELS, partial(views._render_landing, request, run_concurrently),
+    )
+
+
+def _build(queries, assemble):
+    return assemble(run_concurrently(queries))
+
+
+@login_required
+@caching.conditional_page(*views.DASHBOARD_MODELS)
+async def dashboard(request):
+    """Main dashboard view with key metrics"""
+    context = await sync_to_async(caching.cached_context)(
+        'dashboard', views.DASHBOARD_MODELS, partial(_build, views.DASHBOARD_QUERIES, views._dashboard_context),
+    )
+    return await sync_to_async(render)(request, 'dashboard.html', context)
+
+
+@login_required
+async def analytics(request):
+    """Detailed analytics view"""
+    context = await sync_to_async(caching.cached_context)(
+        'analytics', views.ANALYTICS_MODELS, partial(_build, views.ANALYTICS_QUERIES, views._analytics_context),
+    )
+    return await sync_to_async(render)(request, 'analytics.html', context)
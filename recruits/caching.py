@@ -0,0 +1,224 @@
+"""
+Shared cache for expensive view contexts.
+
+Keys are versioned per model. Every save or delete bumps the version of
+its model, and a cached context is stored under the current versions of
+the models it was built from, so a change makes exactly the dependent
+entries unreachable and nothing has to be deleted.
+
+Public pages that are the same for every visitor are cached whole by
+``cached_response``, with validators browsers and proxies can revalidate
+against. Per-user pages get an ETag from the same versions through
+``conditional_page``, so an unchanged page is answered with 304 before
+its view runs.
+"""
+import hashlib
+import time
+from asyncio import iscoroutinefunction
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_response_headers
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+VERSION_KEY = 'recruits:version:{}'
+LOCK_TIMEOUT = 30
+
+# How long a request waits for another worker that is already rebuilding
+# the same context before computing it itself.
+LOCK_WAIT = 5
+LOCK_POLL = 0.05
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.model_name
+
+
+def _initial_version():
+    # Time-based, so a version lost to eviction never repeats an old one
+    return time.time_ns()
+
+
+def model_versions(*models):
+    """Current version of each model, initialising missing ones"""
+    keys = {VERSION_KEY.format(_label(model)): _label(model) for model in models}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, label in keys.items():
+        if key not in found:
+            cache.add(key, _initial_version(), None)
+            found[key] = cache.get(key, _initial_version())
+        versions[label] = found[key]
+    return versions
+
+
+def _bump(labels):
+    # A fresh version rather than incr(): incr is a get and a set on the
+    # file and database caches, so two workers bumping at once could
+    # both write the same value and lose one invalidation
+    cache.set_many({VERSION_KEY.format(label): _initial_version() for label in labels}, None)
+
+
+def bump(*models):
+    """Invalidate every context built from ``models``
+
+    Bumps right away and again once the surrounding transaction commits, so
+    a reader that rebuilt from the uncommitted state in between cannot leave
+    a stale entry under the new version.
+    """
+    labels = [_label(model) for model in models]
+    _bump(labels)
+    transaction.on_commit(lambda: _bump(labels))
+
+
+def context_key(name, models):
+    versions = model_versions(*models)
+    parts = [f'{label}{versions[label]}' for label in sorted(versions)]
+    # Contexts contain "this week"/"last 30 days" figures
+    return f'recruits:context:{name}:{timezone.localdate().isoformat()}:{":".join(parts)}'
+
+
+def cached_context(name, models, build, timeout=None):
+    """Return the cached result of ``build()`` for the current model versions
+
+    On a miss only one caller rebuilds; concurrent callers wait briefly for
+    its result instead of all recomputing at once. The lock is a
+    ``cache.add``, which only the ``db`` preset and memcached/redis make
+    atomic across processes: on the ``file`` preset two workers can both
+    take it and rebuild the same context, which costs time but never
+    serves stale data.
+    """
+    if timeout is None:
+        timeout = settings.VIEW_CACHE_TIMEOUT
+    key = context_key(name, models)
+    context = cache.get(key)
+    if context is not None:
+        return context
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, True, LOCK_TIMEOUT):
+        try:
+            context = build()
+            cache.set(key, context, timeout)
+        finally:
+            cache.delete(lock_key)
+        return context
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        context = cache.get(key)
+        if context is not None:
+            return context
+    return build()
+
+
+def cached_response(request, name, models, build, timeout=None):
+    """Serve ``build()``'s response from the cache, answering conditional GETs
+
+    The cached entry keeps the body with an ETag of its content and the
+    time it was rendered, under the current versions of ``models``. A hit,
+    including a 304 for a matching ``If-None-Match`` or
+    ``If-Modified-Since``, reads only the cache. The response is marked
+    public for ``timeout`` seconds, so it must not depend on the visitor.
+    """
+    if timeout is None:
+        timeout = settings.PUBLIC_PAGE_CACHE_TIMEOUT
+    if request.method not in ('GET', 'HEAD'):
+        return build()
+    key = context_key(f'response:{name}', models)
+    entry = cache.get(key)
+    if entry is None:
+        built = build()
+        if built.status_code != 200 or built.streaming:
+            return built
+        entry = {
+            'content': built.content,
+            'content_type': built['Content-Type'],
+            'etag': quote_etag(hashlib.md5(built.content, usedforsecurity=False).hexdigest()),
+            'last_modified': int(time.time()),
+        }
+        cache.set(key, entry, timeout)
+
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response.headers['ETag'] = entry['etag']
+    response.headers['Last-Modified'] = http_date(entry['last_modified'])
+    patch_response_headers(response, timeout)
+    patch_cache_control(response, public=True)
+    return get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified'], response=response,
+    )
+
+
+def page_etag(models, request, *args, **kwargs):
+    """ETag of a per-user page built from ``models``, or None to skip validation
+
+    Covers everything the page depends on besides the data: the deployed
+    code, the day, the user, the CSRF secret its forms embed, the URL and
+    the HTMX fragment requested.
+    """
+    if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+        # Pending messages are shown once, by a full render
+        return None
+    versions = model_versions(*models)
+    parts = [
+        settings.RELEASE,
+        timezone.localdate().isoformat(),
+        str(request.user.pk),
+        # Rotated on login, so a page kept from an earlier session is re-sent;
+        # get_token() creates it on a first visit, as the render would
+        get_token(request) and request.META.get('CSRF_COOKIE', ''),
+        request.get_full_path(),
+        request.headers.get('HX-Request', ''),
+        request.headers.get('HX-Target', ''),
+        *(f'{label}{versions[label]}' for label in sorted(versions)),
+    ]
+    return hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_page(*models):
+    """View decorator answering ``If-None-Match`` with 304 while ``models`` are unchanged
+
+    Responses are ``private, no-cache``: browsers keep them but revalidate
+    every time, HTMX requests included, so a 304 costs a cache lookup
+    instead of the view's queries and render.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            return _async_conditional_page(view, models)
+        conditional = condition(etag_func=partial(page_etag, models))(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional(request, *args, **kwargs)
+            if response.has_header('ETag'):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
+
+
+def _async_conditional_page(view, models):
+    # ``condition`` only wraps sync views in Django 4.2
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        etag = await sync_to_async(page_etag)(models, request, *args, **kwargs)
+        if etag is None:
+            return await view(request, *args, **kwargs)
+        etag = quote_etag(etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = await view(request, *args, **kwargs)
+            if not response.has_header('ETag'):
+                response.headers['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
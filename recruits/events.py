@@ -0,0 +1,87 @@
+"""
+Append-only log of candidate status changes.
+
+Every path that changes ``Candidate.status`` appends a
+``CandidateStatusEvent``: saves through ``recruits.signals``, and the bulk
+import and transition paths through ``record``. Candidates created before
+the log existed get their history reconstructed from the stage date
+columns by ``backfill``.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import caching, metrics
+from .models import Candidate, CandidateStatusEvent
+
+BATCH_SIZE = 1000
+
+
+def record(changes, at=None):
+    """Append an event for every ``(candidate_id, from_status, to_status)`` that changes status"""
+    at = at or timezone.now()
+    events = [
+        CandidateStatusEvent(candidate_id=candidate_id, from_status=from_status or '', to_status=to_status, at=at)
+        for candidate_id, from_status, to_status in changes
+        if from_status != to_status
+    ]
+    if events:
+        CandidateStatusEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+        caching.bump(CandidateStatusEvent)
+    return len(events)
+
+
+def history(values):
+    """Events implied by one candidate's applied date and stage date columns
+
+    The columns only hold the first time each stage was reached, so the
+    history visits the stages in date order and, if the candidate has since
+    moved elsewhere, ends with a move to the current status at its last
+    update.
+    """
+    steps = [(values['applied_date'], 'new')]
+    steps.extend(
+        (values[field], stage)
+        for stage, field in metrics.STAGE_DATE_FIELDS
+        if values[field] is not None
+    )
+    # Stable sort: "new" stays first when a stage was set on creation
+    steps.sort(key=lambda step: step[0])
+    if steps[-1][1] != values['status']:
+        steps.append((max(values['updated_at'], steps[-1][0]), values['status']))
+
+    events = []
+    previous = ''
+    for at, status in steps:
+        if status == previous:
+            continue
+        events.append(CandidateStatusEvent(
+            candidate_id=values['id'], from_status=previous, to_status=status, at=at,
+        ))
+        previous = status
+    return events
+
+
+def backfill(batch_size=BATCH_SIZE):
+    """Reconstruct events for candidates without any; returns ``(candidates, events)``"""
+    missing = (
+        Candidate.objects.filter(~Exists(CandidateStatusEvent.objects.filter(candidate=OuterRef('pk'))))
+        .order_by('pk')
+        .values('id', 'status', 'applied_date', 'updated_at', *[field for _stage, field in metrics.STAGE_DATE_FIELDS])
+    )
+    candidates = created = 0
+    last_id = 0
+    while True:
+        # Page by id rather than holding a cursor open while inserting
+        batch = list(missing.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1]['id']
+        events = [event for values in batch for event in history(values)]
+        with transaction.atomic():
+            CandidateStatusEvent.objects.bulk_create(events, batch_size=batch_size)
+        candidates += len(batch)
+        created += len(events)
+    if created:
+        caching.bump(CandidateStatusEvent)
+    return candidates, created
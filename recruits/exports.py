@@ -0,0 +1,149 @@
+"""
+Streaming CSV and JSONL exports of the candidate and interview lists.
+
+Rows are read with ``values_list(...).iterator()`` so no model instances
+are built and only one database chunk is held at a time; the response
+body is produced as the client reads it, optionally gzip-compressed.
+"""
+import csv
+import json
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+CHUNK_SIZE = 2000
+
+# Rows per piece of response body; fewer, larger pieces stream faster
+ROWS_PER_WRITE = 500
+
+# (column header, values_list lookup)
+CANDIDATE_COLUMNS = [
+    ('id', 'id'),
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('position', 'position__title'),
+    ('status', 'status'),
+    ('experience_years', 'experience_years'),
+    ('applied_date', 'applied_date'),
+    ('screening_date', 'screening_date'),
+    ('interview_date', 'interview_date'),
+    ('offer_date', 'offer_date'),
+    ('hired_date', 'hired_date'),
+    ('rejected_date', 'rejected_date'),
+]
+
+INTERVIEW_COLUMNS = [
+    ('id', 'id'),
+    ('candidate_first_name', 'candidate__first_name'),
+    ('candidate_last_name', 'candidate__last_name'),
+    ('candidate_email', 'candidate__email'),
+    ('position', 'candidate__position__title'),
+    ('interviewer_name', 'interviewer_name'),
+    ('interviewer_email', 'interviewer_email'),
+    ('scheduled_date', 'scheduled_date'),
+    ('scheduled_time', 'scheduled_time'),
+    ('interview_type', 'interview_type'),
+    ('status', 'status'),
+    ('rating', 'rating'),
+]
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` hands back the written line"""
+
+    def write(self, value):
+        return value
+
+
+def _format(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat(timespec='seconds')
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == ROWS_PER_WRITE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_lines(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for batch in _batches(rows):
+        yield ''.join(writer.writerow([_format(value) for value in row]) for row in batch)
+
+
+def jsonl_lines(headers, rows):
+    for batch in _batches(rows):
+        yield ''.join(
+            json.dumps(dict(zip(headers, (_format(value) for value in row)))) + '\n'
+            for row in batch
+        )
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an ``Accept-Encoding`` value allows gzip; ``q=0`` refuses it"""
+    wildcard = False
+    for item in accept_encoding.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.lower()
+        if coding in ('gzip', 'x-gzip'):
+            return quality > 0
+        if coding == '*':
+            wildcard = quality > 0
+    return wildcard
+
+
+def export_response(request, queryset, columns, ordering, name):
+    """Stream ``queryset`` as ``?format=csv`` (default) or ``jsonl``, gzipped if the client accepts it"""
+    file_format = request.GET.get('format', 'csv')
+    if file_format not in FORMATS:
+        file_format = 'csv'
+    content_type, extension = FORMATS[file_format]
+
+    headers = [header for header, _lookup in columns]
+    rows = (
+        queryset.order_by(*ordering)
+        .values_list(*[lookup for _header, lookup in columns])
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    lines = csv_lines(headers, rows) if file_format == 'csv' else jsonl_lines(headers, rows)
+    content = (line.encode() for line in lines)
+
+    gzip = accepts_gzip(request.headers.get('Accept-Encoding', ''))
+    response = StreamingHttpResponse(
+        compress_sequence(content) if gzip else content,
+        content_type=f'{content_type}; charset=utf-8',
+    )
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    filename = f'{name}-{timezone.localdate().isoformat()}.{extension}'
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,69 @@
+"""
+Search and filter parameters shared by the list views and the exports.
+
+Each function narrows a queryset by the same GET parameters its list page
+submits, so an export always matches what the list shows.
+"""
+from .models import Candidate, Department, Interview, Position
+from .search import matches
+
+
+def filter_candidates(queryset, params):
+    """Apply the candidate list's ``search``, ``status`` and ``position`` filters"""
+    search = params.get('search', '')
+    if search:
+        queryset = queryset.filter(matches(Candidate, search))
+
+    status = params.get('status', '')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    position = params.get('position', '')
+    if position:
+        queryset = queryset.filter(position_id=position)
+    return queryset
+
+
+def filter_positions(queryset, params):
+    """Apply the position list's ``search``, ``status`` and ``department`` filters"""
+    search = params.get('search', '')
+    if search:
+        queryset = queryset.filter(
+            matches(Position, search) |
+            matches(Department, search, field='department')
+        )
+
+    status = params.get('status', '')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    department = params.get('department', '')
+    if department:
+        queryset = queryset.filter(department_id=department)
+    return queryset
+
+
+def filter_interviews(queryset, params):
+    """Apply the interview list's search, status, type and date range filters"""
+    search = params.get('search', '')
+    if search:
+        queryset = queryset.filter(
+            matches(Candidate, search, field='candidate') |
+            matches(Interview, search)
+        )
+
+    status = params.get('status', '')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    interview_type = params.get('type', '')
+    if interview_type:
+        queryset = queryset.filter(interview_type=interview_type)
+
+    date_from = params.get('date_from', '')
+    if date_from:
+        queryset = queryset.filter(scheduled_date__gte=date_from)
+    date_to = params.get('date_to', '')
+    if date_to:
+        queryset = queryset.filter(scheduled_date__lte=date_to)
+    return queryset
@@ -0,0 +1,227 @@
+"""
+Bulk candidate import from job board exports.
+
+Rows are streamed from CSV or JSONL and written in chunks: each chunk is
+one transaction that looks up existing candidates by email, then inserts
+the new ones with ``bulk_create`` and updates the changed ones with a
+single prepared UPDATE run through ``executemany``. Only one chunk is
+held in memory at a time. Bulk writes skip model signals, so each chunk
+records status events and applies its rollup deltas, and the import
+invalidates cached contexts itself.
+"""
+import csv
+import json
+from collections import Counter
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import caching, events, rollups
+from .models import Candidate, Position
+
+# Columns copied onto candidates as-is; ``position`` holds a position title
+TEXT_COLUMNS = ('first_name', 'last_name', 'phone', 'notes')
+COLUMNS = TEXT_COLUMNS + ('email', 'position', 'status', 'experience_years')
+STATUSES = {value for value, _label in Candidate.STATUS_CHOICES}
+
+# Fields an import may change on an existing candidate
+UPDATE_FIELDS = (
+    list(TEXT_COLUMNS)
+    + ['experience_years', 'position', 'status']
+    + [field for field, _counter in rollups.STAGE_COUNTERS]
+)
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(stream, file_format):
+    """Yield ``(line_number, row)`` from an open CSV or JSONL text stream"""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else {'_invalid': line}
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def position_lookup():
+    """Lower-cased position title -> id, preferring open positions"""
+    lookup = {}
+    for position in Position.objects.order_by('created_at').values('id', 'title', 'status'):
+        key = position['title'].strip().lower()
+        if key not in lookup or position['status'] == 'open':
+            lookup[key] = position['id']
+    return lookup
+
+
+def clean_row(row, positions):
+    """Validated ``{column: value}`` for the columns present in ``row``"""
+    if '_invalid' in row:
+        raise RowError('not a JSON object')
+    values = {}
+    for column in COLUMNS:
+        if column not in row:
+            continue
+        value = row[column]
+        values[column] = '' if value is None else str(value).strip()
+
+    email = values.get('email', '')
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise RowError(f'invalid email {email!r}')
+
+    if 'status' in values:
+        values['status'] = values['status'].lower() or 'new'
+        if values['status'] not in STATUSES:
+            raise RowError(f"unknown status {values['status']!r}")
+    if 'experience_years' in values:
+        try:
+            values['experience_years'] = int(values['experience_years'] or 0)
+        except ValueError:
+            raise RowError(f"invalid experience_years {values['experience_years']!r}")
+    if 'position' in values:
+        title = values.pop('position')
+        if title and title.lower() not in positions:
+            raise RowError(f'unknown position {title!r}')
+        values['position_id'] = positions[title.lower()] if title else None
+    return values
+
+
+def _values(candidate):
+    return [getattr(candidate, candidate._meta.get_field(field).attname) for field in UPDATE_FIELDS]
+
+
+def _assign(candidate, values):
+    for column in TEXT_COLUMNS + ('experience_years', 'position_id'):
+        if column in values:
+            setattr(candidate, column, values[column])
+    status = values.get('status')
+    if status and (candidate._state.adding or status != candidate.status):
+        # Same stage-date semantics as the create and update views
+        candidate.update_status_timestamp(status)
+        candidate.status = status
+
+
+def _update(candidates):
+    # bulk_update() compiles a CASE WHEN per field and row, which costs far
+    # more than the writes themselves; one prepared statement does the same.
+    if not candidates:
+        return
+    meta = Candidate._meta
+    fields = [meta.get_field(name) for name in UPDATE_FIELDS + ['updated_at']]
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(meta.db_table),
+        ', '.join(f'{quote(field.column)} = %s' for field in fields),
+        quote(meta.pk.column),
+    )
+    params = [
+        [field.get_db_prep_save(getattr(candidate, field.attname), connection) for field in fields] + [candidate.pk]
+        for candidate in candidates
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def import_chunk(rows, positions):
+    """Upsert one chunk of ``(line_number, row)``; returns counts and row errors"""
+    counts = Counter()
+    errors = []
+    cleaned = {}
+    for line_number, row in rows:
+        try:
+            values = clean_row(row, positions)
+        except RowError as error:
+            errors.append((line_number, str(error)))
+            continue
+        # A later row for the same email wins
+        cleaned[values.pop('email')] = values
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {candidate.email: candidate for candidate in Candidate.objects.filter(email__in=cleaned)}
+        created, updated = [], []
+        status_changes = []
+        deltas = Counter()
+        for email, values in cleaned.items():
+            candidate = existing.get(email)
+            if candidate is None:
+                candidate = Candidate(email=email)
+                _assign(candidate, values)
+                created.append(candidate)
+                continue
+            before = _values(candidate)
+            previous = rollups.snapshot(candidate, rollups.CANDIDATE_FIELDS)
+            _assign(candidate, values)
+            if _values(candidate) == before:
+                counts['unchanged'] += 1
+                continue
+            candidate.updated_at = now
+            if candidate.status != previous['status']:
+                status_changes.append((candidate.pk, previous['status'], candidate.status))
+            current = rollups.snapshot(candidate, rollups.CANDIDATE_FIELDS)
+            deltas.update(rollups.diff(
+                rollups.candidate_contributions(previous),
+                rollups.candidate_contributions(current),
+            ))
+            if previous['position_id'] != current['position_id']:
+                for interview in candidate.interviews.order_by().values(*rollups.INTERVIEW_FIELDS):
+                    deltas.subtract(rollups.interview_contributions(interview, previous['position_id']))
+                    deltas.update(rollups.interview_contributions(interview, current['position_id']))
+            updated.append(candidate)
+
+        Candidate.objects.bulk_create(created)
+        _update(updated)
+        for candidate in created:
+            # applied_date is filled in by bulk_create
+            deltas.update(rollups.candidate_contributions(rollups.snapshot(candidate, rollups.CANDIDATE_FIELDS)))
+            status_changes.append((candidate.pk, '', candidate.status))
+        rollups.apply(deltas)
+        events.record(status_changes, at=now)
+
+    counts['created'] = len(created)
+    counts['updated'] = len(updated)
+    counts['skipped'] = len(errors)
+    return counts, errors
+
+
+def import_candidates(rows, chunk_size=1000, on_chunk=None):
+    """Upsert candidates from ``(line_number, row)`` pairs, ``chunk_size`` rows per transaction
+
+    ``on_chunk(counts, errors)`` is called after every chunk with the
+    running totals and that chunk's row errors.
+    """
+    positions = position_lookup()
+    totals = Counter()
+    try:
+        for chunk in chunked(rows, chunk_size):
+            counts, errors = import_chunk(chunk, positions)
+            totals.update(counts)
+            if on_chunk is not None:
+                on_chunk(totals, errors)
+    finally:
+        if totals['created'] or totals['updated']:
+            caching.bump(Candidate)
+    return totals
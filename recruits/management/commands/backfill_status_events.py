@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruits import events
+
+
+class Command(BaseCommand):
+    help = "Reconstruct status events from the stage date columns for candidates that have none"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=events.BATCH_SIZE,
+            help=f"Candidates processed per transaction (default: {events.BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        candidates, created = events.backfill(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} status events for {candidates} candidates in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,73 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from recruits.models import Candidate
+
+# Django's SQLite backend caps a statement at 999 parameters
+SQLITE_DEFAULT_MAX_PARAMS = 999
+
+
+class Command(BaseCommand):
+    help = "Measure rows/sec for bulk candidate inserts on the configured database (changes are rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=5000,
+            help="Candidates inserted per measurement (default: 5000)",
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        fields = [field for field in Candidate._meta.concrete_fields if not field.primary_key]
+        self.stdout.write(f"{connection.display_name}, {rows} rows per run")
+
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(Candidate._meta.db_table),
+            ', '.join(connection.ops.quote_name(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+
+        def params(candidates):
+            return [
+                [field.get_db_prep_save(field.pre_save(candidate, True), connection) for field in fields]
+                for candidate in candidates
+            ]
+
+        def row_by_row(param_list):
+            with connection.cursor() as cursor:
+                for row in param_list:
+                    cursor.execute(sql, row)
+
+        def executemany(param_list):
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, param_list)
+
+        old_batch_size = SQLITE_DEFAULT_MAX_PARAMS // len(fields)
+        self.report(
+            "bulk_create, 999-parameter batches", self.candidates,
+            lambda candidates: Candidate.objects.bulk_create(candidates, batch_size=old_batch_size), rows,
+        )
+        self.report("bulk_create, backend batch size", self.candidates, Candidate.objects.bulk_create, rows)
+        self.report(
+            "execute, one statement per row", lambda count: params(self.candidates(count)), row_by_row, rows,
+        )
+        self.report("executemany", lambda count: params(self.candidates(count)), executemany, rows)
+
+    def candidates(self, count):
+        run = uuid.uuid4().hex[:8]
+        return [
+            Candidate(first_name='Bench', last_name=str(index), email=f'bench-{run}-{index}@example.com')
+            for index in range(count)
+        ]
+
+    def report(self, label, prepare, insert, rows):
+        data = prepare(rows)
+        with transaction.atomic():
+            started = time.perf_counter()
+            insert(data)
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        self.stdout.write(f"  {label:<38} {rows / elapsed:>12,.0f} rows/sec")
@@ -0,0 +1,60 @@
+import importlib
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from recruits import views
+from recruits.models import Candidate
+
+
+class Command(BaseCommand):
+    help = "Measure statements/sec for the candidate list query on the configured database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, default=5000,
+            help="Statements executed per measurement (default: 5000)",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        queryset = (
+            Candidate.objects.select_related('position')
+            .filter(status='new')
+            .order_by(*views.CANDIDATE_ORDERING)[:11]
+        )
+        sql, params = queryset.query.sql_with_params()
+        self.stdout.write(f"{connection.display_name}, {iterations} statements per run")
+
+        def raw():
+            with connection.cursor() as cursor:
+                for _ in range(iterations):
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+
+        def orm():
+            for _ in range(iterations):
+                list(queryset.all())
+
+        self.report("cursor.execute", iterations, raw)
+        self.report("ORM queryset", iterations, orm)
+
+        backend = importlib.import_module(connection.settings_dict['ENGINE'] + '.base')
+        convert_query = getattr(backend, 'convert_query', None)
+        if hasattr(convert_query, 'cache_info'):
+            # Placeholder translation alone, without and with the SQL cache
+            uncached = convert_query.__wrapped__
+            self.report("placeholder conversion, uncached", iterations, lambda: [
+                uncached(sql) for _ in range(iterations)
+            ])
+            self.report("placeholder conversion, cached", iterations, lambda: [
+                convert_query(sql) for _ in range(iterations)
+            ])
+            self.stdout.write(f"  {convert_query.cache_info()}")
+
+    def report(self, label, iterations, run):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"  {label:<34} {iterations / elapsed:>12,.0f} statements/sec")
@@ -0,0 +1,51 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recruits import imports
+
+
+class Command(BaseCommand):
+    help = "Create or update candidates, matched on email, from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV with a header row, or one JSON object per line")
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Rows written per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        file_format = options['format'] or ('jsonl' if path.suffix in ('.jsonl', '.ndjson') else 'csv')
+        if not path.is_file():
+            raise CommandError(f"No such file: {path}")
+
+        started = time.perf_counter()
+
+        def progress(totals, errors):
+            for line_number, message in errors:
+                self.stderr.write(f"Line {line_number}: {message}")
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{sum(totals.values())} rows...")
+
+        with path.open(newline='', encoding='utf-8-sig') as stream:
+            totals = imports.import_candidates(
+                imports.read_rows(stream, file_format),
+                chunk_size=options['chunk_size'],
+                on_chunk=progress,
+            )
+
+        elapsed = time.perf_counter() - started
+        rows = sum(totals.values())
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {rows} rows ({totals['created']} created, {totals['updated']} updated, "
+            f"{totals['unchanged']} unchanged, {totals['skipped']} skipped) "
+            f"in {elapsed:.2f}s, {rate:,.0f} rows/sec"
+        ))
@@ -0,0 +1,164 @@
+import json
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from backends import profile
+from recruits import seeding
+from recruits.models import Candidate
+
+# SQLite as configured before the profile: rollback journal, Python's
+# 5 second timeout and deferred transactions
+DEFAULT_OPTIONS = {
+    'transaction_mode': 'DEFERRED',
+    'pragmas': {**{name: None for name in profile.PRAGMAS}, 'journal_mode': 'delete'},
+}
+CANDIDATES = 2000
+
+
+def use_database(path, options):
+    """Point the default alias of this process at ``path``"""
+    connections.close_all()
+    settings.DATABASES['default'] = {'ENGINE': 'backends.sqlite3', 'NAME': str(path), 'OPTIONS': options}
+    connections.settings = connections.configure_settings(settings.DATABASES)
+    del connections['default']
+
+
+def is_lock_error(exc):
+    message = str(exc).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class Command(BaseCommand):
+    help = "Measure SQLite throughput and lock errors under concurrent writer and reader processes"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help="Writer processes (default: 4)")
+        parser.add_argument('--readers', type=int, default=4, help="Reader processes (default: 4)")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds each process runs (default: 10)")
+        parser.add_argument(
+            '--mode', action='append', dest='modes', choices=['default', 'profile'],
+            help="SQLite configuration to measure, repeatable (default: both)",
+        )
+        # Internal: run one worker in this process and print its counts as JSON
+        parser.add_argument('--probe', choices=['writer', 'reader'], help="==SUPPRESS==")
+        parser.add_argument('--database', help="==SUPPRESS==")
+        parser.add_argument('--options', help="==SUPPRESS==")
+        parser.add_argument('--start-at', type=float, help="==SUPPRESS==")
+        parser.add_argument('--seed', type=int, default=0, help="==SUPPRESS==")
+
+    def handle(self, *args, **options):
+        if options['probe']:
+            use_database(options['database'], json.loads(options['options']))
+            self.stdout.write(json.dumps(self.probe(options)))
+            return
+
+        modes = {
+            'default': DEFAULT_OPTIONS,
+            'profile': settings.DATABASES['default'].get('OPTIONS', {})
+            if settings.DATABASES['default']['ENGINE'] == 'backends.sqlite3' else {},
+        }
+        with TemporaryDirectory() as directory:
+            template = Path(directory) / 'template.sqlite3'
+            self.stdout.write(f"Creating a scratch database with {CANDIDATES} candidates...")
+            use_database(template, DEFAULT_OPTIONS)
+            call_command('migrate', verbosity=0)
+            seeding.seed(departments_count=5, positions_count=50, candidates_count=CANDIDATES, interviews_count=0)
+            connections.close_all()
+
+            self.stdout.write(
+                f"{options['writers']} writers and {options['readers']} readers for {options['duration']:g}s"
+            )
+            self.stdout.write(
+                f"  {'mode':<10} {'writes/s':>10} {'reads/s':>10} {'lock errors':>12} "
+                f"{'write p95 ms':>13} {'read p95 ms':>12}"
+            )
+            for mode in options['modes'] or list(modes):
+                path = Path(directory) / f'{mode}.sqlite3'
+                shutil.copy(template, path)
+                results = self.spawn(path, modes[mode], options)
+                self.report(mode, results, options['duration'])
+
+    def spawn(self, path, database_options, options):
+        # Every process starts work at the same moment, after Django has loaded
+        start_at = time.time() + 2
+        processes = []
+        for role, count in (('writer', options['writers']), ('reader', options['readers'])):
+            for index in range(count):
+                command = [
+                    sys.executable, sys.argv[0], 'measure_contention', '--probe', role,
+                    '--database', str(path), '--options', json.dumps(database_options),
+                    '--start-at', str(start_at), '--duration', str(options['duration']),
+                    '--seed', str(index),
+                ]
+                processes.append(subprocess.Popen(command, stdout=subprocess.PIPE, text=True))
+        results = []
+        for process in processes:
+            output, _ = process.communicate()
+            if process.returncode:
+                raise subprocess.CalledProcessError(process.returncode, process.args, output)
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        return results
+
+    def report(self, mode, results, duration):
+        def p95(timings):
+            return statistics.quantiles(timings, n=20)[-1] * 1000 if len(timings) > 1 else 0.0
+
+        writes = [result for result in results if result['role'] == 'writer']
+        reads = [result for result in results if result['role'] == 'reader']
+        self.stdout.write(
+            f"  {mode:<10} "
+            f"{sum(result['ops'] for result in writes) / duration:>10.1f} "
+            f"{sum(result['ops'] for result in reads) / duration:>10.1f} "
+            f"{sum(result['lock_errors'] for result in results):>12} "
+            f"{p95([t for result in writes for t in result['timings']]):>13.1f} "
+            f"{p95([t for result in reads for t in result['timings']]):>12.1f}"
+        )
+
+    def probe(self, options):
+        rng = random.Random(options['seed'])
+        operation = self.write if options['probe'] == 'writer' else self.read
+        Candidate.objects.exists()
+        time.sleep(max(0, options['start_at'] - time.time()))
+        deadline = time.time() + options['duration']
+        ops = lock_errors = 0
+        timings = []
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                operation(rng)
+            except OperationalError as exc:
+                if not is_lock_error(exc):
+                    raise
+                lock_errors += 1
+                continue
+            timings.append(time.perf_counter() - started)
+            ops += 1
+        return {'role': options['probe'], 'ops': ops, 'lock_errors': lock_errors, 'timings': timings}
+
+    def write(self, rng):
+        # A recruiter editing a candidate: read, then save through the signals
+        with transaction.atomic():
+            candidate = Candidate.objects.get(pk=rng.randint(1, CANDIDATES))
+            status = rng.choice([value for value, _label in Candidate.STATUS_CHOICES])
+            if status != candidate.status:
+                candidate.update_status_timestamp(status)
+            candidate.status = status
+            candidate.save()
+
+    def read(self, rng):
+        status = rng.choice([value for value, _label in Candidate.STATUS_CHOICES])
+        candidates = Candidate.objects.select_related('position').filter(status=status).order_by('-applied_date')
+        candidates.count()
+        list(candidates[:10])
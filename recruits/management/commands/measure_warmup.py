@@ -0,0 +1,82 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+DEFAULT_PATHS = ['/', '/accounts/login/']
+
+
+class Command(BaseCommand):
+    help = "Compare first-request latency of fresh processes with and without the boot warm-up"
+    # System checks load URLconfs and templates, which would warm the cold runs
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help="Fresh processes started per mode (default: 5)",
+        )
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help=f"Path requested in order, repeatable (default: {' '.join(DEFAULT_PATHS)})",
+        )
+        # Internal: run one measurement in this process and print it as JSON
+        parser.add_argument('--probe', choices=['cold', 'warm'], help="==SUPPRESS==")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        if options['probe']:
+            self.stdout.write(json.dumps(self.probe(paths, warm=options['probe'] == 'warm')))
+            return
+
+        results = {'cold': [], 'warm': []}
+        for _ in range(options['runs']):
+            # Alternate so both modes see the same disk and database caches
+            for mode in results:
+                results[mode].append(self.spawn(mode, paths))
+
+        self.stdout.write(f"First requests of a fresh process, median of {options['runs']} runs")
+        self.stdout.write(f"  {'path':<30} {'cold ms':>10} {'warm ms':>10}")
+        for index, path in enumerate(paths):
+            cold, warm = (
+                statistics.median(run['requests'][index][2] for run in results[mode]) * 1000
+                for mode in ('cold', 'warm')
+            )
+            self.stdout.write(f"  {path:<30} {cold:>10.1f} {warm:>10.1f}")
+
+        self.stdout.write("Warm-up at boot, median")
+        for step, (count, _seconds) in results['warm'][0]['warmup'].items():
+            seconds = statistics.median(run['warmup'][step][1] for run in results['warm'])
+            self.stdout.write(f"  {step:<30} {seconds * 1000:>10.1f} ms ({count})")
+
+    def spawn(self, mode, paths):
+        command = [sys.executable, sys.argv[0], 'measure_warmup', '--probe', mode]
+        for path in paths:
+            command += ['--path', path]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def probe(self, paths, warm):
+        # Boot like a gunicorn worker: the handler loads middleware up front
+        from django.core.wsgi import get_wsgi_application
+
+        from cleanrecruit import warmup
+
+        application = get_wsgi_application()
+        timings = warmup.run(force=True) if warm else {}
+        host = next((host for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost').lstrip('.')
+        requests = []
+        for path in paths:
+            environ = {'PATH_INFO': path, 'HTTP_HOST': host, 'wsgi.url_scheme': 'https' if not settings.DEBUG else 'http'}
+            setup_testing_defaults(environ)
+            status = []
+            started = time.perf_counter()
+            response = application(environ, lambda code, headers: status.append(int(code.split()[0])))
+            b''.join(response)
+            requests.append((path, status[0], time.perf_counter() - started))
+        return {'warmup': timings, 'requests': requests}
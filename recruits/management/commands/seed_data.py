@@ -0,0 +1,86 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recruits import seeding
+from recruits.models import Candidate, Department, Interview, Position
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic, production-sized dataset of departments, positions, candidates and interviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--departments', type=int, default=300, help="Departments to create (default: 300)")
+        parser.add_argument('--positions', type=int, default=5000, help="Positions to create (default: 5000)")
+        parser.add_argument('--candidates', type=int, default=1000000, help="Candidates to create (default: 1000000)")
+        parser.add_argument('--interviews', type=int, default=1000000, help="Interviews to create (default: 1000000)")
+        parser.add_argument(
+            '--days', type=int, default=730,
+            help="Spread applications over this many days before today (default: 730)",
+        )
+        parser.add_argument(
+            '--until', type=date.fromisoformat,
+            help="Generate data as of the start of this day, YYYY-MM-DD (default: today)",
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help="Random seed; equal seeds and --until give equal data (default: 0)",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=seeding.CHUNK_SIZE,
+            help=f"Rows written per transaction (default: {seeding.CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help="Month partitions of the rollup rebuild computed in parallel (default: 4)",
+        )
+        parser.add_argument(
+            '--append', action='store_true',
+            help="Add to existing data instead of refusing to run on a non-empty database",
+        )
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help="Leave rollups, status events and cached pages to be rebuilt later",
+        )
+
+    def handle(self, *args, **options):
+        models = (Department, Position, Candidate, Interview)
+        if not options['append'] and any(model.objects.exists() for model in models):
+            raise CommandError("The database already has recruitment data; pass --append to add to it")
+        if options['days'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--days and --chunk-size must be positive")
+
+        started = time.perf_counter()
+        with seeding.search_index_suspended(), seeding.indexes_dropped(Candidate, Interview):
+            counts = seeding.seed(
+                seed=options['seed'],
+                departments_count=options['departments'],
+                positions_count=options['positions'],
+                candidates_count=options['candidates'],
+                interviews_count=options['interviews'],
+                days=options['days'],
+                until=options['until'],
+                chunk_size=options['chunk_size'],
+                on_chunk=self.progress if options['verbosity'] > 1 else None,
+            )
+            loaded = time.perf_counter()
+        # Leaving the block rebuilt the indexes
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {total} rows in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s, "
+            f"{elapsed - (loaded - started):.2f}s of it indexing): "
+            + ', '.join(f"{count} {str(model._meta.verbose_name_plural).lower()}" for model, count in counts.items())
+        ))
+        if options['skip_derived']:
+            return
+
+        started = time.perf_counter()
+        seeding.derive(workers=options['workers'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt rollups and status events in {time.perf_counter() - started:.2f}s"
+        ))
+
+    def progress(self, model, written):
+        self.stdout.write(f"  {model._meta.verbose_name_plural}: {written}")
@@ -0,0 +1,208 @@
+"""
+Aggregation layer for the dashboard and analytics views.
+
+Every ``*_metrics`` function answers all of its numbers with a single
+conditional-aggregate query against one model, so a page costs one
+round-trip per model instead of one per figure.
+"""
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Avg, Count, Func, IntegerField, Q, Value
+from django.utils import timezone
+
+from .models import Candidate, CandidateStatusEvent, Interview, Position
+
+# Pipeline stages after "new", in funnel order, with the column recording
+# when a candidate first reached them.
+STAGE_DATE_FIELDS = [
+    ('screening', 'screening_date'),
+    ('interview', 'interview_date'),
+    ('offer', 'offer_date'),
+    ('hired', 'hired_date'),
+    ('rejected', 'rejected_date'),
+]
+
+VELOCITY_DAYS = 7
+
+# Stages reported as "days from application to ...", mirroring the
+# ``time_to_*`` properties on ``Candidate`` and the filters analytics uses.
+DURATION_STAGES = [
+    ('hire', 'hired_date', {'status': 'hired', 'hired_date__isnull': False}),
+    ('screen', 'screening_date', {'screening_date__isnull': False}),
+    ('interview', 'interview_date', {'interview_date__isnull': False}),
+    ('offer', 'offer_date', {'offer_date__isnull': False}),
+]
+
+PERCENTILES = (50, 90)
+
+
+class DaysBetween(Func):
+    """Whole days from the second to the first datetime, floored like ``timedelta.days``"""
+    arity = 2
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template='CAST(FLOOR(EXTRACT(EPOCH FROM (%(expressions)s)) / 86400) AS INTEGER)',
+            arg_joiner=' - ',
+            **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Plain SQLite functions only: the Turso backend does not register
+        # Django's Python helpers. Work in whole milliseconds so the
+        # julianday() float never rounds a 3-day gap down to 2.
+        end_sql, end_params = compiler.compile(self.source_expressions[0])
+        start_sql, start_params = compiler.compile(self.source_expressions[1])
+        millis = f'CAST(ROUND((julianday({end_sql}) - julianday({start_sql})) * 86400000) AS INTEGER)'
+        sql = f'(({millis}) - (({millis}) < 0) * 86399999) / 86400000'
+        return sql, (*end_params, *start_params) * 2
+
+
+def rate(part, whole):
+    """Percentage of ``part`` in ``whole`` rounded to one decimal, 0 when empty"""
+    return round((part / whole * 100), 1) if whole > 0 else 0
+
+
+def candidate_metrics():
+    """Status counts and stage counts for all candidates"""
+    aggregates = {'total': Count('id')}
+    for value, _label in Candidate.STATUS_CHOICES:
+        aggregates[f'status_{value}'] = Count('id', filter=Q(status=value))
+    for stage, field in STAGE_DATE_FIELDS:
+        aggregates[f'reached_{stage}'] = Count('id', filter=Q(**{f'{field}__isnull': False}))
+
+    row = Candidate.objects.aggregate(**aggregates)
+    by_status = {value: row.pop(f'status_{value}') for value, _label in Candidate.STATUS_CHOICES}
+    return {
+        'total': row['total'],
+        'by_status': by_status,
+        # Same shape as ``values('status').annotate(count=Count('id'))``
+        'status_data': [
+            {'status': value, 'count': count}
+            for value, count in by_status.items()
+            if count
+        ],
+        'reached': {stage: row[f'reached_{stage}'] for stage, _field in STAGE_DATE_FIELDS},
+    }
+
+
+def stage_velocity(now=None, days=VELOCITY_DAYS):
+    """Distinct candidates moved into each pipeline stage in the last ``days``"""
+    since = (now or timezone.now()) - timedelta(days=days)
+    stages = [stage for stage, _field in STAGE_DATE_FIELDS]
+    rows = (
+        CandidateStatusEvent.objects.filter(at__gte=since, to_status__in=stages)
+        .values('to_status')
+        .annotate(count=Count('candidate', distinct=True))
+        .order_by()
+    )
+    counts = {row['to_status']: row['count'] for row in rows}
+    return {stage: counts.get(stage, 0) for stage in stages}
+
+
+def transition_counts(now=None, days=VELOCITY_DAYS, from_status=None, to_status=None):
+    """``[{from_status, to_status, count}]`` of status changes in the last ``days``, most common first"""
+    since = (now or timezone.now()) - timedelta(days=days)
+    events = CandidateStatusEvent.objects.filter(at__gte=since)
+    if from_status is not None:
+        events = events.filter(from_status=from_status)
+    if to_status is not None:
+        events = events.filter(to_status=to_status)
+    return list(
+        events.values('from_status', 'to_status')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'from_status', 'to_status')
+    )
+
+
+def position_metrics():
+    """Total and open position counts"""
+    return Position.objects.aggregate(
+        total=Count('id'),
+        open=Count('id', filter=Q(status='open')),
+    )
+
+
+def interview_metrics(today=None):
+    """Interview status counts, this week's schedule and the average rating"""
+    today = today or timezone.now().date()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=7)
+
+    return Interview.objects.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        no_show=Count('id', filter=Q(status='no_show')),
+        this_week=Count('id', filter=Q(scheduled_date__gte=week_start, scheduled_date__lt=week_end)),
+        avg_rating=Avg('rating'),
+    )
+
+
+def _percentile(values_by_rank, count, percent):
+    """Linear-interpolated percentile, the same as ``percentile_cont``"""
+    offset = (count - 1) * percent
+    lower = values_by_rank[offset // 100 + 1]
+    upper = values_by_rank.get(offset // 100 + 2, lower)
+    return lower + (upper - lower) * (offset % 100) / 100
+
+
+def stage_durations():
+    """Average, median and p90 days from application to each pipeline stage
+
+    All stages are answered by one query: each stage contributes a
+    ``(stage, days)`` arm to a UNION ALL, window functions rank the days
+    within each stage, and only the rows sitting at the percentile ranks
+    are returned to Python.
+    """
+    arms = []
+    params = []
+    for stage, end_field, filters in DURATION_STAGES:
+        queryset = (
+            Candidate.objects.filter(**filters)
+            .order_by()
+            .annotate(stage=Value(stage), days=DaysBetween(end_field, 'applied_date'))
+            .values_list('stage', 'days')
+        )
+        arm_sql, arm_params = queryset.query.sql_with_params()
+        arms.append(arm_sql)
+        params.extend(arm_params)
+
+    ranks = ', '.join(
+        f'((cnt - 1) * {percent}) / 100 + {step}'
+        for percent in PERCENTILES
+        for step in (1, 2)
+    )
+    sql = (
+        'SELECT stage, rn, cnt, avg_days, days FROM ('
+        'SELECT stage, days, '
+        'ROW_NUMBER() OVER (PARTITION BY stage ORDER BY days) AS rn, '
+        'COUNT(*) OVER (PARTITION BY stage) AS cnt, '
+        'AVG(days) OVER (PARTITION BY stage) AS avg_days '
+        f'FROM ({" UNION ALL ".join(arms)}) durations'
+        f') ranked WHERE rn IN ({ranks})'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    found = {}
+    for stage, rank, count, avg_days, days in rows:
+        entry = found.setdefault(stage, {'count': count, 'avg': float(avg_days), 'ranks': {}})
+        entry['ranks'][rank] = days
+
+    durations = {}
+    for stage, _end_field, _filters in DURATION_STAGES:
+        entry = found.get(stage)
+        if entry is None:
+            durations[stage] = {'count': 0, 'avg': None, 'median': None, 'p90': None}
+            continue
+        durations[stage] = {
+            'count': entry['count'],
+            'avg': entry['avg'],
+            'median': _percentile(entry['ranks'], entry['count'], 50),
+            'p90': _percentile(entry['ranks'], entry['count'], 90),
+        }
+    return durations
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruits', '0002_add_recruitment_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRecruitmentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('applications', models.IntegerField(default=0)),
+                ('screened', models.IntegerField(default=0)),
+                ('interviewed', models.IntegerField(default=0)),
+                ('offered', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('interviews_completed', models.IntegerField(default=0)),
+                ('interviews_no_show', models.IntegerField(default=0)),
+                ('interviews_cancelled', models.IntegerField(default=0)),
+                ('position', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='recruits.position')),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrecruitmentstat',
+            constraint=models.UniqueConstraint(fields=('date', 'position'), name='unique_daily_stat_per_position'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrecruitmentstat',
+            constraint=models.UniqueConstraint(condition=models.Q(('position__isnull', True)), fields=('date',), name='unique_daily_stat_unassigned'),
+        ),
+    ]
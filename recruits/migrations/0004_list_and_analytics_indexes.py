@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruits', '0003_daily_recruitment_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['-applied_date'], name='candidate_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['status', '-applied_date'], name='candidate_status_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['position', 'status', '-applied_date'], name='candidate_pos_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['screening_date', 'applied_date'], name='candidate_screening_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['interview_date', 'applied_date'], name='candidate_interview_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['offer_date', 'applied_date'], name='candidate_offer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['hired_date', 'applied_date'], name='candidate_hired_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['status', 'screening_date', 'interview_date', 'offer_date', 'hired_date', 'rejected_date'], name='candidate_pipeline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['name'], name='department_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['scheduled_date', 'scheduled_time'], name='interview_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['status', 'scheduled_date', 'scheduled_time', 'rating'], name='interview_status_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interview_type', 'scheduled_date', 'scheduled_time'], name='interview_type_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['-created_at'], name='position_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['status', '-created_at'], name='position_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruits', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('new', 'New'), ('screening', 'Screening'), ('interview', 'Interview'), ('offer', 'Offer'), ('hired', 'Hired'), ('rejected', 'Rejected')], max_length=20)),
+                ('to_status', models.CharField(choices=[('new', 'New'), ('screening', 'Screening'), ('interview', 'Interview'), ('offer', 'Offer'), ('hired', 'Hired'), ('rejected', 'Rejected')], max_length=20)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('candidate', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='recruits.candidate')),
+            ],
+            options={
+                'ordering': ['at', 'id'],
+                'indexes': [models.Index(fields=['candidate', 'at'], name='status_event_candidate_idx'), models.Index(fields=['at', 'from_status', 'to_status', 'candidate'], name='status_event_at_idx'), models.Index(fields=['to_status', 'at', 'candidate'], name='status_event_to_idx'), models.Index(fields=['from_status', 'to_status', 'at'], name='status_event_transition_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from recruits import search
+
+TABLES = ['recruits_department']
+
+
+def install(apps, schema_editor):
+    search.install(schema_editor.connection, tables=TABLES)
+
+
+def uninstall(apps, schema_editor):
+    search.uninstall(schema_editor.connection, tables=TABLES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruits', '0006_candidate_status_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
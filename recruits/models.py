@@ -11,6 +11,9 @@ class Department(models.Model):
     class Meta:
         verbose_name_plural = "Departments"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='department_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -37,6 +40,11 @@ class Position(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # position_list: default ordering, and the status filter
+            models.Index(fields=['-created_at'], name='position_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='position_status_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.location}"
@@ -73,6 +81,24 @@ class Candidate(models.Model):
 
     class Meta:
         ordering = ['-applied_date']
+        indexes = [
+            # candidate_list and the dashboard: default ordering, and the
+            # status / position / status + position filters
+            models.Index(fields=['-applied_date'], name='candidate_applied_idx'),
+            models.Index(fields=['status', '-applied_date'], name='candidate_status_applied_idx'),
+            models.Index(fields=['position', 'status', '-applied_date'], name='candidate_pos_status_idx'),
+            # Analytics time-to-stage: each stage range plus applied_date,
+            # so the duration is read from the index alone
+            models.Index(fields=['screening_date', 'applied_date'], name='candidate_screening_idx'),
+            models.Index(fields=['interview_date', 'applied_date'], name='candidate_interview_idx'),
+            models.Index(fields=['offer_date', 'applied_date'], name='candidate_offer_idx'),
+            models.Index(fields=['hired_date', 'applied_date'], name='candidate_hired_idx'),
+            # Covers every column metrics.candidate_metrics() aggregates
+            models.Index(
+                fields=['status', 'screening_date', 'interview_date', 'offer_date', 'hired_date', 'rejected_date'],
+                name='candidate_pipeline_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -109,6 +135,13 @@ class Candidate(models.Model):
             return (self.offer_date - self.applied_date).days
         return None
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored row so signal handlers can diff it on save
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def update_status_timestamp(self, new_status):
         """Update the appropriate timestamp when status changes"""
         now = timezone.now()
@@ -124,6 +157,34 @@ class Candidate(models.Model):
             self.rejected_date = now
 
 
+class CandidateStatusEvent(models.Model):
+    """One change of a candidate's pipeline status; rows are only ever appended
+
+    Written by ``recruits.signals`` on save and by the bulk write paths, and
+    backfilled from the stage date columns by ``backfill_status_events``.
+    """
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='status_events', db_index=False)
+    # Empty for the status a candidate was created with
+    from_status = models.CharField(max_length=20, choices=Candidate.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Candidate.STATUS_CHOICES)
+    at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['at', 'id']
+        indexes = [
+            # A candidate's timeline (and the foreign key)
+            models.Index(fields=['candidate', 'at'], name='status_event_candidate_idx'),
+            # Analytics: every transition in a window, per-stage velocity,
+            # and one specific "from -> to" move over time
+            models.Index(fields=['at', 'from_status', 'to_status', 'candidate'], name='status_event_at_idx'),
+            models.Index(fields=['to_status', 'at', 'candidate'], name='status_event_to_idx'),
+            models.Index(fields=['from_status', 'to_status', 'at'], name='status_event_transition_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
 class Interview(models.Model):
     """Interview scheduled with a candidate"""
     TYPE_CHOICES = [
@@ -153,6 +214,61 @@ class Interview(models.Model):
 
     class Meta:
         ordering = ['scheduled_date', 'scheduled_time']
+        indexes = [
+            # interview_list: default ordering and date range, and the
+            # status / type filters. The status index also carries rating
+            # so metrics.interview_metrics() is answered from it.
+            models.Index(fields=['scheduled_date', 'scheduled_time'], name='interview_schedule_idx'),
+            models.Index(
+                fields=['status', 'scheduled_date', 'scheduled_time', 'rating'],
+                name='interview_status_schedule_idx',
+            ),
+            models.Index(fields=['interview_type', 'scheduled_date', 'scheduled_time'], name='interview_type_schedule_idx'),
+        ]
 
     def __str__(self):
         return f"{self.candidate} - {self.scheduled_date}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored row so signal handlers can diff it on save
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class DailyRecruitmentStat(models.Model):
+    """Pre-aggregated recruitment activity for one day and position
+
+    Maintained incrementally by ``recruits.signals`` and rebuilt from the
+    source tables by the ``backfill_rollups`` management command.
+    """
+    date = models.DateField()
+    position = models.ForeignKey(Position, on_delete=models.CASCADE, null=True, blank=True, related_name='daily_stats')
+
+    # Candidates entering each pipeline stage that day
+    applications = models.IntegerField(default=0)
+    screened = models.IntegerField(default=0)
+    interviewed = models.IntegerField(default=0)
+    offered = models.IntegerField(default=0)
+    hired = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+
+    # Interview outcomes for interviews scheduled that day
+    interviews_completed = models.IntegerField(default=0)
+    interviews_no_show = models.IntegerField(default=0)
+    interviews_cancelled = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'position'], name='unique_daily_stat_per_position'),
+            models.UniqueConstraint(
+                fields=['date'],
+                condition=models.Q(position__isnull=True),
+                name='unique_daily_stat_unassigned',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.position or 'Unassigned'}"
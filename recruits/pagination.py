@@ -0,0 +1,223 @@
+"""
+Keyset (seek) pagination for the list views.
+
+Offset pagination counts the whole filtered queryset and then skips
+``OFFSET`` rows, which gets slower the deeper a user pages. Keyset pages
+instead continue from the sort key of the last row shown: the next page is
+"rows after this key" and reads only the rows it returns. Cursors are the
+encoded sort key of a page boundary plus a direction, opaque to clients.
+"""
+import base64
+import json
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils.functional import cached_property
+
+PER_PAGE = 10
+
+# Totals are counted up to this many rows; beyond it the page shows "N+"
+COUNT_LIMIT = 1000
+# Admin changelists page through at most this many rows off Postgres
+ADMIN_COUNT_LIMIT = 10000
+
+
+def _encode(values, direction):
+    payload = [direction] + [
+        value.isoformat() if isinstance(value, (date, datetime, time)) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode(cursor, model, fields):
+    """``(direction, values)`` for a cursor, or None if it is not valid for ``fields``"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, *values = json.loads(raw)
+        if direction not in ('next', 'prev') or len(values) != len(fields):
+            return None
+        return direction, [
+            model._meta.get_field(field).to_python(value)
+            for field, value in zip(fields, values)
+        ]
+    except (ValueError, TypeError, LookupError):
+        return None
+
+
+def _parse_ordering(ordering):
+    """``[(field, descending)]`` for an ``order_by()``-style ordering"""
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def seek(keys, values, forward=True):
+    """Q for rows strictly after ``values`` in the ``keys`` ordering (before, if not ``forward``)
+
+    Expands the row comparison ``(a, b, c) > (x, y, z)`` into
+    ``a > x OR (a = x AND b > y) OR ...``, honouring each key's direction,
+    and adds a bound on the leading key so the database can start an index
+    range scan at the cursor rather than filtering from the top.
+    """
+    def operator(descending):
+        return 'lt' if descending == forward else 'gt'
+
+    condition = Q()
+    for index, (field, descending) in enumerate(keys):
+        step = Q(**{f'{field}__{operator(descending)}': values[index]})
+        for (earlier, _descending), value in zip(keys[:index], values):
+            step &= Q(**{earlier: value})
+        condition |= step
+    leading, descending = keys[0]
+    bound = Q(**{f'{leading}__{operator(descending)}e': values[0]})
+    return bound & condition
+
+
+def approximate_count(queryset, limit=COUNT_LIMIT):
+    """``(count, exact)`` for a queryset without counting every row
+
+    Postgres reads the planner's row estimate; other databases count at
+    most ``limit`` rows.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate >= limit:
+            return estimate, False
+    count = queryset.order_by()[:limit].count()
+    return count, count < limit
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting with ``approximate_count`` instead of ``COUNT(*)``
+
+    For the admin changelists: on Postgres the page links follow the
+    planner's estimate, elsewhere they stop after ``count_limit`` rows.
+    Filters and the date hierarchy narrow the list down from there.
+    """
+    count_limit = ADMIN_COUNT_LIMIT
+
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list, self.count_limit)[0]
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset
+
+    Iterates like a ``django.core.paginator.Page``. ``next_query`` and
+    ``previous_query`` are the request's query string with the cursor
+    replaced, so links keep the active search and filters.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor, query, total=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total, self.total_exact = total if total else (None, False)
+        self._query = query
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _query_with(self, cursor):
+        query = self._query.copy()
+        query.pop('page', None)
+        query['cursor'] = cursor
+        return query.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query_with(self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query_with(self.previous_cursor)
+
+    @property
+    def first_query(self):
+        query = self._query.copy()
+        query.pop('page', None)
+        query.pop('cursor', None)
+        return query.urlencode()
+
+
+def keyset_page(queryset, ordering, cursor='', query=None, per_page=PER_PAGE, count_limit=COUNT_LIMIT):
+    """The page of ``queryset`` in ``ordering`` that ``cursor`` points at
+
+    ``ordering`` must end in a unique field (normally ``id``) so every row
+    has a distinct key. An empty or invalid cursor gives the first page.
+    Pass ``count_limit=None`` to skip the approximate total.
+    """
+    keys = _parse_ordering(ordering)
+    fields = [field for field, _descending in keys]
+    decoded = _decode(cursor, queryset.model, fields) if cursor else None
+
+    forward = decoded is None or decoded[0] == 'next'
+    page = queryset.order_by(*ordering)
+    if decoded is not None:
+        page = page.filter(seek(keys, decoded[1], forward))
+    if not forward:
+        page = page.reverse()
+    rows = list(page[:per_page + 1])
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    def key(row):
+        return [getattr(row, queryset.model._meta.get_field(field).attname) for field in fields]
+
+    total = None
+    if count_limit is not None:
+        total = approximate_count(queryset, count_limit)
+
+    return KeysetPage(
+        rows,
+        has_next=has_more if forward else True,
+        has_previous=(decoded is not None) if forward else has_more,
+        next_cursor=_encode(key(rows[-1]), 'next') if rows else '',
+        previous_cursor=_encode(key(rows[0]), 'prev') if rows else '',
+        query=query if query is not None else QueryDict(),
+        total=total,
+    )
+
+
+def paginate(request, queryset, ordering, per_page=PER_PAGE):
+    """Page of ``queryset`` for a list view, keyset or numbered
+
+    Keyset pages are used when ``settings.LIST_PAGINATION`` is ``'keyset'``
+    or the request already carries a cursor, with a total counted up to
+    ``settings.KEYSET_COUNT_LIMIT`` rows (none if 0); otherwise the classic
+    ``?page=N`` paginator, over the same deterministic ordering.
+    """
+    queryset = queryset.order_by(*ordering)
+    if settings.LIST_PAGINATION == 'keyset' or 'cursor' in request.GET:
+        return keyset_page(
+            queryset, ordering,
+            cursor=request.GET.get('cursor', ''),
+            query=request.GET,
+            per_page=per_page,
+            count_limit=settings.KEYSET_COUNT_LIMIT or None,
+        )
+    return Paginator(queryset, per_page).get_page(request.GET.get('page', 1))
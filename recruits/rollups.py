@@ -0,0 +1,250 @@
+"""
+Daily recruitment rollups.
+
+``DailyRecruitmentStat`` holds one row of counters per day and position.
+Every candidate and interview *contributes* a fixed set of counters to
+that table (an application on the day they applied, a hire on the day
+they were hired, ...). Incremental maintenance subtracts a row's old
+contributions and adds its new ones; the backfill recomputes the same
+contributions from scratch, so both paths always agree.
+"""
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, F, Max, Min, OuterRef, Sum
+from django.utils import timezone
+
+from . import caching
+from .models import Candidate, DailyRecruitmentStat, Interview
+
+# Candidate stage column -> rollup counter for candidates entering that stage
+STAGE_COUNTERS = [
+    ('screening_date', 'screened'),
+    ('interview_date', 'interviewed'),
+    ('offer_date', 'offered'),
+    ('hired_date', 'hired'),
+    ('rejected_date', 'rejected'),
+]
+
+# Interview status -> rollup counter
+INTERVIEW_COUNTERS = {
+    'completed': 'interviews_completed',
+    'no_show': 'interviews_no_show',
+    'cancelled': 'interviews_cancelled',
+}
+
+COUNTER_FIELDS = (
+    ['applications']
+    + [counter for _field, counter in STAGE_COUNTERS]
+    + list(INTERVIEW_COUNTERS.values())
+)
+
+CANDIDATE_FIELDS = ['position_id', 'status', 'applied_date'] + [field for field, _counter in STAGE_COUNTERS]
+INTERVIEW_FIELDS = ['candidate_id', 'scheduled_date', 'status']
+
+
+def _to_python(model, name, value):
+    """Normalise a possibly raw attribute (e.g. a POSTed string) to its stored type"""
+    field = model._meta.get_field(name)
+    value = field.to_python(value)
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        return timezone.localdate(value)
+    return value
+
+
+def snapshot(instance, fields):
+    """Current values of ``fields`` on a model instance, normalised"""
+    return {name: _to_python(type(instance), name, getattr(instance, name)) for name in fields}
+
+
+def loaded_snapshot(instance, fields):
+    """Values of ``fields`` as last read from the database, or None if unknown"""
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return None
+    by_attname = {type(instance)._meta.get_field(name).attname: name for name in fields}
+    values = {by_attname[key]: value for key, value in loaded.items() if key in by_attname}
+    if len(values) != len(fields):
+        return None
+    return values
+
+
+def candidate_contributions(values):
+    """Rollup counters one candidate adds, keyed by ``(day, position_id, counter)``"""
+    contributions = Counter()
+    position_id = values['position_id']
+    if values['applied_date']:
+        contributions[(_day(values['applied_date']), position_id, 'applications')] += 1
+    for field, counter in STAGE_COUNTERS:
+        if not values[field]:
+            continue
+        # Analytics only reports hires for candidates still in "hired"
+        if counter == 'hired' and values['status'] != 'hired':
+            continue
+        contributions[(_day(values[field]), position_id, counter)] += 1
+    return contributions
+
+
+def interview_contributions(values, position_id):
+    """Rollup counters one interview adds, keyed by ``(day, position_id, counter)``"""
+    counter = INTERVIEW_COUNTERS.get(values['status'])
+    if counter is None or not values['scheduled_date']:
+        return Counter()
+    return Counter({(_day(values['scheduled_date']), position_id, counter): 1})
+
+
+def candidate_position(candidate_id):
+    return Candidate.objects.filter(pk=candidate_id).values_list('position_id', flat=True).first()
+
+
+def apply(deltas):
+    """Add signed counter ``deltas`` to the rollup table, one UPDATE per bucket"""
+    buckets = defaultdict(dict)
+    for (day, position_id, counter), amount in deltas.items():
+        if amount:
+            buckets[(day, position_id)][counter] = amount
+    if not buckets:
+        return
+
+    with transaction.atomic():
+        for (day, position_id), counters in buckets.items():
+            rows = DailyRecruitmentStat.objects.filter(date=day, position_id=position_id)
+            increments = {counter: F(counter) + amount for counter, amount in counters.items()}
+            if rows.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    DailyRecruitmentStat.objects.create(date=day, position_id=position_id, **counters)
+            except IntegrityError:
+                # Another writer created the bucket first
+                rows.update(**increments)
+
+
+def diff(old, new):
+    """Deltas that turn contributions ``old`` into ``new``"""
+    deltas = Counter(new)
+    deltas.subtract(old)
+    return deltas
+
+
+def fold_position(position_id):
+    """Move a position's rollups to the unassigned bucket before it is deleted"""
+    rows = DailyRecruitmentStat.objects.filter(position_id=position_id)
+    with transaction.atomic():
+        # Days without an unassigned bucket yet just change hands, in one UPDATE
+        unassigned = DailyRecruitmentStat.objects.filter(position_id=None, date=OuterRef('date'))
+        rows.filter(~Exists(unassigned)).update(position_id=None)
+
+        deltas = Counter()
+        for row in rows.values('date', *COUNTER_FIELDS):
+            for counter in COUNTER_FIELDS:
+                deltas[(row['date'], None, counter)] += row[counter]
+        rows.delete()
+        apply(deltas)
+
+
+# ==================== BACKFILL ====================
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _month_start(day):
+    return timezone.make_aware(datetime(day.year, day.month, 1))
+
+
+def month_partitions():
+    """First day of every month with candidate applications or interviews"""
+    months = set()
+    for model, field in ((Candidate, 'applied_date'), (Interview, 'scheduled_date')):
+        bounds = model.objects.aggregate(first=Min(field), last=Max(field))
+        if bounds['first'] is None:
+            continue
+        month = _day(bounds['first']).replace(day=1)
+        while month <= _day(bounds['last']):
+            months.add(month)
+            month = _next_month(month)
+    return sorted(months)
+
+
+def compute_month(month, chunk_size=2000):
+    """Contributions of candidates who applied, and interviews scheduled, in ``month``"""
+    start, end = _month_start(month), _month_start(_next_month(month))
+    contributions = Counter()
+
+    candidates = (
+        Candidate.objects.filter(applied_date__gte=start, applied_date__lt=end)
+        .order_by()
+        .values(*CANDIDATE_FIELDS)
+    )
+    for values in candidates.iterator(chunk_size=chunk_size):
+        contributions.update(candidate_contributions(values))
+
+    interviews = (
+        Interview.objects.filter(scheduled_date__gte=start, scheduled_date__lt=end)
+        .order_by()
+        .values('scheduled_date', 'status', 'candidate__position_id')
+    )
+    for values in interviews.iterator(chunk_size=chunk_size):
+        contributions.update(interview_contributions(values, values['candidate__position_id']))
+    return contributions
+
+
+def rebuild(workers=4, batch_size=1000):
+    """Recompute the whole rollup table, one month partition per worker task"""
+    months = month_partitions()
+    totals = Counter()
+    if workers > 1 and len(months) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for contributions in pool.map(_compute_month_in_thread, months):
+                totals.update(contributions)
+    else:
+        for month in months:
+            totals.update(compute_month(month))
+
+    rows = {}
+    for (day, position_id, counter), amount in totals.items():
+        row = rows.setdefault((day, position_id), DailyRecruitmentStat(date=day, position_id=position_id))
+        setattr(row, counter, amount)
+
+    with transaction.atomic():
+        DailyRecruitmentStat.objects.all().delete()
+        DailyRecruitmentStat.objects.bulk_create(rows.values(), batch_size=batch_size)
+        caching.bump(DailyRecruitmentStat)
+    return len(months), len(rows)
+
+
+def _compute_month_in_thread(month):
+    try:
+        return compute_month(month)
+    finally:
+        # Each worker thread opened its own connection
+        connection.close()
+
+
+# ==================== READS ====================
+
+def daily_totals(counter, since):
+    """``[(day, total)]`` for one counter from ``since`` onwards, skipping empty days"""
+    rows = (
+        DailyRecruitmentStat.objects.filter(date__gte=since)
+        .values('date')
+        .annotate(total=Sum(counter))
+        .filter(total__gt=0)
+        .order_by('date')
+    )
+    return [(row['date'], row['total']) for row in rows]
+
+
+def funnel_totals():
+    """All-time totals of every stage counter"""
+    totals = DailyRecruitmentStat.objects.aggregate(**{counter: Sum(counter) for counter in COUNTER_FIELDS})
+    return {counter: value or 0 for counter, value in totals.items()}
@@ -0,0 +1,192 @@
+"""
+Full-text search for the candidate, position and interview lists.
+
+SQLite (and the Turso backend) use FTS5 external-content tables kept in
+sync with the source table by triggers, so every write path, including
+bulk updates, stays searchable. Postgres uses GIN indexes over a
+``to_tsvector`` expression, which the database maintains itself. Either
+way every word of the query is matched as a prefix of an indexed word.
+Other backends, and SQLite builds without FTS5, fall back to
+``icontains``.
+"""
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Indexed text columns per model table
+SEARCH_FIELDS = {
+    'recruits_candidate': ('first_name', 'last_name', 'email'),
+    'recruits_position': ('title', 'location'),
+    'recruits_interview': ('interviewer_name',),
+    # Position search also matches the department name, through this index
+    'recruits_department': ('name',),
+}
+
+_available = {}
+
+
+def terms(query):
+    """Lower-cased words of a search box value"""
+    return re.findall(r'\w+', query.lower())
+
+
+def _fts_table(table):
+    return f'{table}_fts'
+
+
+def _pg_document(table, columns, qualify=False):
+    prefix = f'"{table}".' if qualify else ''
+    parts = [f"coalesce({prefix}\"{column}\", '')" for column in columns]
+    joined = " || ' ' || ".join(parts)
+    return f"to_tsvector('simple', {joined})"
+
+
+# ==================== SCHEMA ====================
+
+def _sqlite_statements(table, columns):
+    fts = _fts_table(table)
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def install(connection, rebuild=True, tables=None):
+    """Create the search index for ``connection``; returns False if unsupported
+
+    ``tables`` limits it to some of the ``SEARCH_FIELDS`` tables.
+    """
+    _available.pop(connection.alias, None)
+    fields = {table: SEARCH_FIELDS[table] for table in tables or SEARCH_FIELDS}
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for table, columns in fields.items():
+                try:
+                    for statement in _sqlite_statements(table, columns):
+                        cursor.execute(statement)
+                except DatabaseError:
+                    # SQLite compiled without FTS5
+                    return False
+                if rebuild:
+                    fts = _fts_table(table)
+                    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            return True
+        if connection.vendor == 'postgresql':
+            for table, columns in fields.items():
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} '
+                    f'USING GIN ({_pg_document(table, columns)})'
+                )
+            return True
+    return False
+
+
+def uninstall(connection, tables=None):
+    _available.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        for table in tables or SEARCH_FIELDS:
+            if connection.vendor == 'sqlite':
+                fts = _fts_table(table)
+                for suffix in ('ai', 'ad', 'au'):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+                cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+            elif connection.vendor == 'postgresql':
+                cursor.execute(f'DROP INDEX IF EXISTS {table}_search_idx')
+
+
+def repair(sender, using='default', **kwargs):
+    """post_migrate hook: restore triggers dropped when SQLite rebuilt a table"""
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and is_available(connection):
+        install(connection, rebuild=False)
+
+
+def is_available(connection):
+    if connection.alias not in _available:
+        if connection.vendor == 'sqlite':
+            tables = set(connection.introspection.table_names())
+            _available[connection.alias] = all(_fts_table(table) in tables for table in SEARCH_FIELDS)
+        else:
+            _available[connection.alias] = connection.vendor == 'postgresql'
+    return _available[connection.alias]
+
+
+# ==================== QUERIES ====================
+
+def _match_sql(connection, table, words):
+    """Subquery selecting matching ids, and its parameters"""
+    if connection.vendor == 'sqlite':
+        fts = _fts_table(table)
+        expression = ' '.join(f'"{word}"*' for word in words)
+        return f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [expression]
+    expression = ' & '.join(f'{word}:*' for word in words)
+    document = _pg_document(table, SEARCH_FIELDS[table])
+    return f"SELECT id FROM {table} WHERE {document} @@ to_tsquery('simple', %s)", [expression]
+
+
+def matches(model, query, field='pk', using='default'):
+    """Q object keeping rows of the queryset whose ``field`` points at a match for ``query``"""
+    table = model._meta.db_table
+    connection = connections[using]
+    words = terms(query)
+    if not words or not is_available(connection):
+        prefix = '' if field == 'pk' else f'{field}__'
+        condition = Q()
+        for column in SEARCH_FIELDS[table]:
+            condition |= Q(**{f'{prefix}{column}__icontains': query})
+        return condition
+    sql, params = _match_sql(connection, table, words)
+    return Q(**{f'{field}__in': RawSQL(sql, params)})
+
+
+def rank(model, query, using='default'):
+    """Relevance of each row to ``query`` for ``annotate()``; higher is better"""
+    table = model._meta.db_table
+    connection = connections[using]
+    words = terms(query)
+    if not words or not is_available(connection):
+        return Value(0.0, output_field=FloatField())
+    if connection.vendor == 'sqlite':
+        fts = _fts_table(table)
+        sql = f'(SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = "{table}"."id")'
+        return RawSQL(sql, [' '.join(f'"{word}"*' for word in words)], output_field=FloatField())
+    document = _pg_document(table, SEARCH_FIELDS[table], qualify=True)
+    sql = f"ts_rank({document}, to_tsquery('simple', %s))"
+    return RawSQL(sql, [' & '.join(f'{word}:*' for word in words)], output_field=FloatField())
+
+
+def top_matches(model, query, limit, using='default'):
+    """Primary keys of the ``limit`` best matches for ``query``, best first
+
+    On SQLite the FTS index returns them already ordered by its built-in
+    rank, so only ``limit`` rows are ever read from the table.
+    """
+    table = model._meta.db_table
+    connection = connections[using]
+    words = terms(query)
+    if words and connection.vendor == 'sqlite' and is_available(connection):
+        fts = _fts_table(table)
+        expression = ' '.join(f'"{word}"*' for word in words)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s ORDER BY rank LIMIT %s', [expression, limit])
+            return [row[0] for row in cursor.fetchall()]
+    queryset = model._default_manager.using(using).filter(matches(model, query, using=using))
+    return list(
+        queryset.annotate(relevance=rank(model, query, using=using))
+        .order_by('-relevance', 'pk')
+        .values_list('pk', flat=True)[:limit]
+    )
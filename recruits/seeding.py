@@ -0,0 +1,353 @@
+"""
+Deterministic synthetic data for reproducing production volumes locally.
+
+Every value comes from one ``random.Random(seed)`` and every timestamp is
+an offset from the start of the ``until`` day (today by default), never
+from the clock, so the same arguments always produce the same rows. Rows
+are inserted in chunks, one
+transaction per chunk, with primary keys assigned up front so nothing
+has to be read back; sequences are reset afterwards. Timestamps are spread
+over the past rather than set to now. The inserts skip signals, which is
+why ``derive`` rebuilds rollups, status events and cached contexts once
+the rows are in.
+"""
+import functools
+import random
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import caching, events, rollups, search
+from .imports import chunked
+from .models import Candidate, CandidateStatusEvent, Department, Interview, Position
+
+CHUNK_SIZE = 10000
+
+REGIONS = [
+    'North', 'South', 'East', 'West', 'Central', 'Harbor', 'Airport', 'Downtown', 'Uptown', 'Riverside',
+    'Lakeside', 'Hillside', 'Industrial', 'Campus', 'Midtown', 'Old Town', 'Bayview', 'Parkside', 'Westgate',
+    'Eastgate',
+]
+FUNCTIONS = [
+    'Operations', 'Facilities', 'Logistics', 'Quality', 'Training', 'Safety', 'Commercial Cleaning',
+    'Residential Cleaning', 'Window Services', 'Floor Care', 'Healthcare Cleaning', 'Hospitality',
+    'Waste Management', 'Maintenance', 'Customer Service',
+]
+TITLES = [
+    'Cleaner', 'Senior Cleaner', 'Night Cleaner', 'Team Lead', 'Site Supervisor', 'Area Manager',
+    'Floor Technician', 'Window Cleaner', 'Carpet Technician', 'Janitor', 'Housekeeper', 'Porter',
+    'Sanitation Specialist', 'Quality Inspector', 'Driver', 'Dispatcher', 'Trainer', 'Scheduler',
+    'Account Coordinator', 'Maintenance Technician',
+]
+CITIES = [
+    'Springfield', 'Riverton', 'Fairview', 'Madison', 'Georgetown', 'Clinton', 'Salem', 'Franklin',
+    'Greenville', 'Bristol', 'Dover', 'Ashland', 'Oxford', 'Milton', 'Newport', 'Kingston', 'Burlington',
+    'Manchester', 'Clayton', 'Lexington',
+]
+FIRST_NAMES = [
+    'Ana', 'Ben', 'Carla', 'Dev', 'Elena', 'Farid', 'Grace', 'Hugo', 'Ines', 'Jamal', 'Kira', 'Luis',
+    'Maria', 'Nadia', 'Omar', 'Priya', 'Quinn', 'Rosa', 'Sam', 'Tariq', 'Uma', 'Victor', 'Wen', 'Ximena',
+    'Yusuf', 'Zoe', 'Aisha', 'Bruno', 'Chloe', 'Diego', 'Emma', 'Felix', 'Gabriela', 'Hana', 'Ivan',
+    'Julia', 'Kofi', 'Lena', 'Mateo', 'Nora',
+]
+LAST_NAMES = [
+    'Silva', 'Smith', 'Garcia', 'Nguyen', 'Kim', 'Patel', 'Johnson', 'Lopez', 'Brown', 'Costa', 'Müller',
+    'Rossi', 'Novak', 'Kowalski', 'Haddad', 'Okafor', 'Santos', 'Chen', 'Ali', 'Jones', 'Martin', 'Dubois',
+    'Ivanova', 'Tanaka', 'Hansen', 'Schmidt', 'Moreau', 'Romero', 'Fischer', 'Reyes', 'Walker', 'Young',
+    'Mensah', 'Ahmed', 'Cruz', 'Díaz', 'Lee', 'Park', 'Wilson', 'Evans',
+]
+INTERVIEWERS = [f'{first} {last}' for first, last in zip(FIRST_NAMES[::2], LAST_NAMES[1::2])]
+
+# (stage, chance of moving on to it, mean days spent before the move)
+FUNNEL = [
+    ('screening', 0.7, 3),
+    ('interview', 0.55, 6),
+    ('offer', 0.45, 8),
+    ('hired', 0.7, 10),
+]
+POSITION_STATUSES = (['open', 'filled', 'closed'], [5, 3, 2])
+INTERVIEW_OUTCOMES = (['completed', 'cancelled', 'no_show'], [16, 2, 2])
+INTERVIEW_TYPES = (['phone', 'video', 'in_person'], [4, 3, 3])
+RATINGS = ([1, 2, 3, 4, 5], [1, 2, 4, 4, 2])
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def _weighted(rng, choices):
+    values, weights = choices
+    return rng.choices(values, weights)[0]
+
+
+def timeline(rng, applied, now):
+    """``(status, {stage date field: datetime})`` for one candidate's progress through the funnel"""
+    status = 'new'
+    dates = {}
+    at = applied
+    for stage, odds, mean_days in FUNNEL:
+        moved = at + timedelta(days=rng.expovariate(1 / mean_days))
+        if moved > now:
+            # Still waiting at the current stage
+            break
+        if rng.random() >= odds:
+            status = 'rejected'
+            dates['rejected_date'] = moved
+            break
+        status = stage
+        dates[f'{stage}_date'] = moved
+        at = moved
+    return status, dates
+
+
+# ==================== GENERATORS ====================
+# Each yields rows as tuples in the order of the matching ``*_FIELDS``
+
+DEPARTMENT_FIELDS = ('id', 'name', 'description', 'created_at')
+POSITION_FIELDS = (
+    'id', 'title', 'description', 'department', 'location', 'status', 'salary_min', 'salary_max',
+    'required_experience', 'created_at', 'updated_at',
+)
+STAGE_FIELDS = tuple(f'{stage}_date' for stage, _odds, _days in FUNNEL) + ('rejected_date',)
+CANDIDATE_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'phone', 'position', 'status', 'experience_years', 'notes',
+    'applied_date', 'updated_at',
+) + STAGE_FIELDS
+INTERVIEW_FIELDS = (
+    'id', 'candidate', 'interviewer_name', 'interviewer_email', 'scheduled_date', 'scheduled_time',
+    'interview_type', 'status', 'notes', 'rating', 'created_at', 'updated_at',
+)
+
+
+def departments(rng, count, first_id, now):
+    for index in range(count):
+        region, function = REGIONS[index % len(REGIONS)], FUNCTIONS[index // len(REGIONS) % len(FUNCTIONS)]
+        cycle = index // (len(REGIONS) * len(FUNCTIONS))
+        yield (
+            first_id + index,
+            f'{region} {function}' + (f' {cycle + 1}' if cycle else ''),
+            f'{function} for the {region} area',
+            now - timedelta(days=rng.randint(400, 1500)),
+        )
+
+
+def positions(rng, count, first_id, department_ids, now, days):
+    for index in range(count):
+        salary_min = Decimal(rng.randrange(26000, 46000, 500))
+        created_at = now - timedelta(seconds=rng.randrange(days * 86400))
+        yield (
+            first_id + index,
+            rng.choice(TITLES),
+            '',
+            rng.choice(department_ids) if department_ids else None,
+            rng.choice(CITIES),
+            _weighted(rng, POSITION_STATUSES),
+            salary_min,
+            salary_min + rng.randrange(4000, 14000, 500),
+            rng.randint(0, 5),
+            created_at,
+            created_at,
+        )
+
+
+def candidates(rng, count, first_id, position_ids, now, days, interviewed):
+    """Candidate rows; appends ``(id, interview stage timestamp)`` of interviewed ones to ``interviewed``"""
+    interviewed_ids, interviewed_at = interviewed
+    for index in range(count):
+        pk = first_id + index
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        applied = now - timedelta(seconds=rng.randrange(days * 86400))
+        status, dates = timeline(rng, applied, now)
+        if 'interview_date' in dates:
+            interviewed_ids.append(pk)
+            interviewed_at.append(dates['interview_date'].timestamp())
+        yield (
+            pk,
+            first_name,
+            last_name,
+            f'{first_name}.{last_name}.{pk}@example.com'.lower(),
+            f'555-{rng.randrange(10000):04d}',
+            rng.choice(position_ids) if position_ids and rng.random() < 0.95 else None,
+            status,
+            min(int(rng.expovariate(1 / 3)), 30),
+            '',
+            applied,
+            max(dates.values(), default=applied),
+        ) + tuple(dates.get(field) for field in STAGE_FIELDS)
+
+
+def interviews(rng, count, first_id, interviewed, candidate_ids, now):
+    interviewed_ids, interviewed_at = interviewed
+    tz = timezone.get_current_timezone()
+    for index in range(count):
+        if interviewed_ids:
+            pick = rng.randrange(len(interviewed_ids))
+            candidate_id = interviewed_ids[pick]
+            stage_at = datetime.fromtimestamp(interviewed_at[pick], tz)
+        else:
+            candidate_id = rng.choice(candidate_ids)
+            stage_at = now - timedelta(days=rng.randint(0, 60))
+        day = (stage_at + timedelta(days=rng.randint(0, 10))).date()
+        scheduled = timezone.make_aware(datetime.combine(day, time()), tz)
+        # Drawn either way, so later rows do not depend on which branch ran
+        outcome = _weighted(rng, INTERVIEW_OUTCOMES)
+        status = 'scheduled' if scheduled > now else outcome
+        interviewer = rng.choice(INTERVIEWERS)
+        yield (
+            first_id + index,
+            candidate_id,
+            interviewer,
+            interviewer.lower().replace(' ', '.') + '@example.com',
+            scheduled,
+            time(rng.randint(8, 17), rng.choice((0, 30))),
+            _weighted(rng, INTERVIEW_TYPES),
+            status,
+            '',
+            _weighted(rng, RATINGS) if status == 'completed' else None,
+            min(scheduled, now) - timedelta(days=rng.randint(1, 14)),
+            min(scheduled, now),
+        )
+
+
+# ==================== WRITES ====================
+
+def _adapter(connection, field):
+    internal_type = field.get_internal_type()
+    if internal_type == 'DateTimeField':
+        return connection.ops.adapt_datetimefield_value
+    if internal_type == 'TimeField':
+        return connection.ops.adapt_timefield_value
+    if internal_type == 'DecimalField':
+        return functools.partial(
+            connection.ops.adapt_decimalfield_value, max_digits=field.max_digits, decimal_places=field.decimal_places,
+        )
+    return None
+
+
+def write(model, field_names, rows, chunk_size=CHUNK_SIZE, on_chunk=None):
+    """Insert ``rows`` in transactions of ``chunk_size``; returns the row count
+
+    Rows go through one parameterised INSERT with ``executemany`` rather
+    than ``bulk_create``: building model instances and preparing every
+    field through the ORM costs several times more than the insert itself
+    at these volumes. Only the values the driver cannot take as they are
+    (datetimes, times, decimals) are adapted, with the backend's own
+    adapters.
+    """
+    fields = [model._meta.get_field(name) for name in field_names]
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    adapters = [(index, adapt) for index, adapt in enumerate(_adapter(connection, field) for field in fields) if adapt]
+    written = 0
+    for chunk in chunked(rows, chunk_size):
+        for position, row in enumerate(chunk):
+            row = list(row)
+            for index, adapt in adapters:
+                if row[index] is not None:
+                    row[index] = adapt(row[index])
+            chunk[position] = row
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, chunk)
+        written += len(chunk)
+        if on_chunk is not None:
+            on_chunk(model, written)
+    return written
+
+
+def _reset_sequences(models):
+    # Explicit ids leave Postgres sequences behind
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def seed(seed=0, departments_count=300, positions_count=5000, candidates_count=1000000,
+         interviews_count=1000000, days=730, until=None, chunk_size=CHUNK_SIZE, on_chunk=None):
+    """Append rows generated as of the start of ``until``; returns ``{model: rows written}``"""
+    rng = random.Random(seed)
+    now = timezone.make_aware(datetime.combine(until or timezone.localdate(), time()))
+    counts = {}
+    interviewed = (array('q'), array('d'))
+
+    first_id = _next_id(Department)
+    counts[Department] = write(
+        Department, DEPARTMENT_FIELDS, departments(rng, departments_count, first_id, now), chunk_size, on_chunk,
+    )
+    department_ids = range(first_id, first_id + departments_count)
+
+    first_id = _next_id(Position)
+    counts[Position] = write(
+        Position, POSITION_FIELDS, positions(rng, positions_count, first_id, department_ids, now, days),
+        chunk_size, on_chunk,
+    )
+    position_ids = range(first_id, first_id + positions_count)
+
+    first_id = _next_id(Candidate)
+    counts[Candidate] = write(
+        Candidate, CANDIDATE_FIELDS, candidates(rng, candidates_count, first_id, position_ids, now, days, interviewed),
+        chunk_size, on_chunk,
+    )
+    candidate_ids = range(first_id, first_id + candidates_count)
+
+    if candidate_ids:
+        counts[Interview] = write(
+            Interview, INTERVIEW_FIELDS,
+            interviews(rng, interviews_count, _next_id(Interview), interviewed, candidate_ids, now),
+            chunk_size, on_chunk,
+        )
+
+    _reset_sequences(list(counts))
+    return counts
+
+
+@contextmanager
+def indexes_dropped(*models):
+    """Drop the ``Meta.indexes`` of ``models`` for a bulk load and build them once afterwards
+
+    Sorting every key once is much cheaper than keeping a dozen indexes up
+    to date row by row.
+    """
+    dropped = []
+    try:
+        with connection.schema_editor() as editor:
+            for model in models:
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+                    dropped.append((model, index))
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in dropped:
+                editor.add_index(model, index)
+
+
+@contextmanager
+def search_index_suspended():
+    """Drop SQLite's search triggers for a bulk load and rebuild the index once afterwards"""
+    suspended = connection.vendor == 'sqlite' and search.is_available(connection)
+    if suspended:
+        search.uninstall(connection)
+    try:
+        yield
+    finally:
+        if suspended:
+            search.install(connection)
+
+
+def derive(workers=4):
+    """Bring the data kept up by signals in line with bulk-loaded rows"""
+    rollups.rebuild(workers=workers)
+    events.backfill()
+    caching.bump(Department, Position, Candidate, Interview, CandidateStatusEvent)
@@ -0,0 +1,99 @@
+"""
+Signal handlers that keep derived data in step with the source models.
+"""
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import caching, events, rollups
+from .models import Candidate, Department, Interview, Position
+
+
+def _remember(instance, fields):
+    """Store the just-saved values as the baseline for the next diff"""
+    loaded = dict(getattr(instance, '_loaded_values', None) or {})
+    for name, value in rollups.snapshot(instance, fields).items():
+        loaded[type(instance)._meta.get_field(name).attname] = value
+    instance._loaded_values = loaded
+
+
+def _previous_candidate(instance, created):
+    if created:
+        return None
+    previous = rollups.loaded_snapshot(instance, rollups.CANDIDATE_FIELDS)
+    if previous is None:
+        # Saved without having been loaded (e.g. constructed with a pk);
+        # the row has already been overwritten, so assume nothing moved.
+        previous = rollups.snapshot(instance, rollups.CANDIDATE_FIELDS)
+    return previous
+
+
+@receiver(post_save, sender=Candidate)
+def candidate_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = rollups.snapshot(instance, rollups.CANDIDATE_FIELDS)
+    previous = _previous_candidate(instance, created)
+
+    deltas = rollups.diff(
+        rollups.candidate_contributions(previous) if previous else Counter(),
+        rollups.candidate_contributions(current),
+    )
+    if previous and previous['position_id'] != current['position_id']:
+        # The candidate's interviews are bucketed under its position too
+        for values in instance.interviews.order_by().values(*rollups.INTERVIEW_FIELDS):
+            deltas.subtract(rollups.interview_contributions(values, previous['position_id']))
+            deltas.update(rollups.interview_contributions(values, current['position_id']))
+    rollups.apply(deltas)
+    events.record([(instance.pk, previous['status'] if previous else '', current['status'])])
+    _remember(instance, rollups.CANDIDATE_FIELDS)
+
+
+@receiver(post_delete, sender=Candidate)
+def candidate_deleted(sender, instance, **kwargs):
+    previous = rollups.loaded_snapshot(instance, rollups.CANDIDATE_FIELDS)
+    if previous is None:
+        previous = rollups.snapshot(instance, rollups.CANDIDATE_FIELDS)
+    rollups.apply(rollups.diff(rollups.candidate_contributions(previous), Counter()))
+
+
+@receiver(post_save, sender=Interview)
+def interview_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = rollups.snapshot(instance, rollups.INTERVIEW_FIELDS)
+    deltas = rollups.interview_contributions(current, rollups.candidate_position(current['candidate_id']))
+
+    previous = None if created else rollups.loaded_snapshot(instance, rollups.INTERVIEW_FIELDS)
+    if previous is not None:
+        deltas.subtract(rollups.interview_contributions(previous, rollups.candidate_position(previous['candidate_id'])))
+    rollups.apply(deltas)
+    _remember(instance, rollups.INTERVIEW_FIELDS)
+
+
+@receiver(post_delete, sender=Interview)
+def interview_deleted(sender, instance, **kwargs):
+    previous = rollups.loaded_snapshot(instance, rollups.INTERVIEW_FIELDS)
+    if previous is None:
+        previous = rollups.snapshot(instance, rollups.INTERVIEW_FIELDS)
+    position_id = rollups.candidate_position(previous['candidate_id'])
+    rollups.apply(rollups.diff(rollups.interview_contributions(previous, position_id), Counter()))
+
+
+@receiver(pre_delete, sender=Position)
+def position_deleting(sender, instance, **kwargs):
+    # Candidates fall back to "no position" (SET_NULL), so do their rollups
+    rollups.fold_position(instance.pk)
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_cached_contexts(sender, **kwargs):
+    caching.bump(sender)
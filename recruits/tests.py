@@ -1,6 +1,47 @@
+import csv
+import gzip
+import itertools
+import json
+import re
+import sqlite3
+import statistics
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection, connections
+from django.http import HttpResponse
+from django.template import engines
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+
+from backends import profile
+from backends.sqlite3.base import DatabaseWrapper
+try:
+    from backends.turso import base as turso
+except ImportError:
+    # libsql_experimental is only installed where the Turso backend is used
+    turso = None
+from cleanrecruit import warmup
+
+from . import (
+    async_views, caching, events, filters, metrics, pagination, rollups, search, seeding, timing, transitions, views,
+)
+from .models import Candidate, CandidateStatusEvent, DailyRecruitmentStat, Department, Interview, Position
 
 
 class AuthenticationFlowTests(TestCase):
@@ -26,3 +67,1230 @@ class AuthenticationFlowTests(TestCase):
         self.client.login(username='testuser', password='testpass123')
         response = self.client.get(reverse('dashboard'))
         self.assertEqual(response.status_code, 200)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        position = Position.objects.create(title='Cleaner', location='Downtown', status='open')
+        Position.objects.create(title='Supervisor', location='Uptown', status='closed')
+        for index, status in enumerate(['new', 'screening', 'hired', 'hired', 'rejected']):
+            candidate = Candidate(
+                first_name='Test',
+                last_name=str(index),
+                email=f'test{index}@example.com',
+                position=position,
+                status=status,
+            )
+            candidate.update_status_timestamp(status)
+            candidate.save()
+        Interview.objects.create(
+            candidate=candidate,
+            interviewer_name='Alex',
+            scheduled_date=timezone.now(),
+            scheduled_time='10:00',
+            status='completed',
+            rating=4,
+        )
+
+    def test_candidate_metrics_single_query(self):
+        with self.assertNumQueries(1):
+            stats = metrics.candidate_metrics()
+        self.assertEqual(stats['total'], 5)
+        self.assertEqual(stats['by_status']['hired'], 2)
+        self.assertEqual(stats['reached']['screening'], 1)
+        self.assertNotIn('offer', {row['status'] for row in stats['status_data']})
+
+    def test_position_and_interview_metrics(self):
+        self.assertEqual(metrics.position_metrics(), {'total': 2, 'open': 1})
+        stats = metrics.interview_metrics()
+        self.assertEqual(stats['completed'], 1)
+        self.assertEqual(stats['this_week'], 1)
+        self.assertEqual(stats['avg_rating'], 4)
+
+    def test_stage_durations_match_candidate_properties(self):
+        now = timezone.now()
+        for index, candidate in enumerate(Candidate.objects.order_by('id')):
+            Candidate.objects.filter(pk=candidate.pk).update(
+                applied_date=now - timedelta(days=10 * index + 3, hours=5),
+                screening_date=now - timedelta(days=index),
+            )
+        candidates = list(Candidate.objects.all())
+        screen_days = sorted(c.time_to_screening for c in candidates)
+        hire_days = [c.time_to_hire for c in candidates if c.status == 'hired']
+
+        with self.assertNumQueries(1):
+            durations = metrics.stage_durations()
+        self.assertEqual(durations['screen']['count'], 5)
+        self.assertAlmostEqual(durations['screen']['avg'], statistics.mean(screen_days))
+        self.assertAlmostEqual(durations['screen']['median'], statistics.median(screen_days))
+        self.assertAlmostEqual(durations['screen']['p90'], screen_days[3] + (screen_days[4] - screen_days[3]) * 0.6)
+        self.assertAlmostEqual(durations['hire']['avg'], statistics.mean(hire_days))
+        self.assertEqual(durations['offer'], {'count': 0, 'avg': None, 'median': None, 'p90': None})
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(title='Cleaner', location='Downtown')
+        self.other_position = Position.objects.create(title='Supervisor', location='Uptown')
+
+    def totals(self):
+        return rollups.funnel_totals()
+
+    def create_candidate(self, email, status='new'):
+        candidate = Candidate(first_name='Test', last_name='User', email=email, position=self.position, status=status)
+        candidate.update_status_timestamp(status)
+        candidate.save()
+        return candidate
+
+    def test_candidate_changes_are_rolled_up_incrementally(self):
+        candidate = self.create_candidate('a@example.com')
+        self.create_candidate('b@example.com', status='screening')
+        self.assertEqual(self.totals()['applications'], 2)
+        self.assertEqual(self.totals()['screened'], 1)
+
+        candidate = Candidate.objects.get(pk=candidate.pk)
+        candidate.update_status_timestamp('hired')
+        candidate.status = 'hired'
+        candidate.save()
+        self.assertEqual(self.totals()['hired'], 1)
+        self.assertEqual(
+            DailyRecruitmentStat.objects.get(position=self.position, date=timezone.localdate()).hired, 1
+        )
+
+        candidate.delete()
+        self.assertEqual(self.totals()['applications'], 1)
+        self.assertEqual(self.totals()['hired'], 0)
+
+    def test_interview_outcomes_follow_status_and_position(self):
+        candidate = self.create_candidate('a@example.com')
+        interview = Interview.objects.create(
+            candidate=candidate,
+            interviewer_name='Alex',
+            scheduled_date=timezone.now(),
+            scheduled_time='10:00',
+        )
+        self.assertEqual(self.totals()['interviews_completed'], 0)
+
+        interview = Interview.objects.get(pk=interview.pk)
+        interview.status = 'completed'
+        interview.save()
+        self.assertEqual(self.totals()['interviews_completed'], 1)
+
+        candidate = Candidate.objects.get(pk=candidate.pk)
+        candidate.position_id = str(self.other_position.pk)
+        candidate.save()
+        row = DailyRecruitmentStat.objects.get(position=self.other_position)
+        self.assertEqual((row.applications, row.interviews_completed), (1, 1))
+
+        self.other_position.delete()
+        row = DailyRecruitmentStat.objects.get(position__isnull=True)
+        self.assertEqual((row.applications, row.interviews_completed), (1, 1))
+
+        # Folding into a day that already has an unassigned bucket adds to it
+        self.create_candidate('b@example.com')
+        self.position.delete()
+        row = DailyRecruitmentStat.objects.get(position__isnull=True)
+        self.assertEqual((row.applications, row.interviews_completed), (2, 1))
+
+    def test_backfill_matches_incremental_maintenance(self):
+        for index, status in enumerate(['new', 'screening', 'offer', 'hired', 'rejected']):
+            self.create_candidate(f'{index}@example.com', status=status)
+        Candidate.objects.filter(email='0@example.com').update(applied_date=timezone.now() - timedelta(days=65))
+        DailyRecruitmentStat.objects.all().delete()
+
+        call_command('backfill_rollups', workers=1, stdout=StringIO())
+        rebuilt = self.totals()
+        self.assertEqual(rebuilt['applications'], 5)
+        self.assertEqual(rebuilt['offered'], 1)
+        self.assertEqual(rebuilt['hired'], 1)
+        self.assertEqual(DailyRecruitmentStat.objects.values('date').distinct().count(), 2)
+
+
+class StatusEventTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+
+    def moves(self):
+        return list(CandidateStatusEvent.objects.values_list('from_status', 'to_status'))
+
+    def test_views_and_bulk_paths_append_events(self):
+        self.client.post(reverse('candidate_create'), {
+            'first_name': 'Ana', 'last_name': 'Silva', 'email': 'ana@example.com', 'phone': '555-0101', 'status': 'new',
+        })
+        candidate = Candidate.objects.get(email='ana@example.com')
+        post = {'first_name': 'Ana', 'last_name': 'Silva', 'email': 'ana@example.com', 'phone': '555-0101', 'status': 'screening'}
+        self.client.post(reverse('candidate_update', args=[candidate.pk]), post)
+        # Saving without a status change adds nothing
+        self.client.post(reverse('candidate_update', args=[candidate.pk]), dict(post, notes='Called'))
+        transitions.bulk_transition([candidate.pk], 'rejected')
+        self.assertEqual(self.moves(), [('', 'new'), ('new', 'screening'), ('screening', 'rejected')])
+
+        self.assertEqual(metrics.stage_velocity()['rejected'], 1)
+        self.assertEqual(
+            metrics.transition_counts(from_status='screening', to_status='rejected'),
+            [{'from_status': 'screening', 'to_status': 'rejected', 'count': 1}],
+        )
+
+    def test_backfill_reconstructs_history_from_stage_dates(self):
+        applied = timezone.now() - timedelta(days=10)
+        candidate = Candidate.objects.create(first_name='Ben', last_name='Lee', email='ben@example.com', phone='555-0100')
+        Candidate.objects.filter(pk=candidate.pk).update(
+            applied_date=applied,
+            status='rejected',
+            screening_date=applied + timedelta(days=1),
+            interview_date=applied + timedelta(days=3),
+        )
+        CandidateStatusEvent.objects.all().delete()
+
+        call_command('backfill_status_events', stdout=StringIO())
+        self.assertEqual(self.moves(), [('', 'new'), ('new', 'screening'), ('screening', 'interview'), ('interview', 'rejected')])
+        self.assertEqual(events.backfill(), (0, 0))
+
+
+class ImportCandidatesTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(title='Night Cleaner', location='Downtown')
+        self.existing = Candidate.objects.create(
+            first_name='Old', last_name='Name', email='ana@example.com', status='new',
+        )
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def run_import(self, name, content, **options):
+        path = self.directory / name
+        path.write_text(content)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_candidates', str(path), stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_rows_are_upserted_on_email(self):
+        output, errors = self.run_import('candidates.csv', (
+            'first_name,last_name,email,position,status,experience_years\n'
+            'Ana,Silva,ana@example.com,night cleaner,screening,3\n'
+            'Ben,Lee,ben@example.com,,hired,1\n'
+            'Bad,Row,not-an-email,,new,0\n'
+            'Cy,Day,cy@example.com,Nowhere,new,0\n'
+        ), chunk_size=2)
+        self.assertIn('1 created, 1 updated, 0 unchanged, 2 skipped', output)
+        self.assertIn('Line 4', errors)
+        self.assertIn("unknown position 'Nowhere'", errors)
+
+        ana = Candidate.objects.get(email='ana@example.com')
+        self.assertEqual((ana.pk, ana.first_name, ana.position, ana.status), (self.existing.pk, 'Ana', self.position, 'screening'))
+        self.assertIsNotNone(ana.screening_date)
+        ben = Candidate.objects.get(email='ben@example.com')
+        self.assertIsNotNone(ben.hired_date)
+        self.assertIsNone(ben.screening_date)
+
+    def test_jsonl_import_keeps_rollups_in_step(self):
+        rows = [
+            {'first_name': 'Ana', 'last_name': 'Silva', 'email': 'ana@example.com', 'status': 'offer'},
+            {'first_name': 'Ben', 'last_name': 'Lee', 'email': 'ben@example.com', 'position': 'Night Cleaner'},
+        ]
+        self.run_import('candidates.jsonl', '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n')
+        incremental = rollups.funnel_totals()
+        self.assertEqual((incremental['applications'], incremental['offered']), (2, 1))
+        self.assertEqual(Candidate.objects.get(email='ana@example.com').last_name, 'Silva')
+
+        rollups.rebuild(workers=1)
+        self.assertEqual(rollups.funnel_totals(), incremental)
+
+
+class SeedDataTests(TransactionTestCase):
+    # Dropping indexes needs a schema editor, which SQLite refuses inside
+    # the transaction a TestCase wraps each test in
+
+    def seed(self, **options):
+        options = {'departments': 3, 'positions': 12, 'candidates': 120, 'interviews': 80, 'seed': 7, **options}
+        call_command('seed_data', workers=1, chunk_size=50, stdout=StringIO(), **options)
+        return list(Candidate.objects.order_by('pk').values_list('pk', 'email', 'status', 'position_id'))
+
+    def rows(self):
+        candidates = Candidate.objects.order_by('pk').values_list(
+            'pk', 'email', 'status', 'position_id', 'applied_date', *seeding.STAGE_FIELDS,
+        )
+        interviews = Interview.objects.order_by('pk').values_list(
+            'pk', 'candidate_id', 'interviewer_name', 'scheduled_date', 'scheduled_time',
+            'interview_type', 'status', 'rating', 'created_at',
+        )
+        return list(candidates), list(interviews)
+
+    def test_same_seed_gives_same_rows(self):
+        until = timezone.localdate()
+        first_run = timezone.now().replace(hour=1)
+        with patch('django.utils.timezone.now', return_value=first_run):
+            self.seed(until=until)
+        first = self.rows()
+        self.assertEqual(len(first[0]), 120)
+        self.assertEqual(len(first[1]), 80)
+        self.assertEqual(Position.objects.count(), 12)
+
+        Interview.objects.all().delete()
+        Candidate.objects.all().delete()
+        Position.objects.all().delete()
+        Department.objects.all().delete()
+        # Later in the day: the rows must not depend on the clock
+        with patch('django.utils.timezone.now', return_value=first_run.replace(hour=23)):
+            self.seed(until=until)
+        self.assertEqual(self.rows(), first)
+        self.assertNotEqual(self.seed(append=True, seed=8)[120:], [row[:4] for row in first[0]])
+
+    def test_rows_are_consistent_and_derived_data_is_rebuilt(self):
+        self.seed()
+        now = timezone.now()
+        for candidate in Candidate.objects.all():
+            dates = [candidate.applied_date] + [
+                getattr(candidate, field) for _stage, field in metrics.STAGE_DATE_FIELDS
+                if getattr(candidate, field)
+            ]
+            self.assertEqual(dates, sorted(dates))
+            self.assertLessEqual(dates[-1], now)
+            if candidate.status != 'new':
+                self.assertIsNotNone(getattr(candidate, f'{candidate.status}_date'))
+        self.assertFalse(Interview.objects.filter(status='scheduled', scheduled_date__lte=now).exists())
+        self.assertFalse(Interview.objects.filter(status='completed', rating__isnull=True).exists())
+
+        self.assertEqual(rollups.funnel_totals()['applications'], 120)
+        self.assertEqual(
+            CandidateStatusEvent.objects.values('candidate').distinct().count(), 120,
+        )
+        candidate = Candidate.objects.first()
+        found = Candidate.objects.filter(search.matches(Candidate, f'{candidate.first_name} {candidate.last_name}'))
+        self.assertIn(candidate, found)
+        # Sequences continue after the explicit ids
+        self.assertGreater(Department.objects.create(name='Security').pk, 3)
+
+    def test_refuses_to_mix_with_existing_data(self):
+        Department.objects.create(name='Operations')
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.screened_at = timezone.now() - timedelta(days=3)
+        self.candidates = []
+        for index, status in enumerate(['new', 'screening', 'interview']):
+            candidate = Candidate(first_name=f'Test{index}', last_name='User', email=f'bulk{index}@example.com', status=status)
+            candidate.update_status_timestamp(status)
+            candidate.save()
+            self.candidates.append(candidate)
+        Candidate.objects.filter(status='screening').update(screening_date=self.screened_at)
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+
+    def test_one_update_fills_only_missing_stage_dates(self):
+        ids = [candidate.pk for candidate in self.candidates]
+        with CaptureQueriesContext(connection) as queries:
+            changed = transitions.bulk_transition(ids, 'screening')
+        self.assertEqual(sorted(changed), [ids[0], ids[2]])
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "recruits_candidate"') for query in queries), 1)
+
+        moved = {candidate.pk: candidate for candidate in Candidate.objects.filter(pk__in=ids)}
+        self.assertEqual({candidate.status for candidate in moved.values()}, {'screening'})
+        self.assertEqual(moved[ids[1]].screening_date, self.screened_at)
+        self.assertIsNotNone(moved[ids[0]].screening_date)
+        self.assertEqual(rollups.funnel_totals()['screened'], 3)
+
+        with self.assertRaises(ValueError):
+            transitions.bulk_transition(ids, 'archived')
+
+    def test_htmx_request_returns_updated_rows(self):
+        ids = [str(candidate.pk) for candidate in self.candidates[:2]]
+        response = self.client.post(
+            reverse('candidate_bulk_transition'), {'status': 'interview', 'ids': ids}, HTTP_HX_REQUEST='true',
+        )
+        content = response.content.decode()
+        self.assertIn('Moved 2 candidate(s) to Interview.', content)
+        for pk in ids:
+            self.assertIn(f'id="candidate-row-{pk}" hx-swap-oob="true"', content)
+        self.assertEqual(Candidate.objects.filter(status='interview').count(), 3)
+
+
+class AdminTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(title='Cleaner', location='Downtown')
+        self.candidates = [
+            Candidate.objects.create(
+                first_name=f'Admin{index}', last_name='User', email=f'admin{index}@example.com', position=self.position,
+            )
+            for index in range(3)
+        ]
+        self.interview = Interview.objects.create(
+            candidate=self.candidates[0], interviewer_name='Alex Kim',
+            scheduled_date=timezone.now(), scheduled_time=timezone.now().time(),
+        )
+        self.user = get_user_model().objects.create_superuser(username='admin', password='testpass123')
+        self.client.force_login(self.user)
+
+    def changelist_queries(self, name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin:recruits_{name}_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        before = {name: self.changelist_queries(name) for name in ('candidate', 'interview', 'position')}
+        department = Department.objects.create(name='Operations')
+        for index in range(5):
+            position = Position.objects.create(title=f'Driver {index}', location='Uptown', department=department)
+            candidate = Candidate.objects.create(
+                first_name='More', last_name=f'Rows{index}', email=f'more{index}@example.com', position=position,
+            )
+            Interview.objects.create(
+                candidate=candidate, interviewer_name='Sam Lee',
+                scheduled_date=timezone.now(), scheduled_time=timezone.now().time(),
+            )
+        self.assertEqual({name: self.changelist_queries(name) for name in before}, before)
+
+    def test_counts_stop_at_the_limit(self):
+        with patch.object(pagination.EstimatedCountPaginator, 'count_limit', 2):
+            response = self.client.get(reverse('admin:recruits_candidate_changelist'))
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_search_uses_the_full_text_index(self):
+        url = reverse('admin:recruits_interview_changelist')
+        self.assertEqual(list(self.client.get(url, {'q': 'admin0'}).context['cl'].result_list), [self.interview])
+        self.assertEqual(list(self.client.get(url, {'q': 'alex'}).context['cl'].result_list), [self.interview])
+        self.assertEqual(len(self.client.get(url, {'q': 'nobody'}).context['cl'].result_list), 0)
+
+        Candidate.objects.filter(pk=self.candidates[1].pk).update(phone='555-0199')
+        url = reverse('admin:recruits_candidate_changelist')
+        for query in ('555-0199', '0199'):
+            with self.subTest(query=query):
+                self.assertEqual(list(self.client.get(url, {'q': query}).context['cl'].result_list), [self.candidates[1]])
+        self.assertEqual(list(self.client.get(url, {'q': 'admin2'}).context['cl'].result_list), [self.candidates[2]])
+
+    def test_status_actions_run_set_based_transitions(self):
+        ids = [candidate.pk for candidate in self.candidates[:2]]
+        with patch('recruits.admin.ACTION_BATCH_SIZE', 1):
+            response = self.client.post(reverse('admin:recruits_candidate_changelist'), {
+                'action': 'set_status_screening', '_selected_action': ids,
+            }, follow=True)
+        self.assertContains(response, 'Moved 2 candidate(s) to Screening.')
+        self.assertEqual(set(Candidate.objects.filter(status='screening').values_list('pk', flat=True)), set(ids))
+        self.assertEqual(CandidateStatusEvent.objects.filter(to_status='screening').count(), 2)
+        self.assertEqual(rollups.funnel_totals()['screened'], 2)
+
+        self.client.post(reverse('admin:recruits_interview_changelist'), {
+            'action': 'set_status_completed', '_selected_action': [self.interview.pk],
+        })
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.status, 'completed')
+        stat = DailyRecruitmentStat.objects.get(position=self.position, date=timezone.localdate(self.interview.scheduled_date))
+        self.assertEqual(stat.interviews_completed, 1)
+
+        transitions.bulk_interview_status([self.interview.pk], 'cancelled')
+        stat.refresh_from_db()
+        self.assertEqual((stat.interviews_completed, stat.interviews_cancelled), (0, 1))
+        with self.assertRaises(ValueError):
+            transitions.bulk_interview_status([self.interview.pk], 'archived')
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        position = Position.objects.create(title='Night Cleaner', location='Downtown')
+        for index, status in enumerate(['new', 'hired', 'hired']):
+            candidate = Candidate.objects.create(
+                first_name=f'Test{index}', last_name='User', email=f'export{index}@example.com',
+                position=position, status=status,
+            )
+            Interview.objects.create(
+                candidate=candidate, interviewer_name='Alex', scheduled_date=timezone.now(),
+                scheduled_time='10:00', status='completed' if index else 'scheduled',
+            )
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+
+    def body(self, response):
+        content = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return content.decode()
+
+    def test_candidate_export_streams_the_filtered_list_as_csv(self):
+        response = self.client.get(reverse('candidate_export'), {'status': 'hired'})
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="candidates-', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(self.body(response))))
+        self.assertEqual([row['email'] for row in rows], ['export2@example.com', 'export1@example.com'])
+        self.assertEqual(rows[0]['position'], 'Night Cleaner')
+
+    def test_interview_export_as_gzipped_jsonl(self):
+        response = self.client.get(
+            reverse('interview_export'), {'format': 'jsonl', 'status': 'completed'},
+            HTTP_ACCEPT_ENCODING='gzip, deflate',
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['interviewer_name'], 'Alex')
+        self.assertEqual(rows[0]['scheduled_time'], '10:00:00')
+
+    def test_gzip_is_only_sent_when_accepted(self):
+        for accept_encoding, gzipped in (
+            ('gzip;q=0', False),
+            ('deflate, gzip; q=0.0, *', False),
+            ('notgzip, br', False),
+            ('', False),
+            ('br, GZIP;q=0.5', True),
+            ('*', True),
+        ):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(reverse('candidate_export'), HTTP_ACCEPT_ENCODING=accept_encoding)
+                self.assertEqual(response.get('Content-Encoding') == 'gzip', gzipped)
+                self.assertIn('export0@example.com', self.body(response))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ContextCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+
+    def test_dashboard_context_is_cached_until_a_model_changes(self):
+        self.client.get(reverse('dashboard'))
+        # Session and user lookups only
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_candidates'], 0)
+
+        Candidate.objects.create(first_name='New', last_name='Hire', email='new@example.com')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_candidates'], 1)
+
+    def test_landing_page_is_cached_whole_and_revalidated_without_queries(self):
+        first = self.client.get(reverse('home'))
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('public', first['Cache-Control'])
+        self.assertIn(f'max-age={settings.PUBLIC_PAGE_CACHE_TIMEOUT}', first['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('home')).content, first.content)
+            unchanged = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(unchanged.status_code, 304)
+            unchanged = self.client.get(reverse('home'), HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+            self.assertEqual(unchanged.status_code, 304)
+
+        # A change re-renders the page; the ETag follows the content
+        Department.objects.create(name='Operations')
+        with CaptureQueriesContext(connection) as queries:
+            rerendered = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(len(queries), len(views.LANDING_QUERIES))
+        self.assertEqual(rerendered.status_code, 304)
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_unchanged_pages_are_answered_with_304_before_the_view_runs(self):
+        htmx = {'HTTP_HX_REQUEST': 'true', 'HTTP_HX_TARGET': 'candidate-results'}
+        for name in ('dashboard', 'candidate_list', 'interview_list'):
+            with self.subTest(url=name):
+                first = self.client.get(reverse(name))
+                self.assertIn('no-cache', first['Cache-Control'])
+                self.assertIn('private', first['Cache-Control'])
+                # Session and user lookups only
+                with self.assertNumQueries(2):
+                    unchanged = self.client.get(reverse(name), HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(unchanged.status_code, 304)
+
+        first = self.client.get(reverse('candidate_list'), {'status': 'new'})
+        fragment = self.client.get(reverse('candidate_list'), {'status': 'new'}, **htmx)
+        self.assertNotEqual(fragment['ETag'], first['ETag'])
+        self.assertEqual(self.client.get(
+            reverse('candidate_list'), {'status': 'new'}, HTTP_IF_NONE_MATCH=fragment['ETag'], **htmx,
+        ).status_code, 304)
+
+        Candidate.objects.create(first_name='New', last_name='Hire', email='new@example.com')
+        changed = self.client.get(reverse('candidate_list'), {'status': 'new'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertContains(changed, 'New Hire')
+
+    def test_pages_are_rendered_again_after_a_new_login(self):
+        self.client.logout()
+        self.client.post(reverse('login'), {'username': 'testuser', 'password': 'testpass123'})
+        first = self.client.get(reverse('dashboard'))
+        self.client.post(reverse('logout'))
+        self.client.post(reverse('login'), {'username': 'testuser', 'password': 'testpass123'})
+        response = self.client.get(reverse('dashboard'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_pages_with_pending_messages_are_rendered(self):
+        first = self.client.get(reverse('candidate_list'))
+        self.client.post(reverse('department_create'), {'name': 'Operations'})
+        response = self.client.get(reverse('candidate_list'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_department_change_only_invalidates_dependent_contexts(self):
+        dashboard_key = caching.context_key('dashboard', views.DASHBOARD_MODELS)
+        analytics_key = caching.context_key('analytics', views.ANALYTICS_MODELS)
+        Department.objects.create(name='Operations')
+        self.assertEqual(caching.context_key('dashboard', views.DASHBOARD_MODELS), dashboard_key)
+        self.assertNotEqual(caching.context_key('analytics', views.ANALYTICS_MODELS), analytics_key)
+
+    def test_rollup_rebuild_invalidates_analytics(self):
+        analytics_key = caching.context_key('analytics', views.ANALYTICS_MODELS)
+        rollups.rebuild(workers=1)
+        self.assertNotEqual(caching.context_key('analytics', views.ANALYTICS_MODELS), analytics_key)
+
+    def test_concurrent_miss_waits_for_the_rebuilding_worker(self):
+        key = caching.context_key('dashboard', views.DASHBOARD_MODELS)
+        cache.add(f'{key}:lock', True)
+        rebuild = threading.Timer(0.1, cache.set, (key, {'built': 'elsewhere'}))
+        rebuild.start()
+        self.addCleanup(rebuild.cancel)
+        self.assertEqual(
+            caching.cached_context('dashboard', views.DASHBOARD_MODELS, lambda: {'built': 'here'}),
+            {'built': 'elsewhere'},
+        )
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(title='Night Cleaner', location='Downtown')
+        self.candidate = Candidate.objects.create(
+            first_name='Maria', last_name='González', email='maria@example.com', position=self.position,
+        )
+        Candidate.objects.create(first_name='Mark', last_name='Lee', email='mark@example.com')
+
+    def found(self, model, query, **kwargs):
+        return list(model.objects.filter(search.matches(model, query, **kwargs)).order_by('pk'))
+
+    def test_every_word_matches_a_prefix(self):
+        self.assertEqual(self.found(Candidate, 'mar gonz'), [self.candidate])
+        self.assertEqual(len(self.found(Candidate, 'MAR')), 2)
+        self.assertEqual(self.found(Candidate, 'lee mar')[0].last_name, 'Lee')
+        self.assertEqual(self.found(Position, 'clean down'), [self.position])
+        self.assertEqual(self.found(Candidate, ''), list(Candidate.objects.order_by('pk')))
+
+    def test_position_search_matches_department_names_through_the_index(self):
+        self.position.department = Department.objects.create(name='Facilities')
+        self.position.save()
+        Position.objects.create(title='Driver', location='Uptown')
+        found = filters.filter_positions(Position.objects.all(), {'search': 'facil'})
+        self.assertEqual(list(found), [self.position])
+        if search.is_available(connection):
+            self.assertNotIn('LIKE', str(found.query))
+
+    def test_index_follows_updates_and_deletes(self):
+        Candidate.objects.filter(pk=self.candidate.pk).update(last_name='Silva')
+        self.assertEqual(self.found(Candidate, 'gonzalez'), [])
+        self.assertEqual(self.found(Candidate, 'silva'), [self.candidate])
+        self.candidate.delete()
+        self.assertEqual(self.found(Candidate, 'silva'), [])
+
+    def test_related_search_and_ranking(self):
+        interview = Interview.objects.create(
+            candidate=self.candidate, interviewer_name='Alex', scheduled_date=timezone.now(), scheduled_time='10:00',
+        )
+        by_candidate = Interview.objects.filter(search.matches(Candidate, 'maria', field='candidate'))
+        self.assertEqual(list(by_candidate), [interview])
+        ranked = Candidate.objects.annotate(rank=search.rank(Candidate, 'maria gonz')).order_by('-rank', 'pk')
+        self.assertEqual(ranked[0], self.candidate)
+        self.assertGreater(ranked[0].rank, 0)
+
+
+class CandidateAutocompleteTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+        Candidate.objects.bulk_create(
+            Candidate(first_name=f'Maria{index}', last_name='Lopez', email=f'maria{index}@example.com')
+            for index in range(15)
+        )
+        self.mark = Candidate.objects.create(first_name='Mark', last_name='Lee', email='mark@example.com')
+
+    def suggest(self, query):
+        response = self.client.get(reverse('candidate_autocomplete'), {'q': query})
+        return response.context['candidates']
+
+    def test_returns_top_prefix_matches(self):
+        self.assertEqual(self.suggest('mark le'), [self.mark])
+        self.assertEqual(len(self.suggest('lop')), views.AUTOCOMPLETE_LIMIT)
+        self.assertEqual(self.suggest('m'), [])
+        self.assertContains(self.client.get(reverse('candidate_autocomplete'), {'q': 'mark'}), 'data-name="Mark Lee"')
+
+    def test_interview_list_does_not_load_candidates(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('interview_list'))
+        self.assertNotIn('candidates', response.context)
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'FROM "recruits_candidate"' in q['sql']])
+
+
+class ListFragmentTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+        department = Department.objects.create(name='Operations')
+        position = Position.objects.create(title='Cleaner', department=department)
+        candidate = Candidate.objects.create(first_name='Ana', last_name='Silva', email='ana@example.com', position=position)
+        Interview.objects.create(
+            candidate=candidate, interviewer_name='Alex', scheduled_date=timezone.now(), scheduled_time='10:00',
+        )
+
+    def test_htmx_requests_render_only_the_results(self):
+        for name, target, dropdowns, dropdown_queries in [
+            ('candidate_list', 'candidate-results', 'positions', 1),
+            ('position_list', 'position-results', 'departments', 1),
+            ('interview_list', 'interview-results', 'types', 0),
+        ]:
+            with self.subTest(url=name):
+                with CaptureQueriesContext(connection) as page_queries:
+                    page = self.client.get(reverse(name), {'search': 'a'})
+                self.assertTemplateUsed(page, 'base.html')
+                self.assertIn(dropdowns, page.context)
+
+                with CaptureQueriesContext(connection) as queries:
+                    fragment = self.client.get(
+                        reverse(name), {'search': 'a'}, HTTP_HX_REQUEST='true', HTTP_HX_TARGET=target,
+                    )
+                self.assertTemplateNotUsed(fragment, 'base.html')
+                self.assertNotIn(dropdowns, fragment.context)
+                self.assertContains(fragment, f'id="{target}"', count=1)
+                self.assertEqual(len(queries), len(page_queries) - dropdown_queries)
+                self.assertIn('HX-Request', fragment['Vary'])
+
+        fragment = self.client.get(
+            reverse('candidate_list'), {'status': 'new'}, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='candidate-results',
+        )
+        self.assertContains(fragment, 'hx-swap-oob="true" href="/candidates/export/?status=new"')
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(title='Cleaner', location='Downtown')
+        applied = timezone.now()
+        for index in range(23):
+            candidate = Candidate.objects.create(
+                first_name=f'Test{index}', last_name='User', email=f'page{index}@example.com',
+                position=self.position if index % 2 else None,
+            )
+            # Pairs of candidates share an applied date to exercise the id tie-break
+            Candidate.objects.filter(pk=candidate.pk).update(applied_date=applied - timedelta(hours=index // 2))
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+
+    def walk(self, params):
+        pages = []
+        response = self.client.get(reverse('candidate_list'), {'cursor': '', **params})
+        while True:
+            page = response.context['page_obj']
+            pages.append(list(page))
+            if not page.has_next:
+                return pages, page
+            response = self.client.get(f"{reverse('candidate_list')}?{page.next_query}")
+
+    def test_pages_follow_the_list_ordering_in_both_directions(self):
+        expected = list(Candidate.objects.order_by(*views.CANDIDATE_ORDERING))
+        pages, last = self.walk({})
+        self.assertEqual([len(page) for page in pages], [10, 10, 3])
+        self.assertEqual(list(itertools.chain(*pages)), expected)
+        self.assertEqual((last.total, last.total_exact), (23, True))
+
+        response = self.client.get(f"{reverse('candidate_list')}?{last.previous_query}")
+        self.assertEqual(list(response.context['page_obj']), pages[1])
+        self.assertTrue(response.context['page_obj'].has_next)
+
+    def test_cursor_links_keep_filters(self):
+        pages, last = self.walk({'position': str(self.position.pk)})
+        self.assertEqual(sum(len(page) for page in pages), 11)
+        self.assertIn(f'position={self.position.pk}', last.previous_query)
+
+    def test_total_can_be_skipped(self):
+        url = f"{reverse('candidate_list')}?cursor="
+        with CaptureQueriesContext(connection) as counted:
+            self.client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='candidate-results')
+        with override_settings(KEYSET_COUNT_LIMIT=0), CaptureQueriesContext(connection) as uncounted:
+            response = self.client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='candidate-results')
+        self.assertIsNone(response.context['page_obj'].total)
+        self.assertEqual(len(uncounted), len(counted) - 1)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in uncounted))
+
+    def test_invalid_cursor_starts_from_the_first_page(self):
+        page = pagination.keyset_page(Candidate.objects.all(), views.CANDIDATE_ORDERING, cursor='not-a-cursor')
+        self.assertFalse(page.has_previous)
+        self.assertEqual(len(page), 10)
+
+
+@override_settings(SERVER_TIMING=True)
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
+        position = Position.objects.create(title='Cleaner', department=Department.objects.create(name='Operations'))
+        for index in range(3):
+            Candidate.objects.create(first_name='Ana', last_name=f'Silva{index}', email=f'ana{index}@example.com', position=position)
+
+    def test_header_reports_queries_and_render_time(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('candidate_list'))
+        header = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', header)
+        metrics = dict(re.findall(r'(\w+);dur=([\d.]+)', header))
+        self.assertEqual(set(metrics), {'db', 'template', 'view', 'total'})
+        self.assertGreater(float(metrics['template']), 0)
+        self.assertLessEqual(float(metrics['view']), float(metrics['total']))
+
+        with override_settings(SERVER_TIMING=False):
+            self.assertNotIn('Server-Timing', self.client.get(reverse('candidate_list')))
+
+    async def test_asgi_requests_are_timed_without_a_thread_hop(self):
+        async def view(request):
+            return HttpResponse()
+        self.assertTrue(iscoroutinefunction(timing.ServerTimingMiddleware(view)))
+
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(reverse('candidate_list'))
+        queries = int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+        # Session, user, count and page at least
+        self.assertGreaterEqual(queries, 4)
+
+    def test_requests_are_logged_and_budgets_enforced(self):
+        with self.assertLogs('recruits.timing', 'INFO') as logs:
+            self.client.get(reverse('candidate_list'))
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].timing['view'], 'candidate_list')
+
+        with override_settings(QUERY_BUDGETS={'candidate_list': 1}):
+            with self.assertLogs('recruits.timing', 'WARNING') as logs:
+                self.client.get(reverse('candidate_list'))
+        self.assertIn('QUERY BUDGET EXCEEDED view=candidate_list', logs.output[0])
+
+    def test_list_pages_stay_within_their_budgets(self):
+        # Rows must not trigger per-row queries, whatever the page size
+        Interview.objects.create(
+            candidate=Candidate.objects.first(), interviewer_name='Alex',
+            scheduled_date=timezone.now(), scheduled_time='10:00',
+        )
+        for name in ('dashboard', 'analytics', 'candidate_list', 'position_list', 'interview_list'):
+            with self.subTest(url=name), CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse(name))
+            self.assertLessEqual(len(queries), settings.QUERY_BUDGETS[name])
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+        position = Position.objects.create(title='Cleaner', status='open', department=Department.objects.create(name='Operations'))
+        Candidate.objects.create(first_name='Ana', last_name='Silva', email='ana@example.com', position=position, status='hired')
+        self.factory = AsyncRequestFactory()
+
+    async def test_async_views_render_the_same_pages(self):
+        for view, url in ((async_views.dashboard, '/dashboard/'), (async_views.analytics, '/analytics/')):
+            request = self.factory.get(url)
+            request.user = self.user
+            with self.subTest(url=url):
+                response = await view(request)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Ana Silva' if view is async_views.dashboard else 'Operations')
+
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        self.assertEqual((await async_views.landing_page(request)).status_code, 200)
+
+        request = self.factory.get('/dashboard/')
+        request.user = AnonymousUser()
+        response = await async_views.dashboard(request)
+        self.assertRedirects(response, f'{settings.LOGIN_URL}?next=/dashboard/', fetch_redirect_response=False)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    async def test_async_dashboard_answers_conditional_requests(self):
+        request = self.factory.get('/dashboard/')
+        request.user = self.user
+        first = await async_views.dashboard(request)
+        secret = request.META['CSRF_COOKIE']
+        request = self.factory.get('/dashboard/', headers={'If-None-Match': first['ETag']})
+        request.user = self.user
+        # What CsrfViewMiddleware reads from the cookie the first response set
+        request.META['CSRF_COOKIE'] = secret
+        self.assertEqual((await async_views.dashboard(request)).status_code, 304)
+
+    def test_pool_connections_are_kept_until_they_age_out_or_fail(self):
+        class StubConnection:
+            alias = 'default'
+            errors_occurred = False
+
+            def __init__(self):
+                self.connection = object()
+
+            def close(self):
+                self.connection = None
+
+        stub = StubConnection()
+        max_age = settings.ASYNC_QUERY_CONN_MAX_AGE
+        with patch.object(async_views, 'connections') as handler, patch.object(async_views, 'monotonic') as clock:
+            handler.all.return_value = [stub]
+            for now in (100, 100 + max_age - 1):
+                clock.return_value = now
+                async_views._recycle_connections()
+                self.assertIsNotNone(stub.connection)
+            clock.return_value = 100 + max_age
+            async_views._recycle_connections()
+            self.assertIsNone(stub.connection)
+
+            stub.connection = object()
+            async_views._recycle_connections()
+            async_views._recycle_connections(failed=True)
+            self.assertIsNone(stub.connection)
+
+    def test_queries_inside_a_transaction_run_on_its_connection(self):
+        # The test case's transaction holds the rows created in setUp
+        results = async_views.run_concurrently(views.LANDING_QUERIES)
+        self.assertEqual(results, {'total_candidates': 1, 'active_positions': 1, 'total_departments': 1})
+        self.assertEqual(views._dashboard_context(async_views.run_concurrently(views.DASHBOARD_QUERIES)), views._dashboard_context())
+
+
+class ConcurrentQueryTests(TransactionTestCase):
+    def test_independent_queries_run_at_the_same_time(self):
+        Department.objects.create(name='Operations')
+        barrier = threading.Barrier(3, timeout=5)
+
+        def query():
+            # Run one after another, the first would wait at the barrier forever
+            barrier.wait()
+            return Department.objects.count()
+
+        timings = timing.Timings()
+        token = timing._current.set(timings)
+        try:
+            results = async_views.run_concurrently({name: query for name in 'abc'})
+        finally:
+            timing._current.reset(token)
+        self.assertEqual(results, {'a': 1, 'b': 1, 'c': 1})
+        self.assertEqual(timings.queries, 3)
+
+
+class WarmupTests(TestCase):
+    def test_warmup_precompiles_every_project_template(self):
+        self.assertEqual(warmup.run(), {})
+
+        timings = warmup.run(force=True)
+        templates = [
+            path.relative_to(directory).as_posix()
+            for directory in settings.TEMPLATES[0]['DIRS']
+            for path in Path(directory).rglob('*.html')
+        ]
+        self.assertEqual(timings['templates'][0], len(templates))
+        self.assertGreater(timings['urls'][0], 0)
+
+        # The cached loader keys templates found without ``skip`` by name
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertLessEqual(set(templates), set(loader.get_template_cache))
+
+
+class SQLiteProfileTests(TestCase):
+    def test_pragmas_are_applied_and_validated(self):
+        if connection.settings_dict['ENGINE'] != 'backends.sqlite3':
+            self.skipTest('Profile applies to the SQLite backend')
+        with connection.cursor() as cursor:
+            for name, expected in (('busy_timeout', 5000), ('synchronous', 1), ('temp_store', 2)):
+                cursor.execute(f'PRAGMA {name}')
+                self.assertEqual(cursor.fetchone()[0], expected)
+
+        self.assertNotIn('mmap_size', profile.pragmas({'pragmas': {'mmap_size': None}}))
+        with self.assertRaises(ImproperlyConfigured):
+            profile.pragmas({'pragmas': {'cache_size': '0; DROP TABLE recruits_candidate'}})
+
+    def test_atomic_blocks_take_the_write_lock_at_begin(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'locks.sqlite3'
+        first, second = (
+            DatabaseWrapper(connections.configure_settings({'default': {
+                'ENGINE': 'backends.sqlite3', 'NAME': path, 'OPTIONS': {'pragmas': {'busy_timeout': 0}},
+            }})['default'], alias)
+            for alias in ('first', 'second')
+        )
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        first._start_transaction_under_autocommit()
+        with self.assertRaisesMessage(OperationalError, 'locked'):
+            second._start_transaction_under_autocommit()
+        first.cursor().execute('COMMIT')
+        second._start_transaction_under_autocommit()
+        second.cursor().execute('COMMIT')
+
+
+class FakeDriverCursor:
+    """libSQL cursor recording what it is sent; rowcount is the rows written"""
+
+    def __init__(self):
+        self.calls = []
+        self.rowcount = -1
+
+    def execute(self, sql, params=()):
+        self.calls.append(('execute', sql, params))
+        self.rowcount = sql.count('(?')
+
+    def executemany(self, sql, rows):
+        self.calls.append(('executemany', sql, list(rows)))
+        self.rowcount = len(rows)
+
+
+@skipUnless(turso, 'libsql_experimental is not installed')
+class TursoCursorTests(SimpleTestCase):
+    def cursor(self, **kwargs):
+        driver = FakeDriverCursor()
+        return turso.TursoCursor(driver, **kwargs), driver
+
+    def test_single_row_inserts_are_widened_into_batches(self):
+        cursor, driver = self.cursor(batch_size=3)
+        cursor.executemany('INSERT INTO t (a, b) VALUES (%s, %s)', [(index, f'v{index}') for index in range(7)])
+        self.assertEqual([call[0] for call in driver.calls], ['execute'] * 3)
+        self.assertEqual(driver.calls[0][1], 'INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)')
+        self.assertEqual(driver.calls[0][2], (0, 'v0', 1, 'v1', 2, 'v2'))
+        self.assertEqual(driver.calls[2][1], 'INSERT INTO t (a, b) VALUES (?, ?)')
+        self.assertEqual(cursor.rowcount, 7)
+
+        cursor, driver = self.cursor(batch_size=3)
+        cursor.executemany('INSERT INTO t (a, b) VALUES (%(a)s, %(b)s)', [{'b': 2, 'a': 1}, {'b': 4, 'a': 3}])
+        self.assertEqual(driver.calls, [('execute', 'INSERT INTO t (a, b) VALUES (?, ?), (?, ?)', (1, 2, 3, 4))])
+
+    def test_batches_fit_the_parameter_limit(self):
+        cursor, driver = self.cursor(batch_size=500, max_params=5)
+        cursor.executemany('INSERT INTO t (a, b) VALUES (%s, %s)', [(index, index) for index in range(7)])
+        # 5 // 2 columns: two rows per statement
+        self.assertEqual([len(call[2]) for call in driver.calls], [4, 4, 4, 2])
+
+        cursor, driver = self.cursor(max_params=2)
+        cursor.executemany('INSERT INTO t (a, b, c) VALUES (%s, %s, %s)', [(1, 2, 3), (4, 5, 6)])
+        self.assertEqual([len(call[2]) for call in driver.calls], [3, 3])
+
+    def test_other_statements_go_to_the_driver_executemany(self):
+        for sql in (
+            'UPDATE t SET a = %s WHERE b = %s',
+            'INSERT INTO t (a, b) VALUES (%s, %s) ON CONFLICT (a) DO NOTHING',
+        ):
+            with self.subTest(sql=sql):
+                cursor, driver = self.cursor(batch_size=2)
+                cursor.executemany(sql, [(index, index) for index in range(5)])
+                self.assertEqual([call[0] for call in driver.calls], ['executemany'] * 3)
+                self.assertEqual(driver.calls[0][1], sql.replace('%s', '?'))
+                self.assertEqual([len(call[2]) for call in driver.calls], [2, 2, 1])
+                self.assertEqual(cursor.rowcount, 5)
+
+    def test_rowcount_sums_batches_and_ignores_unknown_counts(self):
+        cursor, driver = self.cursor(batch_size=2)
+        cursor.executemany('INSERT INTO t (a) VALUES (%s)', [])
+        self.assertEqual((cursor.rowcount, driver.calls), (0, []))
+
+        driver.execute = lambda sql, params=(): setattr(driver, 'rowcount', -1)
+        cursor.executemany('INSERT INTO t (a) VALUES (%s)', [(1,), (2,), (3,)])
+        self.assertEqual(cursor.rowcount, 0)
+        # A later execute reports the driver's own count again
+        cursor.execute('DELETE FROM t')
+        self.assertEqual(cursor.rowcount, -1)
+
+
+@skipUnless(turso, 'libsql_experimental is not installed')
+class TursoParameterTests(SimpleTestCase):
+    def test_adapters_follow_the_type_hierarchy(self):
+        class Stamp(datetime):
+            pass
+
+        self.assertEqual(turso.adapt_param(Stamp(2024, 1, 2, 3, 4, 5)), '2024-01-02 03:04:05')
+        # datetime is a date subclass, but its own adapter comes first
+        self.assertIs(turso._adapter_for(Stamp), turso.ADAPTERS[datetime])
+        self.assertEqual(turso.adapt_param(date(2024, 1, 2)), '2024-01-02')
+        # bool is an int subclass: adapted, while int passes through
+        self.assertIs(type(turso.adapt_param(True)), int)
+        self.assertIsNone(turso._adapter_for(int))
+        self.assertEqual(turso.adapt_param(Decimal('1.50')), '1.50')
+        self.assertIsNone(turso.adapt_param(None))
+
+    def test_placeholder_conversion(self):
+        self.assertEqual(turso.convert_query("SELECT %s WHERE a LIKE 'x%%'"), "SELECT ? WHERE a LIKE 'x%'")
+        hits = turso.convert_query.cache_info().hits
+        turso.convert_query("SELECT %s WHERE a LIKE 'x%%'")
+        self.assertEqual(turso.convert_query.cache_info().hits, hits + 1)
+
+        self.assertEqual(
+            turso.convert_mapping_query_and_params('SELECT %(a)s, %(b)s, %(a)s', {'a': True, 'b': Decimal('2')}),
+            ('SELECT ?, ?, ?', (1, '2', 1)),
+        )
+        self.assertEqual(turso.convert_pyformat_query('SELECT %(a)s, %(a)s'), ('SELECT ?, ?', ('a', 'a')))
+        self.assertIsNone(turso.convert_pyformat_query('SELECT %s'))
+        # A mapping for unnamed placeholders is bound in its own order
+        self.assertEqual(turso.convert_mapping_query_and_params('SELECT %s, %s', {'x': 1, 'y': 2}), ('SELECT ?, ?', (1, 2)))
+
+
+class StubLibsqlConnection:
+    """libSQL connection whose ``SELECT 1`` probe passes while ``alive``"""
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.probes = 0
+        self.closed = False
+        self.in_transaction = False
+
+    def execute(self, sql):
+        self.probes += 1
+        if not self.alive:
+            raise sqlite3.OperationalError('connection lost')
+
+    def close(self):
+        self.closed = True
+
+
+@skipUnless(turso, 'libsql_experimental is not installed')
+class TursoConnectionPoolTests(SimpleTestCase):
+    KEY = ('default', 'file:pool.db')
+
+    def wrapper(self, **options):
+        settings_dict = connections.configure_settings({'default': {
+            'ENGINE': 'backends.turso', 'NAME': 'file:pool.db',
+            'OPTIONS': {'health_check_interval': 30, **options},
+        }})['default']
+        return turso.DatabaseWrapper(settings_dict, 'default')
+
+    def test_health_checks_run_once_per_interval(self):
+        wrapper = self.wrapper()
+        wrapper.connection = StubLibsqlConnection()
+        wrapper._last_health_check = 100
+        with patch.object(turso, 'monotonic', return_value=129):
+            self.assertTrue(wrapper.is_usable())
+        self.assertEqual(wrapper.connection.probes, 0)
+        with patch.object(turso, 'monotonic', return_value=130):
+            self.assertTrue(wrapper.is_usable())
+        self.assertEqual((wrapper.connection.probes, wrapper._last_health_check), (1, 130))
+
+        # After an error the connection is probed whatever the interval
+        wrapper.errors_occurred = True
+        wrapper.connection.alive = False
+        with patch.object(turso, 'monotonic', return_value=131):
+            self.assertFalse(wrapper.is_usable())
+        self.assertEqual(wrapper.connection.probes, 2)
+
+    def test_idle_connections_are_reused_by_their_own_thread(self):
+        pool = turso.ConnectionPool()
+        conn = StubLibsqlConnection()
+        pool.release(self.KEY, conn, max_idle=1)
+        elsewhere = []
+        thread = threading.Thread(target=lambda: elsewhere.append(pool.acquire(self.KEY, lambda *args: True)))
+        thread.start()
+        thread.join()
+        self.assertEqual(elsewhere, [None])
+        self.assertIs(pool.acquire(self.KEY, lambda *args: True), conn)
+        self.assertEqual(pool.stats(), {'hits': 1, 'misses': 1, 'discarded': 0})
+
+        extra = StubLibsqlConnection()
+        pool.release(self.KEY, conn, max_idle=1)
+        pool.release(self.KEY, extra, max_idle=1)
+        self.assertTrue(extra.closed)
+
+    def test_stale_idle_connections_are_probed_and_discarded(self):
+        wrapper = self.wrapper(pool=True)
+        pool = turso.ConnectionPool()
+        fresh, stale = StubLibsqlConnection(), StubLibsqlConnection(alive=False)
+        with patch.object(turso, 'monotonic', return_value=0):
+            pool.release(self.KEY, stale, max_idle=2)
+            pool.release(self.KEY, fresh, max_idle=2)
+        with patch.object(turso, 'monotonic', return_value=10):
+            # Released within the interval: handed back without a probe
+            self.assertIs(pool.acquire(self.KEY, wrapper._reusable), fresh)
+        self.assertEqual(fresh.probes, 0)
+        with patch.object(turso, 'monotonic', return_value=60):
+            self.assertIsNone(pool.acquire(self.KEY, wrapper._reusable))
+        self.assertEqual((stale.probes, stale.closed), (1, True))
+        self.assertEqual(pool.stats(), {'hits': 1, 'misses': 1, 'discarded': 1})
+
+    def test_close_pools_only_clean_connections(self):
+        wrapper = self.wrapper(pool=True)
+        for state in ('clean', 'errors', 'transaction'):
+            with self.subTest(state=state), patch.object(turso, 'pool', turso.ConnectionPool()) as pool:
+                conn = wrapper.connection = StubLibsqlConnection()
+                wrapper.errors_occurred = state == 'errors'
+                conn.in_transaction = state == 'transaction'
+                wrapper._close()
+                pooled = pool.acquire(wrapper._pool_key, lambda *args: True)
+                self.assertEqual(pooled is conn, state == 'clean')
+                self.assertEqual(conn.closed, state != 'clean')
+        wrapper.connection = None
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+class QueryPlanTests(TestCase):
+    """Every query behind the list and analytics pages must use an index
+
+    The rollup table is exempt: it is pre-aggregated and read whole.
+    """
+    EXEMPT_TABLES = {'django_session', 'auth_user', 'recruits_dailyrecruitmentstat'}
+
+    URLS = [
+        ('dashboard', {}),
+        ('analytics', {}),
+        ('candidate_list', {'search': 'tes', 'status': 'screening', 'position': '1', 'page': '2'}),
+        ('candidate_autocomplete', {'q': 'tes'}),
+        ('position_list', {'search': 'clean', 'status': 'open', 'department': '1', 'page': '2'}),
+        ('interview_list', {
+            'search': 'alex', 'status': 'completed', 'type': 'phone',
+            'date_from': '2026-01-01', 'date_to': '2026-12-31', 'page': '2',
+        }),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Operations')
+        position = Position.objects.create(title='Cleaner', location='Downtown', department=department)
+        for index in range(25):
+            status = ['new', 'screening', 'hired'][index % 3]
+            candidate = Candidate(
+                first_name=f'Test{index}', last_name='User', email=f'plan{index}@example.com',
+                position=position, status=status,
+            )
+            candidate.update_status_timestamp(status)
+            candidate.save()
+            Interview.objects.create(
+                candidate=candidate,
+                interviewer_name='Alex',
+                scheduled_date=timezone.now(),
+                scheduled_time='10:00',
+                status='completed',
+                rating=3,
+            )
+        cls.user = get_user_model().objects.create_user(username='testuser', password='testpass123')
+
+    def table_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            details = [row[-1] for row in cursor.fetchall()]
+        tables = set(connection.introspection.table_names()) - self.EXEMPT_TABLES
+        scans = []
+        for detail in details:
+            # Plain "SCAN table"; "SCAN table USING ... INDEX" walks an index
+            match = re.fullmatch(r'SCAN (?:TABLE )?(\w+)', detail)
+            if match and match.group(1) in tables:
+                scans.append(match.group(1))
+        return scans
+
+    def test_list_and_analytics_queries_avoid_full_table_scans(self):
+        self.client.force_login(self.user)
+        for name, filters in self.URLS:
+            keys = list(filters)
+            for size in range(len(keys) + 1):
+                for combination in itertools.combinations(keys, size):
+                    params = {key: filters[key] for key in combination}
+                    with CaptureQueriesContext(connection) as queries:
+                        self.client.get(reverse(name), params)
+                    for query in queries.captured_queries:
+                        if not query['sql'].startswith('SELECT'):
+                            continue
+                        with self.subTest(url=name, params=params, sql=query['sql']):
+                            self.assertEqual(self.table_scans(query['sql']), [])
+
+    @override_settings(LIST_PAGINATION='keyset')
+    def test_keyset_pages_avoid_full_table_scans(self):
+        self.client.force_login(self.user)
+        for name in ('candidate_list', 'position_list', 'interview_list'):
+            page = self.client.get(reverse(name)).context['page_obj']
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(f'{reverse(name)}?{page.next_query}')
+            for query in queries.captured_queries:
+                if not query['sql'].startswith('SELECT'):
+                    continue
+                with self.subTest(url=name, sql=query['sql']):
+                    self.assertEqual(self.table_scans(query['sql']), [])
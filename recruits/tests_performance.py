@@ -0,0 +1,293 @@
+"""
+Query-count and latency regression tests for every URL in recruits/urls.py.
+
+Each page runs against a dataset large enough to fill every page of every
+filter combination, so an N+1 or a query that fans out per filter shows
+up as a changed query count. The counts are exact: when a change adds or
+removes a query on purpose, update ``QUERIES`` in the same commit.
+
+Latency depends on the machine, so it is only compared with
+``performance_baseline.json`` when ``PERF_LATENCY=1`` is set (``make
+perf``); run ``UPDATE_PERF_BASELINE=1 python manage.py test
+recruits.tests_performance`` to record a new baseline. ``PERF_TOLERANCE``
+(default 3) is the slowdown allowed before a page fails.
+"""
+import itertools
+import json
+import os
+import statistics
+import time
+from datetime import datetime, time as clock, timedelta
+from pathlib import Path
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from . import events, rollups, search, urls
+from .models import Candidate, Department, Interview, Position
+
+BASELINE_FILE = Path(__file__).with_name('performance_baseline.json')
+UPDATE_BASELINE = os.environ.get('UPDATE_PERF_BASELINE', '') not in ('', '0')
+MEASURE_LATENCY = UPDATE_BASELINE or os.environ.get('PERF_LATENCY', '') not in ('', '0')
+TOLERANCE = float(os.environ.get('PERF_TOLERANCE', '3'))
+# Absolute slack, so millisecond pages do not fail on scheduler noise
+LATENCY_SLACK = 0.020
+LATENCY_RUNS = 5
+
+FIRST_NAMES = ['Ana', 'Ben', 'Carla', 'Dev', 'Eli', 'Fay']
+TITLES = ['Cleaner', 'Supervisor', 'Driver', 'Clerk']
+INTERVIEWERS = ['Alex Kim', 'Sam Lee']
+CANDIDATES = 3000
+POSITIONS = 480
+INTERVIEWS = 2000
+
+# Exact queries per request, including the session and user lookups. HTMX
+# list requests swap only the results (see views.render_list).
+QUERIES = {
+    'home': 3,
+    'landing_page': 3,
+    'dashboard': 7,
+    'analytics': 12,
+    'candidate_list': 5,
+    'candidate_list htmx': 4,
+    'position_list': 5,
+    'position_list htmx': 4,
+    'interview_list': 4,
+    'interview_list htmx': 4,
+    'candidate_export': 3,
+    'interview_export': 3,
+    'candidate_autocomplete': 4,
+    'candidate_autocomplete short': 2,
+    'candidate_create': 2,
+    'candidate_update': 3,
+    'position_create': 2,
+    'position_update': 3,
+    'interview_create': 2,
+    'interview_update': 3,
+    'candidate_create POST': 8,
+    'candidate_update POST': 8,
+    'candidate_delete POST': 11,
+    'candidate_bulk_transition POST': 10,
+    # Reloads the moved rows to swap them in place
+    'candidate_bulk_transition POST htmx': 11,
+    'position_create POST': 4,
+    'position_update POST': 4,
+    'position_delete POST': 11,
+    'interview_create POST': 8,
+    'interview_update POST': 9,
+    'interview_delete POST': 6,
+    'department_create POST': 3,
+}
+
+# Pages timed against the baseline
+LATENCY_CASES = [
+    'home', 'dashboard', 'analytics', 'candidate_list', 'position_list', 'interview_list',
+    'candidate_export', 'interview_export', 'candidate_autocomplete',
+]
+
+
+class PerformanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='perf', password='testpass123')
+        today = timezone.localdate()
+        departments = Department.objects.bulk_create(
+            Department(name=name) for name in ('Operations', 'Facilities', 'Logistics')
+        )
+        # Index arithmetic spreads every filter value evenly across the
+        # others, so every filter combination has a second page
+        positions = Position.objects.bulk_create(
+            Position(
+                title=f'{TITLES[index % 4]} {index}',
+                location='Downtown',
+                status=Position.STATUS_CHOICES[(index // 4) % 3][0],
+                department=departments[(index // 12) % 3],
+            )
+            for index in range(POSITIONS)
+        )
+        candidates = []
+        for index in range(CANDIDATES):
+            status = Candidate.STATUS_CHOICES[(index // 6) % 6][0]
+            candidate = Candidate(
+                first_name=FIRST_NAMES[index % 6],
+                last_name=f'Silva{index}',
+                email=f'candidate{index}@example.com',
+                phone='555-0100',
+                position=positions[(index // 36) % 6],
+                status=status,
+                experience_years=index % 10,
+            )
+            candidate.update_status_timestamp(status)
+            candidates.append(candidate)
+        candidates = Candidate.objects.bulk_create(candidates)
+        Interview.objects.bulk_create(
+            Interview(
+                candidate=candidates[index],
+                interviewer_name=INTERVIEWERS[index % 2],
+                scheduled_date=timezone.make_aware(datetime.combine(
+                    today + timedelta(days=(index // 24) % 60 - 30), clock(10),
+                )),
+                scheduled_time=clock(10),
+                status=Interview.STATUS_CHOICES[(index // 2) % 4][0],
+                interview_type=Interview.TYPE_CHOICES[(index // 8) % 3][0],
+                rating=index % 5 + 1,
+            )
+            for index in range(INTERVIEWS)
+        )
+        rollups.rebuild(workers=1)
+        events.backfill()
+
+        cls.candidate = candidates[0]
+        cls.position = positions[0]
+        cls.interview = Interview.objects.order_by('pk').first()
+        cls.department = departments[0]
+        cls.list_filters = {
+            'candidate_list': {
+                'search': 'ana', 'status': 'screening', 'position': str(positions[0].pk), 'page': '2',
+            },
+            'position_list': {
+                'search': 'clean', 'status': 'open', 'department': str(departments[0].pk), 'page': '2',
+            },
+            'interview_list': {
+                'search': 'alex', 'status': 'completed', 'type': 'phone',
+                'date_from': (today - timedelta(days=30)).isoformat(),
+                'date_to': (today - timedelta(days=1)).isoformat(),
+                'page': '2',
+            },
+        }
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        # Probed once per process; keep the probe out of the counts
+        search.is_available(connection)
+
+    # ==================== HELPERS ====================
+
+    def get_cases(self):
+        """``(label, url, params, headers)`` for every read-only request"""
+        cases = [
+            ('home', reverse('home'), {}, {}),
+            ('landing_page', reverse('landing_page'), {}, {}),
+            ('dashboard', reverse('dashboard'), {}, {}),
+            ('analytics', reverse('analytics'), {}, {}),
+            ('candidate_export', reverse('candidate_export'), {'status': 'new'}, {}),
+            ('interview_export', reverse('interview_export'), {'status': 'completed'}, {}),
+            ('candidate_autocomplete', reverse('candidate_autocomplete'), {'q': 'ana silva1'}, {}),
+            ('candidate_autocomplete short', reverse('candidate_autocomplete'), {'q': 'a'}, {}),
+            ('candidate_create', reverse('candidate_create'), {}, {}),
+            ('candidate_update', reverse('candidate_update', args=[self.candidate.pk]), {}, {}),
+            ('position_create', reverse('position_create'), {}, {}),
+            ('position_update', reverse('position_update', args=[self.position.pk]), {}, {}),
+            ('interview_create', reverse('interview_create'), {}, {}),
+            ('interview_update', reverse('interview_update', args=[self.interview.pk]), {}, {}),
+        ]
+        for name, filters in self.list_filters.items():
+            target = name.replace('_list', '-results')
+            keys = list(filters)
+            for size in range(len(keys) + 1):
+                for combination in itertools.combinations(keys, size):
+                    params = {key: filters[key] for key in combination}
+                    cases.append((name, reverse(name), params, {}))
+                    cases.append((
+                        f'{name} htmx', reverse(name), params,
+                        {'HTTP_HX_REQUEST': 'true', 'HTTP_HX_TARGET': target},
+                    ))
+        return cases
+
+    def fetch(self, url, params, headers):
+        response = self.client.get(url, params, **headers)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def post_cases(self):
+        """``(label, url, data)`` for every write"""
+        today = timezone.localdate().isoformat()
+        candidate = {
+            'first_name': 'Nia', 'last_name': 'Costa', 'email': 'nia@example.com', 'phone': '555-0101',
+            'position': str(self.position.pk), 'status': 'screening', 'experience_years': '2',
+        }
+        position = {
+            'title': 'Night Cleaner', 'location': 'Harbor', 'department': str(self.department.pk),
+            'status': 'open', 'required_experience': '1',
+        }
+        interview = {
+            'candidate': str(self.candidate.pk), 'interviewer_name': 'Alex Kim', 'scheduled_date': today,
+            'scheduled_time': '11:00', 'interview_type': 'video', 'status': 'completed', 'rating': '4',
+        }
+        return [
+            ('candidate_create POST', reverse('candidate_create'), candidate),
+            ('candidate_update POST', reverse('candidate_update', args=[self.candidate.pk]),
+             dict(candidate, email=self.candidate.email, status='offer')),
+            ('candidate_bulk_transition POST', reverse('candidate_bulk_transition'),
+             {'status': 'hired', 'ids': [str(pk) for pk in range(self.candidate.pk, self.candidate.pk + 10)]}),
+            ('candidate_delete POST', reverse('candidate_delete', args=[self.candidate.pk]), {}),
+            ('position_create POST', reverse('position_create'), position),
+            ('position_update POST', reverse('position_update', args=[self.position.pk]),
+             dict(position, status='filled')),
+            ('position_delete POST', reverse('position_delete', args=[self.position.pk]), {}),
+            ('interview_create POST', reverse('interview_create'), interview),
+            ('interview_update POST', reverse('interview_update', args=[self.interview.pk]),
+             dict(interview, status='no_show')),
+            ('interview_delete POST', reverse('interview_delete', args=[self.interview.pk]), {}),
+            ('department_create POST', reverse('department_create'), {'name': 'Security'}),
+        ]
+
+    # ==================== TESTS ====================
+
+    def test_every_url_is_covered(self):
+        covered = {label.split()[0] for label in QUERIES}
+        self.assertEqual({pattern.name for pattern in urls.urlpatterns}, covered)
+
+    def test_read_query_counts(self):
+        for label, url, params, headers in self.get_cases():
+            with self.subTest(case=label, params=params):
+                with self.assertNumQueries(QUERIES[label]):
+                    response = self.fetch(url, params, headers)
+                self.assertLess(response.status_code, 400)
+
+    def test_write_query_counts(self):
+        for label, url, data in self.post_cases():
+            for headers in ({}, {'HTTP_HX_REQUEST': 'true'}):
+                expected = QUERIES.get(f'{label} htmx', QUERIES[label]) if headers else QUERIES[label]
+                with self.subTest(case=label, htmx=bool(headers)):
+                    savepoint = transaction.savepoint()
+                    try:
+                        with self.assertNumQueries(expected):
+                            response = self.client.post(url, data, **headers)
+                        self.assertLess(response.status_code, 400)
+                    finally:
+                        # Every case starts from the seeded data
+                        transaction.savepoint_rollback(savepoint)
+
+    @skipUnless(MEASURE_LATENCY, 'Set PERF_LATENCY=1 to compare page latency with the baseline')
+    def test_latency_against_baseline(self):
+        baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        measured = {}
+        for label, url, params, headers in self.get_cases():
+            if label not in LATENCY_CASES or label in measured:
+                continue
+            self.fetch(url, params, headers)
+            timings = []
+            for _ in range(LATENCY_RUNS):
+                started = time.perf_counter()
+                self.fetch(url, params, headers)
+                timings.append(time.perf_counter() - started)
+            measured[label] = statistics.median(timings)
+
+        if UPDATE_BASELINE:
+            rounded = {label: round(seconds, 4) for label, seconds in sorted(measured.items())}
+            BASELINE_FILE.write_text(json.dumps(rounded, indent=2) + '\n')
+            return
+        for label, seconds in measured.items():
+            with self.subTest(case=label):
+                self.assertIn(label, baseline, 'No baseline; record one with UPDATE_PERF_BASELINE=1')
+                allowed = baseline[label] * TOLERANCE + LATENCY_SLACK
+                self.assertLessEqual(
+                    seconds, allowed,
+                    f'{label} took {seconds * 1000:.1f} ms, baseline {baseline[label] * 1000:.1f} ms',
+                )
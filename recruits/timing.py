@@ -0,0 +1,198 @@
+"""
+Per-request database, template and view timing.
+
+``ServerTimingMiddleware`` counts the queries a request runs and the time
+they take, through ``connection.execute_wrapper``, and the time spent
+rendering templates, through the ``DjangoTemplates`` backend below. Each
+response gets a ``Server-Timing`` header and each request a log line,
+keyed by URL name. Requests that run more queries than their URL name's
+entry in ``settings.QUERY_BUDGETS`` are logged as warnings.
+
+The middleware runs natively under ASGI too; there the connections of the
+request's sync thread are instrumented, since that is where its queries
+run. Streaming responses are timed up to the first byte; queries run while the
+body streams are not counted. Queries a view hands to other threads are
+counted when those threads run them under ``instrument()`` in a copy of
+the request's context (see ``async_views``).
+"""
+import logging
+import threading
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timings', default=None)
+
+
+class Timings:
+    """What one request has spent so far, in seconds"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.view = 0.0
+        self.total = 0.0
+        self.view_started = None
+        self.rendering = 0
+        # Queries may be recorded from several threads at once
+        self.lock = threading.Lock()
+
+    def header(self):
+        return ', '.join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'template;dur={self.template * 1000:.1f}',
+            f'view;dur={self.view * 1000:.1f}',
+            f'total;dur={self.total * 1000:.1f}',
+        ])
+
+
+def current():
+    """The ``Timings`` of the request being handled, if any"""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if timings is not None:
+            with timings.lock:
+                timings.queries += 1
+                timings.db += perf_counter() - started
+
+
+@contextmanager
+def instrument():
+    """Record the queries of every connection of this thread"""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(record_query))
+        yield
+
+
+def _instrument_thread():
+    stack = ExitStack()
+    stack.enter_context(instrument())
+    return stack
+
+
+# ==================== TEMPLATES ====================
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None or timings.rendering:
+            # Not in a request, or already counted by an enclosing render
+            return super().render(context, request)
+        timings.rendering += 1
+        started = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template += perf_counter() - started
+            timings.rendering -= 1
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """The Django template backend, timing every render"""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+# ==================== MIDDLEWARE ====================
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = Timings()
+        token = _current.set(timings)
+        started = perf_counter()
+        try:
+            with instrument():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, started)
+
+    async def __acall__(self, request):
+        timings = Timings()
+        token = _current.set(timings)
+        started = perf_counter()
+        # Sync views and sync_to_async calls of this request share one thread
+        stack = await sync_to_async(_instrument_thread)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self.finish(request, response, timings, started)
+
+    def finish(self, request, response, timings, started):
+        finished = perf_counter()
+        timings.total = finished - started
+        if timings.view_started is not None:
+            timings.view = finished - timings.view_started
+
+        if settings.SERVER_TIMING:
+            response.headers['Server-Timing'] = timings.header()
+        self.report(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = _current.get()
+        if timings is not None:
+            timings.view_started = perf_counter()
+
+    def report(self, request, response, timings):
+        match = request.resolver_match
+        name = match.url_name if match else None
+        values = {
+            'view': name or '-',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timings.queries,
+            'db_ms': round(timings.db * 1000, 1),
+            'template_ms': round(timings.template * 1000, 1),
+            'view_ms': round(timings.view * 1000, 1),
+            'total_ms': round(timings.total * 1000, 1),
+        }
+        logger.info(
+            ' '.join(f'{key}=%s' for key in values), *values.values(),
+            extra={'timing': values},
+        )
+
+        budget = settings.QUERY_BUDGETS.get(name)
+        if budget is not None and timings.queries > budget:
+            logger.warning(
+                'QUERY BUDGET EXCEEDED view=%s queries=%s budget=%s path=%s',
+                name, timings.queries, budget, request.path,
+                extra={'timing': values},
+            )
@@ -0,0 +1,94 @@
+"""
+Set-based pipeline transitions.
+
+``bulk_transition`` moves many candidates to one status with a single
+UPDATE. Stage dates are only filled where still empty, exactly like
+``Candidate.update_status_timestamp``. ``bulk_interview_status`` does the
+same for interviews. The UPDATEs bypass model signals, so status events,
+rollups and cached contexts are maintained here.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import caching, events, metrics, rollups
+from .models import Candidate, Interview
+
+STATUSES = {value for value, _label in Candidate.STATUS_CHOICES}
+INTERVIEW_STATUSES = {value for value, _label in Interview.STATUS_CHOICES}
+STAGE_DATE_FIELDS = dict(metrics.STAGE_DATE_FIELDS)
+
+
+def bulk_transition(candidate_ids, status, now=None):
+    """Move candidates to ``status``; returns the ids whose status changed
+
+    Candidates already in ``status`` are left untouched.
+    """
+    if status not in STATUSES:
+        raise ValueError(f'Unknown status {status!r}')
+    now = now or timezone.now()
+    date_field = STAGE_DATE_FIELDS.get(status)
+
+    with transaction.atomic():
+        previous = list(
+            Candidate.objects.filter(pk__in=candidate_ids)
+            .exclude(status=status)
+            .values('id', *rollups.CANDIDATE_FIELDS)
+        )
+        if not previous:
+            return []
+        changed = [row.pop('id') for row in previous]
+
+        updates = {'status': status, 'updated_at': now}
+        if date_field:
+            updates[date_field] = Coalesce(date_field, Value(now))
+        Candidate.objects.filter(pk__in=changed).update(**updates)
+
+        events.record(
+            [(candidate_id, values['status'], status) for candidate_id, values in zip(changed, previous)], at=now,
+        )
+        deltas = Counter()
+        for values in previous:
+            current = dict(values, status=status)
+            if date_field:
+                current[date_field] = values[date_field] or now
+            deltas.update(rollups.diff(
+                rollups.candidate_contributions(values),
+                rollups.candidate_contributions(current),
+            ))
+        rollups.apply(deltas)
+        caching.bump(Candidate)
+    return changed
+
+
+def bulk_interview_status(interview_ids, status, now=None):
+    """Set the status of interviews; returns the ids whose status changed"""
+    if status not in INTERVIEW_STATUSES:
+        raise ValueError(f'Unknown interview status {status!r}')
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        previous = list(
+            Interview.objects.filter(pk__in=interview_ids)
+            .exclude(status=status)
+            .values('id', 'candidate__position_id', *rollups.INTERVIEW_FIELDS)
+        )
+        if not previous:
+            return []
+        changed = [row.pop('id') for row in previous]
+
+        Interview.objects.filter(pk__in=changed).update(status=status, updated_at=now)
+
+        deltas = Counter()
+        for values in previous:
+            position_id = values.pop('candidate__position_id')
+            deltas.update(rollups.diff(
+                rollups.interview_contributions(values, position_id),
+                rollups.interview_contributions(dict(values, status=status), position_id),
+            ))
+        rollups.apply(deltas)
+        caching.bump(Interview)
+    return changed
@@ -1,20 +1,35 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth.decorators import login_required
-from . import views
+from . import async_views, views
+
+# The aggregate-heavy pages, optionally as async views running their
+# queries concurrently (see async_views.py)
+if settings.ASYNC_VIEWS:
+    landing_page = async_views.landing_page
+    dashboard = async_views.dashboard
+    analytics = async_views.analytics
+else:
+    landing_page = views.landing_page
+    dashboard = login_required(views.dashboard)
+    analytics = login_required(views.analytics)
 
 urlpatterns = [
     # Landing Page (public)
-    path('', views.landing_page, name='home'),
-    path('landing/', views.landing_page, name='landing_page'),
+    path('', landing_page, name='home'),
+    path('landing/', landing_page, name='landing_page'),
     
     # Dashboard
-    path('dashboard/', login_required(views.dashboard), name='dashboard'),
+    path('dashboard/', dashboard, name='dashboard'),
     
     # Analytics
-    path('analytics/', login_required(views.analytics), name='analytics'),
+    path('analytics/', analytics, name='analytics'),
     
     # Candidates
     path('candidates/', login_required(views.candidate_list), name='candidate_list'),
+    path('candidates/export/', login_required(views.candidate_export), name='candidate_export'),
+    path('candidates/autocomplete/', login_required(views.candidate_autocomplete), name='candidate_autocomplete'),
+    path('candidates/transition/', login_required(views.candidate_bulk_transition), name='candidate_bulk_transition'),
     path('candidates/create/', login_required(views.candidate_create), name='candidate_create'),
     path('candidates/<int:pk>/edit/', login_required(views.candidate_update), name='candidate_update'),
     path('candidates/<int:pk>/delete/', login_required(views.candidate_delete), name='candidate_delete'),
@@ -27,6 +42,7 @@ urlpatterns = [
     
     # Interviews
     path('interviews/', login_required(views.interview_list), name='interview_list'),
+    path('interviews/export/', login_required(views.interview_export), name='interview_export'),
     path('interviews/create/', login_required(views.interview_create), name='interview_create'),
     path('interviews/<int:pk>/edit/', login_required(views.interview_update), name='interview_update'),
     path('interviews/<int:pk>/delete/', login_required(views.interview_delete), name='interview_delete'),
@@ -1,195 +1,213 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, HttpResponse
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Count, Q, Avg
-from django.db.models.functions import TruncDate, TruncMonth
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from datetime import timedelta, date
-from .models import Candidate, Position, Interview, Department
+from functools import partial
+from .models import Candidate, CandidateStatusEvent, DailyRecruitmentStat, Position, Interview, Department
+from . import caching, exports, filters, metrics, pagination, rollups, search, transitions
 import json
 
 
+def run_queries(queries):
+    """``{name: query()}`` for a ``{name: callable}`` of independent queries
+
+    The views below list their queries this way so ``async_views`` can run
+    the same ones concurrently.
+    """
+    return {name: query() for name, query in queries.items()}
+
+
+LANDING_QUERIES = {
+    'total_candidates': lambda: Candidate.objects.count(),
+    'active_positions': lambda: Position.objects.filter(status='open').count(),
+    'total_departments': lambda: Department.objects.count(),
+}
+
+
+LANDING_MODELS = (Candidate, Position, Department)
+
+
 def landing_page(request):
-    """Public landing page for marketing the app"""
+    """Public landing page for marketing the app
+
+    The page is the same for every visitor, so the whole response is cached
+    and revalidated with ETag/Last-Modified (see ``caching.cached_response``).
+    """
+    return caching.cached_response(request, 'landing', LANDING_MODELS, partial(_render_landing, request, run_queries))
+
+
+def _render_landing(request, run):
     # Get some stats to display
-    total_candidates = Candidate.objects.count()
-    active_positions = Position.objects.filter(status='open').count()
-    total_departments = Department.objects.count()
-    
-    context = {
-        'total_candidates': total_candidates,
-        'active_positions': active_positions,
-        'total_departments': total_departments,
-    }
-    return render(request, 'landing.html', context)
+    return render(request, 'landing.html', run(LANDING_QUERIES))
+
+
+DASHBOARD_MODELS = (Candidate, Position, Interview)
+ANALYTICS_MODELS = (Candidate, Position, Interview, Department, CandidateStatusEvent, DailyRecruitmentStat)
 
+DASHBOARD_QUERIES = {
+    'candidate_stats': metrics.candidate_metrics,
+    'position_stats': metrics.position_metrics,
+    'interview_stats': metrics.interview_metrics,
+    'recent_candidates': lambda: list(Candidate.objects.select_related('position')[:5]),
+    'recent_interviews': lambda: list(Interview.objects.select_related('candidate').order_by('-scheduled_date')[:5]),
+}
 
+
+@caching.conditional_page(*DASHBOARD_MODELS)
 def dashboard(request):
     """Main dashboard view with key metrics"""
-    total_candidates = Candidate.objects.count()
-    active_positions = Position.objects.filter(status='open').count()
-    
-    # Interviews this week
-    today = timezone.now().date()
-    week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=7)
-    interviews_this_week = Interview.objects.filter(
-        scheduled_date__gte=week_start,
-        scheduled_date__lt=week_end
-    ).count()
-    
+    context = caching.cached_context('dashboard', DASHBOARD_MODELS, _dashboard_context)
+    return render(request, 'dashboard.html', context)
+
+
+def _dashboard_context(results=None):
+    """Dashboard context from the ``results`` of ``DASHBOARD_QUERIES``, run here if not given"""
+    if results is None:
+        results = run_queries(DASHBOARD_QUERIES)
+    candidate_stats = results['candidate_stats']
+    position_stats = results['position_stats']
+    interview_stats = results['interview_stats']
+
     # Hire rate
-    total_completed = Candidate.objects.filter(status__in=['hired', 'rejected']).count()
-    hired = Candidate.objects.filter(status='hired').count()
-    hire_rate = round((hired / total_completed * 100), 1) if total_completed > 0 else 0
-    
-    # Candidates by status
-    candidates_by_status = Candidate.objects.values('status').annotate(count=Count('id'))
-    
-    # Recent candidates
-    recent_candidates = Candidate.objects.all()[:5]
-    
-    # Recent interviews
-    recent_interviews = Interview.objects.select_related('candidate').order_by('-scheduled_date')[:5]
+    hired = candidate_stats['by_status']['hired']
+    total_completed = hired + candidate_stats['by_status']['rejected']
+    hire_rate = metrics.rate(hired, total_completed)
     
     context = {
-        'total_candidates': total_candidates,
-        'active_positions': active_positions,
-        'interviews_this_week': interviews_this_week,
+        'total_candidates': candidate_stats['total'],
+        'active_positions': position_stats['open'],
+        'interviews_this_week': interview_stats['this_week'],
         'hire_rate': hire_rate,
-        'candidates_by_status': list(candidates_by_status),
-        'recent_candidates': recent_candidates,
-        'recent_interviews': recent_interviews,
+        'candidates_by_status': candidate_stats['status_data'],
+        'recent_candidates': results['recent_candidates'],
+        'recent_interviews': results['recent_interviews'],
     }
-    return render(request, 'dashboard.html', context)
+    return context
+
+
+def _round_days(value):
+    return round(value, 1) if value is not None else None
+
+
+ANALYTICS_QUERIES = {
+    'candidate_stats': metrics.candidate_metrics,
+    'position_stats': metrics.position_metrics,
+    'interview_stats': metrics.interview_metrics,
+    # Applications over time (last 30 days), from the daily rollups
+    'daily_applications': lambda: rollups.daily_totals(
+        'applications', (timezone.now() - timedelta(days=30)).date(),
+    ),
+    # Hires over the last 6 months
+    'daily_hires': lambda: rollups.daily_totals('hired', (timezone.now() - timedelta(days=180)).date()),
+    'positions_by_dept': lambda: list(
+        Position.objects.values('department__name').annotate(count=Count('id'))
+        .exclude(department__name__isnull=True)
+    ),
+    'durations': metrics.stage_durations,
+    'funnel': rollups.funnel_totals,
+    'velocity': metrics.stage_velocity,
+    'transitions': metrics.transition_counts,
+}
 
 
 def analytics(request):
     """Detailed analytics view"""
-    # Candidates by status
-    status_data = Candidate.objects.values('status').annotate(count=Count('id'))
-
-    # Applications over time (last 30 days)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    applications_by_day_qs = Candidate.objects.filter(
-        applied_date__gte=thirty_days_ago
-    ).annotate(
-        day=TruncDate('applied_date')
-    ).values('day').annotate(count=Count('id')).order_by('day')
+    context = caching.cached_context('analytics', ANALYTICS_MODELS, _analytics_context)
+    return render(request, 'analytics.html', context)
+
+
+def _analytics_context(results=None):
+    """Analytics context from the ``results`` of ``ANALYTICS_QUERIES``, run here if not given"""
+    if results is None:
+        results = run_queries(ANALYTICS_QUERIES)
+    candidate_stats = results['candidate_stats']
+    position_stats = results['position_stats']
+    interview_stats = results['interview_stats']
+
     applications_by_day = [
-        {
-            'day': row['day'].isoformat() if row['day'] else None,
-            'count': row['count'],
-        }
-        for row in applications_by_day_qs
+        {'day': day.isoformat(), 'count': count}
+        for day, count in results['daily_applications']
     ]
 
     # Hire rate by month (last 6 months)
-    six_months_ago = timezone.now() - timedelta(days=180)
-    monthly_hires_qs = Candidate.objects.filter(
-        status='hired',
-        hired_date__gte=six_months_ago
-    ).annotate(
-        month=TruncMonth('hired_date')
-    ).values('month').annotate(count=Count('id')).order_by('month')
+    hires_by_month = {}
+    for day, count in results['daily_hires']:
+        month = day.strftime('%Y-%m')
+        hires_by_month[month] = hires_by_month.get(month, 0) + count
     monthly_hires = [
-        {
-            'month': row['month'].strftime('%Y-%m') if row['month'] else None,
-            'count': row['count'],
-        }
-        for row in monthly_hires_qs
+        {'month': month, 'count': count}
+        for month, count in hires_by_month.items()
     ]
 
     # Positions by department
-    positions_by_dept = Position.objects.values('department__name').annotate(
-        count=Count('id')
-    ).exclude(department__name__isnull=True)
+    positions_by_dept = results['positions_by_dept']
 
     # Interview success rate
-    completed_interviews = Interview.objects.filter(status='completed').count()
-    no_shows = Interview.objects.filter(status='no_show').count()
-    interview_show_rate = round((completed_interviews / (completed_interviews + no_shows) * 100), 1) if (completed_interviews + no_shows) > 0 else 0
+    completed_interviews = interview_stats['completed']
+    no_shows = interview_stats['no_show']
+    interview_show_rate = metrics.rate(completed_interviews, completed_interviews + no_shows)
 
     # Average interview rating
-    avg_rating = Interview.objects.filter(rating__isnull=False).aggregate(Avg('rating'))['rating__avg']
+    avg_rating = interview_stats['avg_rating']
     avg_rating = round(avg_rating, 1) if avg_rating else 0
 
     # Metrics
-    total_candidates = Candidate.objects.count()
-    total_positions = Position.objects.count()
-    open_positions = Position.objects.filter(status='open').count()
-    total_interviews = Interview.objects.count()
-    completed_interviews = Interview.objects.filter(status='completed').count()
-    hired_candidates = Candidate.objects.filter(status='hired').count()
+    total_candidates = candidate_stats['total']
+    total_positions = position_stats['total']
+    open_positions = position_stats['open']
+    total_interviews = interview_stats['total']
+    hired_candidates = candidate_stats['by_status']['hired']
 
     # ==================== RECRUITMENT EFFICIENCY METRICS ====================
 
-    # Average Time-to-Hire (days from application to hired)
-    hired_with_dates = Candidate.objects.filter(
-        status='hired',
-        hired_date__isnull=False
-    )
-    avg_time_to_hire = None
-    if hired_with_dates.exists():
-        total_days = sum(
-            (c.hired_date - c.applied_date).days
-            for c in hired_with_dates
-        )
-        avg_time_to_hire = round(total_days / hired_with_dates.count(), 1)
-
-    # Average Time-to-Screen (days from application to screening)
-    screened = Candidate.objects.filter(screening_date__isnull=False)
-    avg_time_to_screen = None
-    if screened.exists():
-        total_days = sum(
-            (c.screening_date - c.applied_date).days
-            for c in screened
-        )
-        avg_time_to_screen = round(total_days / screened.count(), 1)
-
-    # Average Time-to-Interview (days from application to interview)
-    interviewed = Candidate.objects.filter(interview_date__isnull=False)
-    avg_time_to_interview = None
-    if interviewed.exists():
-        total_days = sum(
-            (c.interview_date - c.applied_date).days
-            for c in interviewed
-        )
-        avg_time_to_interview = round(total_days / interviewed.count(), 1)
-
-    # Average Time-to-Offer (days from application to offer)
-    offered = Candidate.objects.filter(offer_date__isnull=False)
-    avg_time_to_offer = None
-    if offered.exists():
-        total_days = sum(
-            (c.offer_date - c.applied_date).days
-            for c in offered
-        )
-        avg_time_to_offer = round(total_days / offered.count(), 1)
+    # Average Time-to-Hire/Screen/Interview/Offer (days from application),
+    # computed in the database together with the median and p90
+    durations = results['durations']
+    avg_time_to_hire = _round_days(durations['hire']['avg'])
+    avg_time_to_screen = _round_days(durations['screen']['avg'])
+    avg_time_to_interview = _round_days(durations['interview']['avg'])
+    avg_time_to_offer = _round_days(durations['offer']['avg'])
+    time_to_stage = {
+        stage: {key: _round_days(stats[key]) for key in ('avg', 'median', 'p90')}
+        for stage, stats in durations.items()
+    }
 
     # Pipeline Conversion Rates
-    total_screening = Candidate.objects.exclude(screening_date__isnull=True).count()
-    total_interview = Candidate.objects.exclude(interview_date__isnull=True).count()
-    total_offer = Candidate.objects.exclude(offer_date__isnull=True).count()
-    total_hired = Candidate.objects.filter(status='hired').count()
+    funnel = results['funnel']
+    total_screening = funnel['screened']
+    total_interview = funnel['interviewed']
+    total_offer = funnel['offered']
+    total_hired = funnel['hired']
 
     # Conversion rates
-    screen_rate = round((total_screening / total_candidates * 100), 1) if total_candidates > 0 else 0
-    interview_rate = round((total_interview / total_candidates * 100), 1) if total_candidates > 0 else 0
-    offer_rate = round((total_offer / total_candidates * 100), 1) if total_candidates > 0 else 0
-    hire_rate = round((total_hired / total_candidates * 100), 1) if total_candidates > 0 else 0
-
-    # Pipeline velocity (candidates processed last 7 days)
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    weekly_screened = Candidate.objects.filter(screening_date__gte=seven_days_ago).count()
-    weekly_interviewed = Candidate.objects.filter(interview_date__gte=seven_days_ago).count()
-    weekly_offered = Candidate.objects.filter(offer_date__gte=seven_days_ago).count()
-    weekly_hired = Candidate.objects.filter(hired_date__gte=seven_days_ago).count()
+    screen_rate = metrics.rate(total_screening, total_candidates)
+    interview_rate = metrics.rate(total_interview, total_candidates)
+    offer_rate = metrics.rate(total_offer, total_candidates)
+    hire_rate = metrics.rate(total_hired, total_candidates)
+
+    # Pipeline velocity (candidates moved into each stage last 7 days),
+    # from the status event log
+    velocity = results['velocity']
+    weekly_screened = velocity['screening']
+    weekly_interviewed = velocity['interview']
+    weekly_offered = velocity['offer']
+    weekly_hired = velocity['hired']
+    status_labels = dict(Candidate.STATUS_CHOICES)
+    weekly_transitions = [
+        {
+            'from': status_labels.get(row['from_status'], 'Applied'),
+            'to': status_labels[row['to_status']],
+            'count': row['count'],
+        }
+        for row in results['transitions']
+    ]
 
     # Stage duration data for funnel chart
     stage_data = [
-        {'stage': 'Applied', 'count': total_candidates},
+        {'stage': 'Applied', 'count': funnel['applications']},
         {'stage': 'Screening', 'count': total_screening},
         {'stage': 'Interview', 'count': total_interview},
         {'stage': 'Offer', 'count': total_offer},
@@ -197,7 +215,7 @@ def analytics(request):
     ]
 
     context = {
-        'status_data': list(status_data),
+        'status_data': candidate_stats['status_data'],
         'applications_by_day': list(applications_by_day),
         'monthly_hires': list(monthly_hires),
         'positions_by_dept': list(positions_by_dept),
@@ -214,6 +232,7 @@ def analytics(request):
         'avg_time_to_screen': avg_time_to_screen,
         'avg_time_to_interview': avg_time_to_interview,
         'avg_time_to_offer': avg_time_to_offer,
+        'time_to_stage': time_to_stage,
         'screen_rate': screen_rate,
         'interview_rate': interview_rate,
         'offer_rate': offer_rate,
@@ -222,53 +241,66 @@ def analytics(request):
         'weekly_interviewed': weekly_interviewed,
         'weekly_offered': weekly_offered,
         'weekly_hired': weekly_hired,
+        'weekly_transitions': weekly_transitions,
         'stage_data': stage_data,
     }
-    return render(request, 'analytics.html', context)
+    return context
 
 
 # ==================== CANDIDATE VIEWS ====================
 
+# List orderings; each ends in ``id`` so keyset cursors are unique
+CANDIDATE_ORDERING = ('-applied_date', 'id')
+POSITION_ORDERING = ('-created_at', 'id')
+INTERVIEW_ORDERING = ('scheduled_date', 'scheduled_time', 'id')
+
+# Candidate picker suggestions; shorter queries match too much to be useful
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MIN_LENGTH = 2
+
+
+def render_list(request, template, fragment, target, context, page_context=None):
+    """Render a list page, or only its results fragment when HTMX swaps ``#target``
+
+    Filtering and paging swap just the table and pagination, so the layout
+    and the filter dropdown querysets in ``page_context`` are skipped.
+    """
+    if request.htmx.target == target:
+        response = render(request, fragment, dict(context, fragment=True))
+    else:
+        response = render(request, template, dict(context, **(page_context or {})))
+    patch_vary_headers(response, ('HX-Request', 'HX-Target'))
+    return response
+
+
+@caching.conditional_page(Candidate, Position, Department)
 def candidate_list(request):
     """List all candidates with search and filter"""
-    candidates = Candidate.objects.select_related('position').all()
-    
-    # Search
+    # Rows show the position's department too
+    candidates = filters.filter_candidates(Candidate.objects.select_related('position__department'), request.GET)
     search = request.GET.get('search', '')
-    if search:
-        candidates = candidates.filter(
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(email__icontains=search)
-        )
-    
-    # Filter by status
     status_filter = request.GET.get('status', '')
-    if status_filter:
-        candidates = candidates.filter(status=status_filter)
-    
-    # Filter by position
     position_filter = request.GET.get('position', '')
-    if position_filter:
-        candidates = candidates.filter(position_id=position_filter)
     
     # Pagination
-    paginator = Paginator(candidates, 10)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    positions = Position.objects.filter(status='open')
-    statuses = Candidate.STATUS_CHOICES
+    page_obj = pagination.paginate(request, candidates, CANDIDATE_ORDERING)
     
     context = {
         'page_obj': page_obj,
-        'positions': positions,
-        'statuses': statuses,
         'search': search,
         'status_filter': status_filter,
         'position_filter': position_filter,
     }
-    return render(request, 'candidates/list.html', context)
+    return render_list(request, 'candidates/list.html', 'candidates/partials/results.html', 'candidate-results', context, {
+        'positions': Position.objects.filter(status='open'),
+        'statuses': Candidate.STATUS_CHOICES,
+    })
+
+
+def candidate_export(request):
+    """Stream the filtered candidate list as CSV or JSONL"""
+    candidates = filters.filter_candidates(Candidate.objects.all(), request.GET)
+    return exports.export_response(request, candidates, exports.CANDIDATE_COLUMNS, CANDIDATE_ORDERING, 'candidates')
 
 
 def candidate_create(request):
@@ -364,6 +396,48 @@ def candidate_update(request, pk):
     return redirect('candidate_list')
 
 
+def candidate_bulk_transition(request):
+    """Move the selected candidates to one pipeline status"""
+    if request.method != 'POST':
+        return redirect('candidate_list')
+
+    status = request.POST.get('status', '')
+    ids = [pk for pk in request.POST.getlist('ids') if pk.isdigit()]
+    try:
+        changed = transitions.bulk_transition(ids, status)
+    except ValueError:
+        message, message_type = 'Choose a status to move the selected candidates to.', 'error'
+        changed = []
+    else:
+        label = dict(Candidate.STATUS_CHOICES)[status]
+        message, message_type = f'Moved {len(changed)} candidate(s) to {label}.', 'success'
+
+    if request.htmx:
+        candidates = Candidate.objects.select_related('position__department').filter(pk__in=changed)
+        return render(request, 'candidates/partials/bulk_transition.html', {
+            'candidates': candidates,
+            'message': message,
+            'type': message_type,
+        })
+
+    getattr(messages, message_type)(request, message)
+    return redirect('candidate_list')
+
+
+def candidate_autocomplete(request):
+    """Top matching candidates for the interview form's candidate picker"""
+    query = request.GET.get('q', '').strip()
+    candidates = []
+    if len(query) >= AUTOCOMPLETE_MIN_LENGTH:
+        ids = search.top_matches(Candidate, query, AUTOCOMPLETE_LIMIT)
+        found = Candidate.objects.select_related('position').in_bulk(ids)
+        candidates = [found[pk] for pk in ids if pk in found]
+    return render(request, 'candidates/partials/autocomplete.html', {
+        'candidates': candidates,
+        'query': query,
+    })
+
+
 def candidate_delete(request, pk):
     """Delete a candidate"""
     if request.method == 'DELETE' or request.method == 'POST':
@@ -386,44 +460,24 @@ def candidate_delete(request, pk):
 
 def position_list(request):
     """List all positions with search and filter"""
-    positions = Position.objects.select_related('department').all()
-    
-    # Search
+    positions = filters.filter_positions(Position.objects.select_related('department'), request.GET)
     search = request.GET.get('search', '')
-    if search:
-        positions = positions.filter(
-            Q(title__icontains=search) |
-            Q(location__icontains=search) |
-            Q(department__name__icontains=search)
-        )
-    
-    # Filter by status
     status_filter = request.GET.get('status', '')
-    if status_filter:
-        positions = positions.filter(status=status_filter)
-    
-    # Filter by department
     dept_filter = request.GET.get('department', '')
-    if dept_filter:
-        positions = positions.filter(department_id=dept_filter)
     
     # Pagination
-    paginator = Paginator(positions, 10)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    departments = Department.objects.all()
-    statuses = Position.STATUS_CHOICES
+    page_obj = pagination.paginate(request, positions, POSITION_ORDERING)
     
     context = {
         'page_obj': page_obj,
-        'departments': departments,
-        'statuses': statuses,
         'search': search,
         'status_filter': status_filter,
         'dept_filter': dept_filter,
     }
-    return render(request, 'positions/list.html', context)
+    return render_list(request, 'positions/list.html', 'positions/partials/results.html', 'position-results', context, {
+        'departments': Department.objects.all(),
+        'statuses': Position.STATUS_CHOICES,
+    })
 
 
 def position_create(request):
@@ -532,58 +586,39 @@ def position_delete(request, pk):
 
 # ==================== INTERVIEW VIEWS ====================
 
+@caching.conditional_page(Interview, Candidate, Position)
 def interview_list(request):
     """List all interviews with search and filter"""
-    interviews = Interview.objects.select_related('candidate', 'candidate__position').all()
-    
-    # Search
+    interviews = filters.filter_interviews(
+        Interview.objects.select_related('candidate', 'candidate__position'), request.GET
+    )
     search = request.GET.get('search', '')
-    if search:
-        interviews = interviews.filter(
-            Q(candidate__first_name__icontains=search) |
-            Q(candidate__last_name__icontains=search) |
-            Q(interviewer_name__icontains=search)
-        )
-    
-    # Filter by status
     status_filter = request.GET.get('status', '')
-    if status_filter:
-        interviews = interviews.filter(status=status_filter)
-    
-    # Filter by type
     type_filter = request.GET.get('type', '')
-    if type_filter:
-        interviews = interviews.filter(interview_type=type_filter)
-    
-    # Filter by date range
     date_from = request.GET.get('date_from', '')
     date_to = request.GET.get('date_to', '')
-    if date_from:
-        interviews = interviews.filter(scheduled_date__gte=date_from)
-    if date_to:
-        interviews = interviews.filter(scheduled_date__lte=date_to)
     
     # Pagination
-    paginator = Paginator(interviews, 10)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    candidates = Candidate.objects.all()
-    statuses = Interview.STATUS_CHOICES
-    types = Interview.TYPE_CHOICES
+    page_obj = pagination.paginate(request, interviews, INTERVIEW_ORDERING)
     
     context = {
         'page_obj': page_obj,
-        'candidates': candidates,
-        'statuses': statuses,
-        'types': types,
         'search': search,
         'status_filter': status_filter,
         'type_filter': type_filter,
         'date_from': date_from,
         'date_to': date_to,
     }
-    return render(request, 'interviews/list.html', context)
+    return render_list(request, 'interviews/list.html', 'interviews/partials/results.html', 'interview-results', context, {
+        'statuses': Interview.STATUS_CHOICES,
+        'types': Interview.TYPE_CHOICES,
+    })
+
+
+def interview_export(request):
+    """Stream the filtered interview list as CSV or JSONL"""
+    interviews = filters.filter_interviews(Interview.objects.all(), request.GET)
+    return exports.export_response(request, interviews, exports.INTERVIEW_COLUMNS, INTERVIEW_ORDERING, 'interviews')
 
 
 def interview_create(request):
@@ -623,14 +658,12 @@ def interview_create(request):
 
         return redirect('interview_list')
 
-    candidates = Candidate.objects.filter(status__in=['new', 'screening', 'interview'])
     statuses = Interview.STATUS_CHOICES
     types = Interview.TYPE_CHOICES
 
     if request.htmx:
         return render(request, 'interviews/form.html', {
             'interview': None,
-            'candidates': candidates,
             'statuses': statuses,
             'types': types
         })
@@ -664,14 +697,12 @@ def interview_update(request, pk):
 
         return redirect('interview_list')
 
-    candidates = Candidate.objects.all()
     statuses = Interview.STATUS_CHOICES
     types = Interview.TYPE_CHOICES
 
     if request.htmx:
         return render(request, 'interviews/form.html', {
             'interview': interview,
-            'candidates': candidates,
             'statuses': statuses,
             'types': types
         })
@@ -12,6 +12,9 @@ document.addEventListener('DOMContentLoaded', function () {
 
     // Initialize filters
     initFilters();
+
+    // Initialize autocomplete pickers
+    initAutocomplete();
 });
 
 // HTMX Configuration
@@ -157,6 +160,40 @@ function initFilters() {
     }
 }
 
+// Autocomplete Pickers
+// The visible input searches; the hidden .autocomplete-value holds the chosen id
+function initAutocomplete() {
+    document.addEventListener('click', function (e) {
+        const option = e.target.closest('.autocomplete-option');
+        if (option) {
+            const input = option.closest('.autocomplete').querySelector('.autocomplete-input');
+            setAutocomplete(input, option.dataset.id, option.dataset.name);
+            return;
+        }
+        document.querySelectorAll('.autocomplete-options').forEach(options => {
+            if (!options.closest('.autocomplete').contains(e.target)) {
+                options.innerHTML = '';
+            }
+        });
+    });
+
+    document.addEventListener('input', function (e) {
+        if (e.target.classList.contains('autocomplete-input')) {
+            // Typing invalidates the previous choice until a new one is picked
+            e.target.closest('.autocomplete').querySelector('.autocomplete-value').value = '';
+            e.target.setCustomValidity('Choose a candidate from the list');
+        }
+    });
+}
+
+function setAutocomplete(input, id, name) {
+    const container = input.closest('.autocomplete');
+    container.querySelector('.autocomplete-value').value = id || '';
+    container.querySelector('.autocomplete-options').innerHTML = '';
+    input.value = name || '';
+    input.setCustomValidity('');
+}
+
 // Utility Functions
 function getCookie(name) {
     let cookieValue = null;
@@ -185,3 +222,4 @@ function toggleSidebar() {
 window.openModal = openModal;
 window.closeModal = closeModal;
 window.toggleSidebar = toggleSidebar;
+window.setAutocomplete = setAutocomplete;